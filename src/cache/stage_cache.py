@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from src.cache.cache_interface import CacheInterface
+
+
+logger = logging.getLogger(__name__)
+
+
+class StageCache:
+    """
+    Memoize pipeline stage outputs on disk under a content-derived key.
+
+    The key of a stage is a hash of its name, its version, the keys (or
+    fingerprints) of its inputs and the configuration fields it depends on.
+    Chaining the key of a stage into the next one means a change anywhere
+    upstream invalidates everything downstream, while a change that only
+    touches a late stage reuses every earlier output.
+
+    Without a cache directory every stage is simply computed.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None):
+        """
+        Initialize the stage cache.
+
+        Args:
+            cache_dir: Directory where stage outputs are stored, or None to
+                disable caching
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self.hits: list[str] = []
+        self.misses: list[str] = []
+
+    @staticmethod
+    def key(
+        stage: str, version: int, inputs: Iterable[str], params: dict[str, Any]
+    ) -> str:
+        """
+        Build the cache key of a stage.
+
+        Args:
+            stage: Stage name
+            version: Stage version, bumped whenever its code changes
+            inputs: Keys of the upstream stages or source fingerprints
+            params: Configuration fields the stage depends on
+
+        Returns:
+            Hex digest identifying the stage output
+        """
+        payload = json.dumps(
+            {
+                "stage": stage,
+                "version": version,
+                "inputs": list(inputs),
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def run(
+        self,
+        stage: str,
+        version: int,
+        fn: Callable[[], Any],
+        inputs: Iterable[str | None] = (),
+        params: dict[str, Any] | None = None,
+    ) -> tuple[Any, str | None]:
+        """
+        Return the cached output of a stage, computing it on a miss.
+
+        A stage with an unknown input (``None``) is not reproducible, so it
+        is always computed and its own key is ``None`` as well.
+
+        Args:
+            stage: Stage name
+            version: Stage version, bumped whenever its code changes
+            fn: Function computing the stage output
+            inputs: Keys of the upstream stages or source fingerprints
+            params: Configuration fields the stage depends on
+
+        Returns:
+            Tuple with the stage output and its key
+        """
+        key = self.stage_key(stage, version, inputs, params)
+        if self.contains(stage, key):
+            return self.load(stage, key), key
+
+        output = fn()
+        self.save(stage, key, output)
+
+        return output, key
+
+    def stage_key(
+        self,
+        stage: str,
+        version: int,
+        inputs: Iterable[str | None] = (),
+        params: dict[str, Any] | None = None,
+    ) -> str | None:
+        """
+        Build the key of a stage, or None when its output cannot be cached.
+
+        Args:
+            stage: Stage name
+            version: Stage version, bumped whenever its code changes
+            inputs: Keys of the upstream stages or source fingerprints
+            params: Configuration fields the stage depends on
+
+        Returns:
+            Hex digest identifying the stage output, or None when caching is
+            disabled or an input is unknown
+        """
+        inputs = list(inputs)
+        if self.cache_dir is None or any(key is None for key in inputs):
+            return None
+
+        return self.key(stage, version, inputs, params or {})
+
+    def contains(self, stage: str, key: str | None) -> bool:
+        """
+        Check whether the output of a stage is cached.
+
+        Args:
+            stage: Stage name
+            key: Key returned by ``stage_key``
+
+        Returns:
+            True if the output can be loaded
+        """
+        return key is not None and self._entry(stage, key).check_exists()
+
+    def load(self, stage: str, key: str) -> Any:
+        """
+        Load a cached stage output.
+
+        Args:
+            stage: Stage name
+            key: Key returned by ``stage_key``
+
+        Returns:
+            The stage output
+        """
+        logger.info("Stage %s loaded from cache", stage)
+        self.hits.append(stage)
+
+        return self._entry(stage, key).load()["output"]
+
+    def save(self, stage: str, key: str | None, output: Any) -> None:
+        """
+        Store a stage output; outputs without a key are not stored.
+
+        Args:
+            stage: Stage name
+            key: Key returned by ``stage_key``
+            output: Stage output
+        """
+        if key is None:
+            return
+
+        # Written under a temporary name first, so an interrupted save never
+        # leaves a truncated entry behind.
+        cache = self._entry(stage, key)
+        tmp_file = cache.file_name.with_suffix(".tmp")
+        CacheInterface(tmp_file).save({"output": output})
+        tmp_file.replace(cache.file_name)
+        self.misses.append(stage)
+
+    def _entry(self, stage: str, key: str) -> CacheInterface:
+        """Cache file of a stage output."""
+        return CacheInterface(self.cache_dir / f"{stage}-{key}.pkl")
@@ -0,0 +1,73 @@
+from src.config.pipeline_config import FileLoadConfig
+
+
+# Columns that describe the same attribute for the winner and the loser of a
+# match. Categorical columns in a pair share their categories so values can be
+# swapped between them.
+PAIRED_COLUMNS: list[tuple[str, str]] = [
+    ("winner_id", "loser_id"),
+    ("winner_code", "loser_code"),
+    ("winner_seed", "loser_seed"),
+    ("winner_entry", "loser_entry"),
+    ("winner_name", "loser_name"),
+    ("winner_hand", "loser_hand"),
+    ("winner_ht", "loser_ht"),
+    ("winner_ioc", "loser_ioc"),
+    ("winner_age", "loser_age"),
+    ("winner_rank", "loser_rank"),
+    ("winner_rank_points", "loser_rank_points"),
+    ("w_ace", "l_ace"),
+    ("w_df", "l_df"),
+    ("w_svpt", "l_svpt"),
+    ("w_1stIn", "l_1stIn"),
+    ("w_1stWon", "l_1stWon"),
+    ("w_2ndWon", "l_2ndWon"),
+    ("w_SvGms", "l_SvGms"),
+    ("w_bpSaved", "l_bpSaved"),
+    ("w_bpFaced", "l_bpFaced"),
+]
+
+_PLAYER_SCHEMA: dict[str, str] = {
+    "id": "Int32",
+    "seed": "Int16",
+    "entry": "category",
+    "name": "category",
+    "hand": "category",
+    "ht": "float32",
+    "ioc": "category",
+    "age": "float32",
+    "rank": "Int16",
+    "rank_points": "Int32",
+}
+
+_SERVE_STATS = [
+    "ace",
+    "df",
+    "svpt",
+    "1stIn",
+    "1stWon",
+    "2ndWon",
+    "SvGms",
+    "bpSaved",
+    "bpFaced",
+]
+
+ATP_MATCH_SCHEMA: dict[str, str] = {
+    "tourney_id": "category",
+    "tourney_name": "category",
+    "surface": "category",
+    "draw_size": "Int16",
+    "tourney_level": "category",
+    "tourney_date": "Int32",
+    "match_num": "Int16",
+    **{f"winner_{col}": dtype for col, dtype in _PLAYER_SCHEMA.items()},
+    **{f"loser_{col}": dtype for col, dtype in _PLAYER_SCHEMA.items()},
+    "score": "object",
+    "best_of": "Int8",
+    "round": "category",
+    "minutes": "Int16",
+    **{f"w_{col}": "Int16" for col in _SERVE_STATS},
+    **{f"l_{col}": "Int16" for col in _SERVE_STATS},
+}
+
+ATP_MATCH_FILE_CONFIG = FileLoadConfig(dtype=ATP_MATCH_SCHEMA)
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class OutputFormat(Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+    FEATHER = "feather"
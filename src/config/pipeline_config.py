@@ -1,13 +1,15 @@
 from typing import Literal, NotRequired, TypedDict
 
 from src.config.load_type import LoaderType
+from src.config.output_format import OutputFormat
 from src.config.dataset_type import DatasetType
 
 
 class FileLoadConfig(TypedDict):
-    delimiter: str
-    encoding: str
-    header: list[str]
+    delimiter: NotRequired[str]
+    encoding: NotRequired[str]
+    header: NotRequired[list[str]]
+    dtype: NotRequired[dict[str, str]]
 
 
 class PipelineConfig(TypedDict):
@@ -17,3 +19,31 @@ class PipelineConfig(TypedDict):
 
     file_config: NotRequired[FileLoadConfig]
     required_columns: NotRequired[list[str]]
+    column_mapping: NotRequired[dict[str, str]]
+    columns: NotRequired[list[str]]
+    year_range: NotRequired[tuple[int, int]]
+    player_ids: NotRequired[list[int]]
+    chunk_size: NotRequired[int]
+    n_workers: NotRequired[int]
+    random_state: NotRequired[int]
+    rating_state_path: NotRequired[str]
+    player_dimension_path: NotRequired[str]
+    player_stats_state_path: NotRequired[str]
+    dummy_encoder_path: NotRequired[str]
+    feature_scaler_path: NotRequired[str]
+    feature_service_path: NotRequired[str]
+    cache_dir: NotRequired[str]
+    cache_hash_files: NotRequired[bool]
+    scale_columns: NotRequired[list[str]]
+    dummy_dtype: NotRequired[Literal["bool", "uint8"]]
+    dummy_sparse: NotRequired[bool]
+    chunked: NotRequired[bool]
+    stats_last_n: NotRequired[list[int]]
+    stats_halflives: NotRequired[list[float]]
+    glicko_period: NotRequired[str]
+    metrics_path: NotRequired[str]
+    output_format: NotRequired[OutputFormat]
+    output_compression: NotRequired[str]
+    output_partition_by_year: NotRequired[bool]
+    output_threads: NotRequired[int]
+    feature_matrix_path: NotRequired[str]
@@ -1,3 +1,5 @@
 from ._base_data_loader import BaseDataLoader
 from .csv_data_loader import CSVDataLoader
+from .parquet_data_loader import ParquetDataLoader
+from .db_data_loader import DBDataLoader
 
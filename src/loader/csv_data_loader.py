@@ -1,13 +1,60 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import logging
+import re
 import pandas as pd
 import os
-from typing import Dict, Any, Unpack
+import time
+from typing import Dict, Any, Iterator, Unpack
 
 from src.config.load_type import LoaderType
 from src.config.pipeline_config import PipelineConfig
 from src.loader._base_data_loader import BaseDataLoader
 
 
+logger = logging.getLogger(__name__)
+
+
+def _read_csv_timed(
+    file: Path,
+    options: Dict[str, Any],
+    year_range: tuple[int, int] | None = None,
+) -> tuple[pd.DataFrame, float]:
+    """
+    Read a single CSV file and measure how long parsing took.
+
+    Kept at module level so it can be shipped to worker processes.
+
+    Args:
+        file: Path to the CSV file
+        options: pandas read_csv options
+        year_range: First and last season of the rows to keep, by the year
+            of ``tourney_date``
+
+    Returns:
+        Tuple with the parsed DataFrame and the elapsed seconds
+    """
+    start = time.perf_counter()
+
+    # Nullable integer columns are much slower to build inside the C parser
+    # than with a single cast afterwards.
+    options = dict(options)
+    dtype = options.pop("dtype", None)
+
+    data = pd.read_csv(file, **options)
+    if year_range is not None:
+        first_year, last_year = year_range
+        years = data["tourney_date"] // 10000
+        data = data[(years >= first_year) & (years <= last_year)].reset_index(
+            drop=True
+        )
+    if dtype:
+        data = BaseDataLoader._apply_dtypes(data, dtype)
+
+    return data, time.perf_counter() - start
+
+
 class CSVDataLoader(BaseDataLoader):
     """
     Data loader for CSV files.
@@ -30,37 +77,136 @@ class CSVDataLoader(BaseDataLoader):
             raise RuntimeError("Dataset path not found")
 
         self.dataset_path = Path(dataset_path)
+        self.file_timings: Dict[str, float] = {}
 
     def load_data(self) -> pd.DataFrame:
         """
-        Load data from a CSV file.
+        Load data from every CSV file under the dataset path.
+
+        Files are parsed in a process pool when ``n_workers`` is greater than
+        one and concatenated once at the end. The parse time of each file is
+        kept in ``file_timings``. A ``dtype`` schema in ``file_config`` is
+        applied while parsing each file, and only the rows of the seasons in
+        ``year_range`` are kept.
 
         Returns:
             DataFrame containing the loaded data
         """
         try:
-            data = pd.DataFrame()
-
-            for file in self.dataset_path.rglob("*.csv"):
-                data_holder = pd.read_csv(file, **self._get_csv_options())
-                data = pd.concat([data, data_holder], ignore_index=True)
-
-            return data
+            files = self.source_files()
+            if not files:
+                return pd.DataFrame()
+
+            options = self._get_csv_options()
+            year_range = self.config.get("year_range")
+            n_workers = min(self.config.get("n_workers") or 1, len(files))
+
+            if n_workers > 1:
+                with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                    results = list(
+                        pool.map(
+                            _read_csv_timed,
+                            files,
+                            [options] * len(files),
+                            [year_range] * len(files),
+                        )
+                    )
+            else:
+                results = [
+                    _read_csv_timed(file, options, year_range) for file in files
+                ]
+
+            self.file_timings = {
+                str(file): elapsed for file, (_, elapsed) in zip(files, results)
+            }
+            for file, elapsed in self.file_timings.items():
+                logger.debug("Parsed %s in %.3fs", file, elapsed)
+
+            return self._concat_frames([data for data, _ in results])
 
         except Exception as e:
             raise RuntimeError(
                 f"Failed to load data from {self.dataset_path}: {str(e)}"
             )
 
-    def save_data(self, data: pd.DataFrame, path: str) -> None:
+    def source_files(self) -> list[Path]:
+        """
+        List the CSV files under the dataset path.
+
+        With ``year_range``, files named after a season (``*_YYYY.csv``) more
+        than a year outside the range are left out: a file only holds rows
+        of its season and of the neighbouring ones.
+
+        Returns:
+            Sorted list of CSV file paths
+        """
+        files = sorted(self.dataset_path.rglob("*.csv"))
+        if "year_range" not in self.config:
+            return files
+
+        first_year, last_year = self.config["year_range"]
+
+        def in_range(file):
+            season = re.search(r"_(\d{4})$", file.stem)
+            return season is None or (
+                first_year - 1 <= int(season.group(1)) <= last_year + 1
+            )
+
+        return [file for file in files if in_range(file)]
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Stream the CSV files one at a time, in file order.
+
+        With ``n_workers`` greater than one, the next files are parsed in a
+        process pool while the current one is consumed, at most
+        ``n_workers`` ahead, so memory stays bounded by a few files. Files
+        are read as in ``load_data``, and their parse times are kept in
+        ``file_timings``.
+
+        Yields:
+            DataFrame with the rows of one file
+        """
+        files = self.source_files()
+        options = self._get_csv_options()
+        year_range = self.config.get("year_range")
+        n_workers = min(self.config.get("n_workers") or 1, len(files))
+        self.file_timings = {}
+
+        if n_workers <= 1:
+            for file in files:
+                data, self.file_timings[str(file)] = _read_csv_timed(
+                    file, options, year_range
+                )
+                yield data
+            return
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            queued = deque()
+            for file in files:
+                queued.append(
+                    (file, pool.submit(_read_csv_timed, file, options, year_range))
+                )
+                if len(queued) > n_workers:
+                    done, future = queued.popleft()
+                    data, self.file_timings[str(done)] = future.result()
+                    yield data
+
+            while queued:
+                done, future = queued.popleft()
+                data, self.file_timings[str(done)] = future.result()
+                yield data
+
+    def save_data(self, data: pd.DataFrame, path: str, append: bool = False) -> None:
         """
         Save data to a file.
 
         Args:
             data: DataFrame to save
             path: Path where to save the data
+            append: Add the rows to the end of the file, without a header
         """
-        data.to_csv(path, index=False)
+        data.to_csv(path, index=False, mode="a" if append else "w", header=not append)
 
     def _get_csv_options(self) -> Dict[str, Any]:
         """
@@ -70,25 +216,3 @@ class CSVDataLoader(BaseDataLoader):
             Dictionary with read_csv options
         """
         return self.config.get("file_config", {})
-
-    def validate_data(self, data: pd.DataFrame) -> bool:
-        """
-        Validate the loaded data.
-
-        Args:
-            data: DataFrame to validate
-
-        Returns:
-            True if data is valid, False otherwise
-        """
-        # Basic validation: check if data is not empty
-        if data.empty:
-            return False
-
-        # Check required columns if specified in config
-        if "required_columns" in self.config and not all(
-            col in data.columns for col in self.config["required_columns"]
-        ):
-            return False
-
-        return True
@@ -0,0 +1,211 @@
+from contextlib import closing
+from pathlib import Path
+import sqlite3
+import pandas as pd
+from typing import Any, Iterator, Unpack
+
+from src.config.load_type import LoaderType
+from src.config.pipeline_config import PipelineConfig
+from src.loader._base_data_loader import BaseDataLoader
+
+
+class DBDataLoader(BaseDataLoader):
+    """
+    Data loader for a local SQLite database of matches.
+
+    ``save_data`` writes a single ``matches`` table indexed on
+    ``tourney_date``, ``winner_id`` and ``loser_id``. Year and player filters
+    are pushed down into the query, so selective loads are served from those
+    indexes instead of scanning the whole history.
+
+    The database the loader reads from must exist. ``save_data`` writes to
+    its own ``path``, which is created when missing, so a new database is
+    written through a loader reading from another one.
+    """
+
+    loader_type = LoaderType.DB
+    table_name = "matches"
+    index_cols = ["tourney_date", "winner_id", "loser_id"]
+    chunk_size = 50_000
+
+    def __init__(self, dataset_path: str | Path, **config: Unpack[PipelineConfig]):
+        """
+        Initialize the SQLite data loader.
+
+        Args:
+            dataset_path: Path to the SQLite database file
+            config: Configuration dictionary with loader-specific settings
+
+        Raises:
+            RuntimeError: If the database does not exist
+        """
+        super().__init__(**config)
+
+        dataset_path = Path(dataset_path)
+        if not dataset_path.exists():
+            raise RuntimeError("Dataset path not found")
+
+        self.dataset_path = dataset_path
+
+    def load_data(self) -> pd.DataFrame:
+        """
+        Load the matches selected by ``year_range`` and ``player_ids``.
+
+        Returns:
+            DataFrame containing the loaded data
+        """
+        try:
+            chunks = list(self.iter_chunks())
+            if not chunks:
+                return pd.DataFrame()
+
+            return self._concat_frames(chunks)
+
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to load data from {self.dataset_path}: {str(e)}"
+            )
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Stream the selected matches in chunks of ``chunk_size`` rows.
+
+        Rows come ordered by ``tourney_date`` and the ``dtype`` schema in
+        ``file_config`` is applied to every chunk.
+
+        Yields:
+            DataFrame with at most ``chunk_size`` rows
+        """
+        sql, params = self._build_query()
+        schema = self.config.get("file_config", {}).get("dtype", {})
+        chunk_size = self.config.get("chunk_size", self.chunk_size)
+
+        # The connection context manager only ends the transaction; closing
+        # releases the connection even when the generator is abandoned.
+        with closing(sqlite3.connect(self.dataset_path)) as conn:
+            for chunk in pd.read_sql_query(
+                sql, conn, params=params, chunksize=chunk_size
+            ):
+                yield self._apply_dtypes(chunk, schema)
+
+    def save_data(self, data: pd.DataFrame, path: str, append: bool = False) -> None:
+        """
+        Save data to the ``matches`` table of a SQLite database.
+
+        The table is replaced (or created when appending to an empty
+        database), rows are inserted with a single ``executemany`` and the
+        indexes are built afterwards, all inside one transaction.
+
+        Args:
+            data: DataFrame to save
+            path: Path to the SQLite database file, created when missing
+            append: Insert into the existing table instead of replacing it
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        columns = ", ".join(
+            f'"{col}" {self._sql_type(dtype)}' for col, dtype in data.dtypes.items()
+        )
+        placeholders = ", ".join("?" * len(data.columns))
+
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                if not append:
+                    conn.execute(f"DROP TABLE IF EXISTS {self.table_name}")
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table_name} ({columns})"
+                )
+                conn.executemany(
+                    f"INSERT INTO {self.table_name} VALUES ({placeholders})",
+                    self._to_records(data),
+                )
+                for col in self.index_cols:
+                    if col in data.columns:
+                        conn.execute(
+                            "CREATE INDEX IF NOT EXISTS "
+                            f"idx_{self.table_name}_{col} "
+                            f'ON {self.table_name} ("{col}")'
+                        )
+        finally:
+            conn.close()
+
+    def source_files(self) -> list[Path]:
+        """
+        List the database file.
+
+        Returns:
+            List with the SQLite database path
+        """
+        return [self.dataset_path]
+
+    def _build_query(self) -> tuple[str, list[Any]]:
+        """
+        Build the SELECT statement from the configured filters.
+
+        ``year_range`` becomes a range on ``tourney_date`` (stored as
+        YYYYMMDD) and ``player_ids`` matches either side of the match, so
+        both use an index.
+
+        Returns:
+            Tuple with the SQL statement and its parameters
+        """
+        columns = ", ".join(f'"{col}"' for col in self.config.get("columns", []))
+        conditions = []
+        params: list[Any] = []
+
+        if "year_range" in self.config:
+            first_year, last_year = self.config["year_range"]
+            conditions.append("tourney_date BETWEEN ? AND ?")
+            params += [first_year * 10000, last_year * 10000 + 9999]
+
+        if self.config.get("player_ids"):
+            player_ids = list(self.config["player_ids"])
+            marks = ", ".join("?" * len(player_ids))
+            conditions.append(f"(winner_id IN ({marks}) OR loser_id IN ({marks}))")
+            params += player_ids * 2
+
+        sql = f"SELECT {columns or '*'} FROM {self.table_name}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        return sql + " ORDER BY tourney_date, rowid", params
+
+    @staticmethod
+    def _sql_type(dtype) -> str:
+        """
+        Map a pandas dtype to a SQLite column type.
+
+        Args:
+            dtype: pandas dtype of the column
+
+        Returns:
+            SQLite type name
+        """
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            return "INTEGER"
+        if pd.api.types.is_float_dtype(dtype):
+            return "REAL"
+        return "TEXT"
+
+    @staticmethod
+    def _to_records(data: pd.DataFrame) -> Iterator[tuple]:
+        """
+        Convert a frame into tuples of values sqlite3 can bind.
+
+        Missing values become None and timestamps ISO strings.
+
+        Args:
+            data: DataFrame to convert
+
+        Returns:
+            Iterator over one tuple per row
+        """
+        converted = {}
+        for col, values in data.items():
+            if pd.api.types.is_datetime64_any_dtype(values.dtype):
+                values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+            values = values.astype(object)
+            converted[col] = values.where(values.notna(), None)
+
+        return pd.DataFrame(converted).itertuples(index=False, name=None)
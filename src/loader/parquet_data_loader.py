@@ -0,0 +1,197 @@
+from pathlib import Path
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from typing import Iterator, Unpack
+
+from src.config.load_type import LoaderType
+from src.config.pipeline_config import PipelineConfig
+from src.loader._base_data_loader import BaseDataLoader
+
+
+class ParquetDataLoader(BaseDataLoader):
+    """
+    Data loader for Parquet datasets partitioned by year.
+
+    The dataset is expected in hive layout (``<root>/year=YYYY/*.parquet``),
+    which is what ``save_data`` writes.
+    """
+
+    loader_type = LoaderType.PARQUET
+    partition_col = "year"
+
+    def __init__(self, dataset_path: str | Path, **config: Unpack[PipelineConfig]):
+        """
+        Initialize the Parquet data loader.
+
+        Args:
+            dataset_path: Path to the root of the partitioned dataset
+            config: Configuration dictionary with loader-specific settings
+        """
+        super().__init__(**config)
+
+        dataset_path = Path(dataset_path)
+        if not dataset_path.exists():
+            raise RuntimeError("Dataset path not found")
+
+        self.dataset_path = dataset_path
+
+    def load_data(self) -> pd.DataFrame:
+        """
+        Load data from the Parquet dataset.
+
+        Only the columns listed in ``columns`` are read and partitions outside
+        ``year_range`` are skipped without being opened.
+
+        Returns:
+            DataFrame containing the loaded data
+        """
+        try:
+            dataset = ds.dataset(
+                self.dataset_path, format="parquet", partitioning="hive"
+            )
+            table = dataset.to_table(
+                columns=self._get_columns(dataset.schema), filter=self._get_filter()
+            )
+
+            return self._apply_schema(table.to_pandas())
+
+        except Exception as e:
+            raise RuntimeError(
+                f"Failed to load data from {self.dataset_path}: {str(e)}"
+            )
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Stream the dataset one file at a time, in partition order.
+
+        Yields:
+            DataFrame with the rows of one file
+        """
+        dataset = ds.dataset(self.dataset_path, format="parquet", partitioning="hive")
+        columns = self._get_columns(dataset.schema)
+
+        fragments = dataset.get_fragments(filter=self._get_filter())
+        for fragment in sorted(fragments, key=lambda fragment: fragment.path):
+            table = fragment.to_table(schema=dataset.schema, columns=columns)
+            yield self._apply_schema(table.to_pandas())
+
+    def source_files(self) -> list[Path]:
+        """
+        List the Parquet files of the dataset.
+
+        Returns:
+            Sorted list of Parquet file paths
+        """
+        return sorted(self.dataset_path.rglob("*.parquet"))
+
+    def save_data(self, data: pd.DataFrame, path: str, append: bool = False) -> None:
+        """
+        Save data as a Parquet dataset partitioned by year.
+
+        Args:
+            data: DataFrame to save
+            path: Root directory of the dataset
+            append: Add new files next to the existing ones instead of
+                replacing the partitions being written
+        """
+        # Arrow has no sparse columns; sparse dummies are written dense.
+        sparse = [
+            col
+            for col, dtype in data.dtypes.items()
+            if isinstance(dtype, pd.SparseDtype)
+        ]
+        if sparse:
+            data = data.assign(**{col: data[col].sparse.to_dense() for col in sparse})
+
+        year = self._get_partition_year(data)
+        part = f"part-{uuid.uuid4().hex}" if append else "part"
+
+        if year is None:
+            Path(path).mkdir(parents=True, exist_ok=True)
+            data.to_parquet(Path(path) / f"{part}-0.parquet", index=False)
+            return
+
+        table = pa.Table.from_pandas(
+            data.assign(**{self.partition_col: year}), preserve_index=False
+        )
+        ds.write_dataset(
+            table,
+            path,
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([(self.partition_col, pa.int32())]), flavor="hive"
+            ),
+            basename_template=f"{part}-{{i}}.parquet",
+            existing_data_behavior=(
+                "overwrite_or_ignore" if append else "delete_matching"
+            ),
+        )
+
+    def _apply_schema(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast the loaded columns to the ``dtype`` schema in ``file_config``.
+
+        Args:
+            data: DataFrame read from the dataset
+
+        Returns:
+            DataFrame with the declared dtypes
+        """
+        schema = self.config.get("file_config", {}).get("dtype", {})
+
+        return self._concat_frames([self._apply_dtypes(data, schema)])
+
+    def _get_columns(self, schema: pa.Schema) -> list[str]:
+        """
+        Get the columns to read from config.
+
+        The partition column is only returned when explicitly requested, so
+        the loaded frame has the same columns as the source CSV files.
+
+        Returns:
+            List of column names to project
+        """
+        if "columns" in self.config:
+            return list(self.config["columns"])
+
+        return [name for name in schema.names if name != self.partition_col]
+
+    def _get_filter(self) -> ds.Expression | None:
+        """
+        Build the partition filter from the configured year range.
+
+        Returns:
+            Filter expression, or None to read every partition
+        """
+        if "year_range" not in self.config:
+            return None
+
+        first_year, last_year = self.config["year_range"]
+        year = ds.field(self.partition_col)
+
+        return (year >= first_year) & (year <= last_year)
+
+    def _get_partition_year(self, data: pd.DataFrame) -> pd.Series | None:
+        """
+        Derive the partition year of every row.
+
+        Args:
+            data: DataFrame to be saved
+
+        Returns:
+            Series with the year of each row, or None if it cannot be derived
+        """
+        if self.partition_col in data.columns:
+            return data[self.partition_col].astype("int32")
+
+        if "tourney_date" in data.columns:
+            if pd.api.types.is_datetime64_any_dtype(data["tourney_date"]):
+                return data["tourney_date"].dt.year.astype("int32")
+            return (data["tourney_date"] // 10000).astype("int32")
+
+        if "tourney_datetime" in data.columns:
+            return data["tourney_datetime"].dt.year.astype("int32")
+
+        return None
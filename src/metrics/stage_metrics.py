@@ -0,0 +1,278 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import logging
+import os
+from pathlib import Path
+import resource
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+
+def _current_rss() -> int:
+    """
+    Resident set size of the process, in bytes.
+
+    Read from ``/proc/self/statm`` on Linux. Elsewhere the peak RSS reported
+    by ``getrusage`` is the closest available figure.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return _max_rss()
+
+
+def _max_rss() -> int:
+    """Peak resident set size of the process so far, in bytes."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes and macOS bytes.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _cpu_time() -> float:
+    """CPU time of the process and of its finished children, in seconds."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _frames(value: Any) -> list[pd.DataFrame]:
+    """Collect the DataFrames in a stage input or output."""
+    if isinstance(value, pd.DataFrame):
+        return [value]
+    if isinstance(value, (tuple, list)):
+        return [frame for item in value for frame in _frames(item)]
+    return []
+
+
+def _describe(value: Any, deep: bool = True) -> dict[str, int]:
+    """
+    Rows, columns and memory of the DataFrames in a value.
+
+    Deep sizing measures every string of object columns, a pass over their
+    rows; otherwise only their pointers are counted.
+    """
+    frames = _frames(value)
+    return {
+        "rows": sum(len(frame) for frame in frames),
+        "cols": sum(len(frame.columns) for frame in frames),
+        "memory_bytes": int(
+            sum(frame.memory_usage(deep=deep).sum() for frame in frames)
+        ),
+    }
+
+
+class _RSSSampler:
+    """
+    Background thread tracking the highest RSS seen while it runs.
+
+    ``getrusage`` only reports the peak of the whole process, which says
+    nothing about a stage once an earlier one went higher.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.peak = _current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def __enter__(self) -> "_RSSSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+
+
+class StageMetrics:
+    """
+    Record wall time, CPU time, memory and data sizes of pipeline stages.
+
+    Every call to ``track``, and every step of ``track_iter``, adds one
+    entry to ``stages``. ``report`` gathers them with the totals of the run,
+    and ``save`` writes that report as JSON, so runs can be compared over
+    time.
+    """
+
+    def __init__(self, sample_interval: float = 0.01, deep: bool = True):
+        """
+        Initialize the metrics of a run.
+
+        Args:
+            sample_interval: Seconds between two RSS samples within a stage
+            deep: Measure the memory of object columns value by value,
+                which costs a pass over their rows for every stage
+        """
+        self.sample_interval = sample_interval
+        self.deep = deep
+        self.stages: list[dict[str, Any]] = []
+
+        self.started_at = datetime.now(timezone.utc)
+        self._start_wall = time.perf_counter()
+        self._start_cpu = _cpu_time()
+
+    def track(
+        self,
+        stage: str,
+        fn: Callable[[], Any],
+        inputs: Iterable[Any] = (),
+        **labels: Any,
+    ) -> Any:
+        """
+        Run a stage and record its metrics.
+
+        Args:
+            stage: Stage name
+            fn: Function running the stage
+            inputs: Values given to the stage; the DataFrames among them are
+                measured
+            labels: Extra fields stored with the entry, e.g. the season of a
+                chunked run
+
+        Returns:
+            Whatever ``fn`` returns
+        """
+        with self.measure(stage, inputs, **labels) as entry:
+            output = fn()
+
+        entry["output"] = _describe(output, self.deep)
+
+        return output
+
+    @contextmanager
+    def measure(
+        self, stage: str, inputs: Iterable[Any] = (), **labels: Any
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Measure the enclosed block as one stage.
+
+        The yielded entry is stored in ``stages`` once the block ends, and
+        ``track`` then fills its ``output`` from the value of its function.
+
+        Args:
+            stage: Stage name
+            inputs: Values given to the stage
+            labels: Extra fields stored with the entry
+
+        Yields:
+            The entry being recorded
+        """
+        with self._timed(stage, inputs, **labels) as entry:
+            yield entry
+
+        self._record(entry)
+
+    def track_iter(
+        self,
+        stage: str,
+        iterable: Iterable[Any],
+        labels: Callable[[Any], dict[str, Any]] | None = None,
+    ) -> Iterator[Any]:
+        """
+        Iterate over a lazy iterable, recording every step as one stage.
+
+        Producing each item is measured like a call to ``track``. The last
+        step, which only finds the iterable exhausted, is not recorded.
+
+        Args:
+            stage: Stage name
+            iterable: Iterable producing the items, e.g. a generator
+            labels: Function of an item returning the extra fields stored
+                with its entry
+
+        Yields:
+            The items of ``iterable``
+        """
+        iterator = iter(iterable)
+        exhausted = object()
+        while True:
+            with self._timed(stage) as entry:
+                item = next(iterator, exhausted)
+            if item is exhausted:
+                return
+
+            entry = {"stage": stage, **(labels(item) if labels else {}), **entry}
+            entry["output"] = _describe(item, self.deep)
+            self._record(entry)
+
+            yield item
+
+    @contextmanager
+    def _timed(
+        self, stage: str, inputs: Iterable[Any] = (), **labels: Any
+    ) -> Iterator[dict[str, Any]]:
+        """Measure the enclosed block, filling the yielded entry."""
+        entry: dict[str, Any] = {"stage": stage, **labels}
+        entry["input"] = _describe(list(inputs), self.deep)
+
+        rss_start = _current_rss()
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_time()
+
+        with _RSSSampler(self.sample_interval) as sampler:
+            yield entry
+
+        entry["wall_s"] = time.perf_counter() - wall_start
+        entry["cpu_s"] = _cpu_time() - cpu_start
+        entry["rss_start_bytes"] = rss_start
+        entry["rss_delta_bytes"] = _current_rss() - rss_start
+        entry["rss_peak_bytes"] = sampler.peak
+        entry.setdefault("output", _describe(None))
+
+    def _record(self, entry: dict[str, Any]) -> None:
+        """Store a measured entry in ``stages``."""
+        self.stages.append(entry)
+        logger.info(
+            "Stage %s took %.3fs (cpu %.3fs, peak rss %.1f MB)",
+            entry["stage"],
+            entry["wall_s"],
+            entry["cpu_s"],
+            entry["rss_peak_bytes"] / 2**20,
+        )
+
+    def report(self) -> dict[str, Any]:
+        """
+        Gather the stage entries and the totals of the run.
+
+        Returns:
+            JSON-serializable report
+        """
+        return {
+            "started_at": self.started_at.isoformat(),
+            "wall_s": time.perf_counter() - self._start_wall,
+            "cpu_s": _cpu_time() - self._start_cpu,
+            "peak_rss_bytes": _max_rss(),
+            "stages": self.stages,
+        }
+
+    def save(self, path: str | Path) -> dict[str, Any]:
+        """
+        Write the report as JSON.
+
+        Args:
+            path: File where to save the report
+
+        Returns:
+            The report written
+        """
+        report = self.report()
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+
+        return report
@@ -1,69 +1,710 @@
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from src.cache.cache_interface import CacheInterface
+from src.cache.stage_cache import StageCache
 from src.config.pipeline_config import PipelineConfig
 from src.loader import BaseDataLoader
+from src.metrics.stage_metrics import StageMetrics
+from src.scheduler.stage_graph import Stage, StageGraph
+from src.serving.feature_service import FeatureService
+from src.sink import BaseDataSink, FeatureMatrixWriter
 from src.source_parser._base_parser import BaseDataParser
+from src.source_parser.player_dimension import PlayerDimension
 from src.config.dataset_type import DatasetType
+from src.transformers.feature_transforms import DummyEncoder, FeatureScaler
+from src.transformers.player_stats import PlayerStatsState
+from src.transformers.ratings import RatingState
 
 
 from src.transformers.transformers import (
     invert_winner_loser_names,
     inverter_scores_df,
     compute_rating_features,
-    extract_score_features,
+    compute_score_features,
     prepare_tennis_model_data,
     finalize_tennis_model_data,
-    create_dummy_variables,
-    scale_numerical_features,
+    PLAYER_STATS_COLS,
 )
 
 
+# Bump the version of a stage whenever its code changes, so that outputs
+# cached by the previous code are not reused.
+STAGE_VERSIONS = {
+    "load": 1,
+    "parse": 2,
+    "invert": 2,
+    "ratings": 2,
+    "score": 1,
+    "prepare": 4,
+    "finalize": 3,
+    "dummies": 3,
+    "scale": 2,
+}
+
+LOADER_CONFIG_KEYS = [
+    "loader_type",
+    "file_config",
+    "required_columns",
+    "columns",
+    "year_range",
+]
+
+PARSER_CONFIG_KEYS = [
+    "dataset_type",
+    "required_columns",
+    "column_mapping",
+]
+
+DUMMY_CONFIG = {
+    "standard_dummy_cols": ["best_of", "surface", "round"],
+    "reduced_category_config": [
+        ("tourney_level", 3),
+        ("player_A_hand", 1),
+        ("player_B_hand", 1),
+    ],
+    "cols_to_drop": [
+        "tourney_name",
+        "tourney_level",
+        "player_A_hand",
+        "player_B_hand",
+    ],
+}
+
+# State saved next to the rating state, which a resumed run is keyed by or
+# applies as fitted.
+RESUMED_STATE_KEYS = [
+    "player_dimension_path",
+    "player_stats_state_path",
+    "dummy_encoder_path",
+    "feature_scaler_path",
+]
+
+SCALE_COLUMNS = [
+    "player_B_ht",
+    "player_B_age",
+    "player_A_ht",
+    "player_A_age",
+]
+
+
+# Stage functions are kept at module level so they can be shipped to worker
+# processes.
+
+
+def _load(config: PipelineConfig):
+    """Load the raw dataset."""
+    return BaseDataLoader.from_config(config).process()
+
+
+def _parse(config: PipelineConfig, data):
+    """Parse the raw dataset."""
+    return BaseDataParser.from_config(data, config).process()
+
+
+def _parse_matches(config: PipelineConfig, dimension_path, data):
+    """
+    Parse the raw matches, returning the player dimension as well.
+
+    With ``dimension_path``, the saved dimension is extended with the
+    players instead of building a new one.
+    """
+    player_dimension = (
+        PlayerDimension.load(dimension_path) if dimension_path else PlayerDimension()
+    )
+    parsed = BaseDataParser.from_config(
+        data, config, player_dimension=player_dimension
+    ).process()
+    return parsed, player_dimension
+
+
+def _invert(random_state, state_path, data):
+    """
+    Swap winners and losers at random, with their scores.
+
+    With ``state_path``, only the matches after the watermark of the saved
+    rating state are kept, so the stages downstream only see the new ones.
+    """
+    if state_path:
+        data = RatingState.load(state_path).pending(data)
+    return inverter_scores_df(
+        invert_winner_loser_names(data, random_state=random_state)
+    )
+
+
+def _rate(glicko_period, state_path, data):
+    """
+    Compute rating features, returning the final ratings as well.
+
+    With ``state_path``, the saved ratings are updated with the matches
+    after their watermark only.
+    """
+    rating_state = _rating_state(glicko_period, state_path)
+    return compute_rating_features(data, rating_state), rating_state
+
+
+def _encode_dummies(dtype, sparse, encoder_path, data):
+    """
+    Fit the dummy vocabularies and encode the model features.
+
+    With ``encoder_path``, the saved encoder is applied as fitted, with its
+    vocabularies frozen.
+    """
+    if encoder_path:
+        encoder = DummyEncoder.load(encoder_path)
+        return encoder.transform(data), encoder
+
+    encoder = DummyEncoder(**DUMMY_CONFIG, dtype=dtype, sparse=sparse)
+    return encoder.fit_transform(data), encoder
+
+
+def _scale(columns, scaler_path, data):
+    """
+    Fit the scaler and scale the encoded features.
+
+    With ``scaler_path``, the saved scaler is applied as fitted, with its
+    ranges frozen.
+    """
+    if scaler_path:
+        scaler = FeatureScaler.load(scaler_path)
+        return scaler.transform(data), scaler
+
+    scaler = FeatureScaler(columns)
+    return scaler.fit_transform(data), scaler
+
+
+def _rating_state(glicko_period, state_path=None) -> RatingState:
+    """
+    Load the rating state saved at ``state_path``, or start an empty one.
+
+    Raises:
+        ValueError: If the saved state uses other Glicko-2 rating periods
+    """
+    if not state_path:
+        return RatingState(glicko_period)
+
+    rating_state = RatingState.load(state_path)
+    if rating_state.glicko_period != glicko_period:
+        raise ValueError(
+            f"Rating state at {state_path} uses Glicko-2 period "
+            f"{rating_state.glicko_period!r}, not {glicko_period!r}"
+        )
+
+    return rating_state
+
+
+def _stats_state(stats_windows, stats_path=None) -> PlayerStatsState:
+    """
+    Load the player averages saved at ``stats_path``, or start empty ones.
+
+    Raises:
+        ValueError: If the saved averages use other windows
+    """
+    if not stats_path:
+        return PlayerStatsState(PLAYER_STATS_COLS, **stats_windows)
+
+    stats_state = PlayerStatsState.load(stats_path)
+    saved_windows = {
+        "last_n": stats_state.last_n,
+        "halflives": stats_state.halflives,
+    }
+    if saved_windows != {key: sorted(set(v)) for key, v in stats_windows.items()}:
+        raise ValueError(
+            f"Player averages at {stats_path} use windows {saved_windows}, "
+            f"not {stats_windows}"
+        )
+
+    return stats_state
+
+
+def _resumed(config: PipelineConfig) -> dict[str, str]:
+    """
+    Paths of the state saved by a previous run, which the run resumes from.
+
+    A run resumes when a rating state was saved to ``rating_state_path``,
+    and then needs the rest of the state saved with it, under
+    ``RESUMED_STATE_KEYS``.
+
+    Returns:
+        Mapping of config key to saved path, empty for a full run
+
+    Raises:
+        ValueError: If a rating state was saved without the rest of its state
+    """
+    state_path = _saved(config, "rating_state_path")
+    if not state_path:
+        return {}
+
+    missing = [key for key in RESUMED_STATE_KEYS if not _saved(config, key)]
+    if missing:
+        raise ValueError(
+            f"Rating state at {state_path} can only be resumed with the state "
+            f"saved with it to {', '.join(missing)}"
+        )
+
+    return {key: config[key] for key in ["rating_state_path", *RESUMED_STATE_KEYS]}
+
+
+def _season(data) -> int:
+    """Year of the season of a chunk from ``iter_seasons``."""
+    return int(data["tourney_date"].iloc[0] // 10000)
+
+
+def _saved(config: PipelineConfig, key: str) -> str | None:
+    """Path configured under ``key`` when a file was saved there."""
+    path = config.get(key)
+    return path if path and Path(path).exists() else None
+
+
+def _prepare(stats_windows, stats_path, data, score_feats):
+    """
+    Build the per-player model features with their running averages,
+    returning the final averages as well.
+
+    With ``stats_path``, the saved averages are carried on with the matches.
+    """
+    stats_state = _stats_state(stats_windows, stats_path)
+    return prepare_tennis_model_data(data, score_feats, stats_state), stats_state
+
+
 class PipelineRunner:
+    @staticmethod
+    def build_graph(config: PipelineConfig) -> StageGraph:
+        """
+        Describe the pipeline as a graph of stages.
+
+        Ratings depend only on the inverted matches, like the score features
+        and the player averages built from them, so both branches can run
+        concurrently until the model features join them.
+
+        Returns:
+            Graph whose final output is ``scaled`` for tennis data and
+            ``parsed`` otherwise
+        """
+        is_tennis = config.get("dataset_type") == DatasetType.TENNIS_MATCH
+
+        # The source files are only fingerprinted for the cache keys, which
+        # an uncached run never builds.
+        sources = []
+        if config.get("cache_dir"):
+            sources = [BaseDataLoader.from_config(config).fingerprint()]
+
+        # A saved rating state resumes the run from its watermark, along with
+        # the player dimension, averages, encoder and scaler saved with it.
+        # They change with every run, so the stages built on them are not
+        # cached.
+        resumed = _resumed(config) if is_tennis else {}
+        state_path = resumed.get("rating_state_path")
+        dimension_path = resumed.get("player_dimension_path")
+
+        stages = [
+            Stage(
+                "load",
+                partial(_load, config),
+                outputs=["raw"],
+                params={key: config.get(key) for key in LOADER_CONFIG_KEYS},
+                sources=sources,
+            ),
+            Stage(
+                "parse",
+                (
+                    partial(_parse_matches, config, dimension_path)
+                    if is_tennis
+                    else partial(_parse, config)
+                ),
+                inputs=["raw"],
+                outputs=["parsed", "player_dimension"] if is_tennis else ["parsed"],
+                params={key: config.get(key) for key in PARSER_CONFIG_KEYS},
+                sources=[None] if dimension_path else [],
+            ),
+        ]
+
+        if is_tennis:
+            # Without a seed the swap is not reproducible, so neither it nor
+            # anything downstream can be reused.
+            random_state = config.get("random_state")
+            stats_windows = {
+                "last_n": config.get("stats_last_n", []),
+                "halflives": config.get("stats_halflives", []),
+            }
+            glicko_period = config.get("glicko_period")
+            columns_to_scale = config.get("scale_columns", SCALE_COLUMNS)
+            dummy_dtype = config.get("dummy_dtype", "bool")
+            dummy_sparse = config.get("dummy_sparse", False)
+            stats_path = resumed.get("player_stats_state_path")
+            encoder_path = resumed.get("dummy_encoder_path")
+            scaler_path = resumed.get("feature_scaler_path")
+
+            stages += [
+                Stage(
+                    "invert",
+                    partial(_invert, random_state, state_path),
+                    inputs=["parsed"],
+                    outputs=["matches"],
+                    params={"random_state": random_state},
+                    sources=[] if random_state is not None else [None],
+                ),
+                Stage(
+                    "ratings",
+                    partial(_rate, glicko_period, state_path),
+                    inputs=["matches"],
+                    outputs=["rating_features", "rating_state"],
+                    params={"glicko_period": glicko_period},
+                    sources=[None] if state_path else [],
+                ),
+                Stage(
+                    "score",
+                    compute_score_features,
+                    inputs=["matches"],
+                    outputs=["score_features"],
+                ),
+                Stage(
+                    "prepare",
+                    partial(_prepare, stats_windows, stats_path),
+                    inputs=["matches", "score_features"],
+                    outputs=["player_features", "player_stats_state"],
+                    params=stats_windows,
+                ),
+                Stage(
+                    "finalize",
+                    finalize_tennis_model_data,
+                    inputs=["matches", "player_features", "rating_features"],
+                    outputs=["model_features"],
+                ),
+                Stage(
+                    "dummies",
+                    partial(_encode_dummies, dummy_dtype, dummy_sparse, encoder_path),
+                    inputs=["model_features"],
+                    outputs=["dummies", "dummy_encoder"],
+                    params={
+                        **DUMMY_CONFIG,
+                        "dtype": dummy_dtype,
+                        "sparse": dummy_sparse,
+                    },
+                ),
+                Stage(
+                    "scale",
+                    partial(_scale, columns_to_scale, scaler_path),
+                    inputs=["dummies"],
+                    outputs=["scaled", "feature_scaler"],
+                    params={"columns": columns_to_scale},
+                ),
+            ]
+
+        for stage in stages:
+            stage.version = STAGE_VERSIONS[stage.name]
+
+        return StageGraph(stages)
+
     @staticmethod
     def run(config: PipelineConfig):
-        loader = BaseDataLoader.from_config(config)
+        """
+        Run the pipeline over the whole dataset.
 
-        data = loader.process()
+        Stages run as a ``StageGraph``: with ``n_workers`` greater than one,
+        independent stages run concurrently in worker processes. Every stage
+        is memoized by ``StageCache`` when ``cache_dir`` is set and measured
+        by ``StageMetrics``; the metrics report is written to
+        ``metrics_path`` when set. The output is written to ``path`` by the
+        sink selected with ``output_format`` (see ``BaseDataSink``).
 
-        parser = BaseDataParser.from_config(data, config)
+        When a rating state was saved to ``rating_state_path`` by a previous
+        run, the run resumes from it with the rest of the state saved with
+        it (see ``RESUMED_STATE_KEYS``). The whole history is still loaded
+        and parsed with the saved player dimension, which keeps the player
+        codes and match ids, but only the matches after the watermark are
+        swapped, rated, averaged on top of the saved player averages, and
+        written; the saved dummy encoder and feature scaler are applied as
+        fitted, so the columns and scaling stay those of the first run.
+        Removing the saved rating state makes the next run a full refit.
 
-        data = parser.process()
+        Returns:
+            The metrics report of the run
+        """
+        if config.get("chunked"):
+            return PipelineRunner.run_chunked(config)
 
-        if config.get("dataset_type") == DatasetType.TENNIS_MATCH:
-            data = invert_winner_loser_names(data)
-            data = inverter_scores_df(data)
+        cache = StageCache(config.get("cache_dir"))
+        metrics = PipelineRunner._metrics(config)
 
-            df_features = compute_rating_features(data)
+        graph = PipelineRunner.build_graph(config)
+        resumed = bool(_saved(config, "rating_state_path"))
+        outputs = graph.run(
+            cache, metrics, n_workers=config.get("n_workers") or 1
+        )
 
-            score_feats = data.apply(
-                extract_score_features, axis=1, result_type="expand"
+        if config.get("dataset_type") == DatasetType.TENNIS_MATCH:
+            result = outputs["scaled"]
+            service = FeatureService(
+                outputs["rating_state"],
+                outputs["player_stats_state"],
+                outputs["dummy_encoder"],
+                outputs["feature_scaler"],
+                columns=[col for col in result.columns if col != "outcome"],
+                player_dimension=outputs["player_dimension"],
+            )
+            PipelineRunner._save_fitted(
+                config, service, outputs["matches"], resumed
             )
+        else:
+            result = outputs["parsed"]
+
+        with BaseDataSink.from_config(config) as sink:
+            metrics.track(
+                "save",
+                lambda: sink.write(result, config.get("path")),
+                inputs=[result],
+            )
+
+        if config.get("dataset_type") == DatasetType.TENNIS_MATCH:
+            with PipelineRunner._matrix_writer(config) as matrix:
+                if matrix is not None:
+                    metrics.track(
+                        "export", lambda: matrix.write(result), inputs=[result]
+                    )
+
+        return PipelineRunner._report(metrics, config)
+
+    @staticmethod
+    def run_chunked(config: PipelineConfig):
+        """
+        Run the tennis pipeline one season at a time.
+
+        Ratings and player averages are carried across seasons, so they match
+        a run over the whole history. Dummy categories and scaling must see
+        every season, so model features are spooled to disk in a first pass
+        while their value counts and ranges are accumulated, and dummies and
+        scaling are applied in a second pass that appends each season to the
+        output. Peak memory is bounded by the largest season.
+
+        The winner/loser swap draws each season from one seeded generator,
+        so it is reproducible but differs from the swap of a full run. A
+        saved rating state resumes the run as in ``run``.
 
-            df_model_feats = prepare_tennis_model_data(data, score_feats)
+        Returns:
+            The metrics report of the run, with one entry per stage and
+            season
+        """
+        if config.get("dataset_type") != DatasetType.TENNIS_MATCH:
+            raise NotImplementedError
 
-            df_model_feats = finalize_tennis_model_data(
-                data, df_model_feats, df_features
+        loader = BaseDataLoader.from_config(config)
+        metrics = PipelineRunner._metrics(config)
+
+        rng = np.random.default_rng(config.get("random_state"))
+        resumed = _resumed(config)
+        rating_state = _rating_state(
+            config.get("glicko_period"), resumed.get("rating_state_path")
+        )
+        stats_state = _stats_state(
+            {
+                "last_n": config.get("stats_last_n", []),
+                "halflives": config.get("stats_halflives", []),
+            },
+            resumed.get("player_stats_state_path"),
+        )
+        if resumed:
+            player_dimension = PlayerDimension.load(resumed["player_dimension_path"])
+            encoder = DummyEncoder.load(resumed["dummy_encoder_path"])
+            scaler = FeatureScaler.load(resumed["feature_scaler_path"])
+        else:
+            player_dimension = PlayerDimension()
+            encoder = DummyEncoder(
+                **DUMMY_CONFIG,
+                dtype=config.get("dummy_dtype", "bool"),
+                sparse=config.get("dummy_sparse", False),
             )
+            scaler = FeatureScaler(config.get("scale_columns", SCALE_COLUMNS))
+        service = FeatureService(
+            rating_state, stats_state, encoder, scaler, [], player_dimension
+        )
 
-            df_dummies = create_dummy_variables(
-                df=df_model_feats,
-                standard_dummy_cols=["best_of", "surface", "round"],
-                reduced_category_config=[
-                    ("tourney_level", 3),
-                    ("player_A_hand", 1),
-                    ("player_B_hand", 1),
-                ],
-                cols_to_drop=[
-                    "tourney_name",
-                    "tourney_level",
-                    "player_A_hand",
-                    "player_B_hand",
-                ],
+        with TemporaryDirectory() as spool_dir:
+            spooled = []
+            match_offset = 0
+
+            seasons = metrics.track_iter(
+                "load",
+                loader.iter_seasons(),
+                labels=lambda season: {"season": _season(season)},
             )
-            columns_to_scale = [
-                "player_B_ht",
-                "player_B_age",
-                "player_A_ht",
-                "player_A_age",
-            ]
-            df_scaled = scale_numerical_features(df_dummies, columns_to_scale)
+            for season in seasons:
+                year = _season(season)
+                if not loader.validate_data(season):
+                    raise ValueError("Data validation failed")
+
+                def parse():
+                    parsed = BaseDataParser.from_config(
+                        season, config, player_dimension=player_dimension
+                    ).process()
+                    parsed["match_id"] += match_offset
+                    return parsed
+
+                parsed = metrics.track("parse", parse, inputs=[season], season=year)
+                match_offset += len(parsed)
+
+                # A resumed run goes on with the matches after the watermark.
+                data = metrics.track(
+                    "invert",
+                    lambda: inverter_scores_df(
+                        invert_winner_loser_names(
+                            rating_state.pending(parsed), random_state=rng
+                        )
+                    ),
+                    inputs=[parsed],
+                    season=year,
+                )
+                service.observe(data)
+
+                df_features = metrics.track(
+                    "ratings",
+                    lambda: compute_rating_features(data, rating_state),
+                    inputs=[data],
+                    season=year,
+                )
+                score_feats = metrics.track(
+                    "score",
+                    lambda: compute_score_features(data),
+                    inputs=[data],
+                    season=year,
+                )
+                df_model_feats = metrics.track(
+                    "model",
+                    lambda: finalize_tennis_model_data(
+                        data,
+                        prepare_tennis_model_data(data, score_feats, stats_state),
+                        df_features,
+                    ),
+                    inputs=[data, score_feats, df_features],
+                    season=year,
+                )
+
+                # A resumed run applies the saved encoder and scaler as fitted.
+                if not resumed:
+                    encoder.partial_fit(df_model_feats)
+                    scaler.partial_fit(df_model_feats)
+
+                spool = CacheInterface(Path(spool_dir) / f"{len(spooled)}.pkl")
+                spool.save({"data": df_model_feats})
+                spooled.append((year, spool))
+
+            with (
+                BaseDataSink.from_config(config) as sink,
+                PipelineRunner._matrix_writer(config) as matrix,
+            ):
+                for i, (year, spool) in enumerate(spooled):
+                    df_model_feats = spool.load()["data"]
+                    df_dummies = metrics.track(
+                        "dummies",
+                        lambda: encoder.transform(df_model_feats),
+                        inputs=[df_model_feats],
+                        season=year,
+                    )
+                    df_scaled = metrics.track(
+                        "scale",
+                        lambda: scaler.transform(df_dummies),
+                        inputs=[df_dummies],
+                        season=year,
+                    )
+                    if i == 0:
+                        service.columns = [
+                            col for col in df_scaled.columns if col != "outcome"
+                        ]
+                    metrics.track(
+                        "save",
+                        lambda: sink.write(
+                            df_scaled, config.get("path"), append=i > 0
+                        ),
+                        inputs=[df_scaled],
+                        season=year,
+                    )
+                    if matrix is not None:
+                        metrics.track(
+                            "export",
+                            lambda: matrix.write(df_scaled, append=i > 0),
+                            inputs=[df_scaled],
+                            season=year,
+                        )
+
+        PipelineRunner._save_fitted(config, service, resumed=bool(resumed))
+
+        return PipelineRunner._report(metrics, config)
+
+    @staticmethod
+    def _matrix_writer(config: PipelineConfig):
+        """
+        Open the export of the feature matrix to ``feature_matrix_path``.
+
+        Returns:
+            Context manager giving a ``FeatureMatrixWriter``, or None when no
+            export is configured
+        """
+        if config.get("feature_matrix_path"):
+            return FeatureMatrixWriter(config["feature_matrix_path"])
+
+        return nullcontext()
+
+    @staticmethod
+    def _save_fitted(
+        config: PipelineConfig,
+        service: FeatureService,
+        matches=None,
+        resumed: bool = False,
+    ) -> None:
+        """
+        Save the state fitted on the history to the configured paths, so new
+        matches can be rated, encoded and served without refitting.
+
+        Args:
+            config: Pipeline configuration
+            service: Feature service holding the fitted state
+            matches: Matches whose player attributes the service has not
+                observed yet
+            resumed: Whether the run resumed from saved state, in which case
+                the service has only observed the new matches and keeps the
+                attributes of the other players from the saved service
+        """
+        if config.get("rating_state_path"):
+            service.rating_state.save(config["rating_state_path"])
+        if config.get("player_dimension_path"):
+            service.player_dimension.save(config["player_dimension_path"])
+        if config.get("player_stats_state_path"):
+            service.stats_state.save(config["player_stats_state_path"])
+        if config.get("dummy_encoder_path"):
+            service.encoder.save(config["dummy_encoder_path"])
+        if config.get("feature_scaler_path"):
+            service.scaler.save(config["feature_scaler_path"])
+        if config.get("feature_service_path"):
+            if matches is not None:
+                service.observe(matches)
+            if resumed and _saved(config, "feature_service_path"):
+                saved = FeatureService.load(config["feature_service_path"])
+                service.players = {**saved.players, **service.players}
+            service.save(config["feature_service_path"])
+
+    @staticmethod
+    def _metrics(config: PipelineConfig) -> StageMetrics:
+        """
+        Start the metrics of a run.
+
+        Object columns are only sized value by value when the report is
+        saved to ``metrics_path``; otherwise their pointers are counted.
+        """
+        return StageMetrics(deep=bool(config.get("metrics_path")))
+
+    @staticmethod
+    def _report(metrics: StageMetrics, config: PipelineConfig) -> dict:
+        """
+        Build the metrics report, saving it to ``metrics_path`` when set.
+
+        Returns:
+            The metrics report of the run
+        """
+        if config.get("metrics_path"):
+            return metrics.save(config["metrics_path"])
 
-        loader.save_data(df_scaled, config.get("path"))
+        return metrics.report()
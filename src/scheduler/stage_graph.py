@@ -0,0 +1,280 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import nullcontext
+import logging
+import os
+from typing import Any, Callable, Iterable
+
+from src.cache.stage_cache import StageCache
+from src.metrics.stage_metrics import StageMetrics
+
+
+logger = logging.getLogger(__name__)
+
+
+def _run_stage(
+    name: str,
+    fn: Callable[..., Any],
+    args: list[Any],
+    sample_interval: float,
+    deep: bool,
+) -> tuple[Any, dict[str, Any]]:
+    """
+    Run a stage in a worker process and measure it there.
+
+    Kept at module level so it can be shipped to worker processes.
+
+    Returns:
+        Tuple with the stage output and its metrics entry
+    """
+    metrics = StageMetrics(sample_interval, deep)
+    output = metrics.track(name, lambda: fn(*args), inputs=args, worker=os.getpid())
+
+    return output, metrics.stages[0]
+
+
+class Stage:
+    """
+    Named pipeline step computing its outputs from upstream outputs.
+
+    ``fn`` is called with the values of ``inputs`` as positional arguments
+    and returns the value of its single output, or a tuple with one value
+    per output. It must be picklable (a module-level function or a
+    ``functools.partial`` of one) to run in a worker process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        inputs: Iterable[str] = (),
+        outputs: Iterable[str] | None = None,
+        version: int = 1,
+        params: dict[str, Any] | None = None,
+        sources: Iterable[str | None] = (),
+    ):
+        """
+        Declare a stage.
+
+        Args:
+            name: Stage name, unique within the graph
+            fn: Function computing the outputs
+            inputs: Names of the outputs of other stages it consumes
+            outputs: Names of the values it produces, ``[name]`` by default
+            version: Stage version, bumped whenever its code changes
+            params: Configuration fields the stage depends on, part of its
+                cache key
+            sources: Fingerprints of external data it reads, part of its
+                cache key; None marks a stage that cannot be cached
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = list(inputs)
+        self.outputs = list(outputs) if outputs is not None else [name]
+        self.version = version
+        self.params = params or {}
+        self.sources = list(sources)
+
+
+class StageGraph:
+    """
+    Pipeline described as a DAG of stages linked by their inputs and outputs.
+
+    ``run`` schedules every stage as soon as the stages producing its inputs
+    are done. With several workers, stages that are ready at the same time
+    run concurrently in a process pool, so the wall time approaches the
+    longest path of the graph rather than the sum of its stages. A stage
+    that is the only one runnable runs in the calling process, which saves
+    shipping its inputs to a worker when there is nothing to overlap it
+    with.
+
+    Each stage is memoized by ``StageCache`` under a key chained from the
+    keys of the stages it depends on, and measured by ``StageMetrics``.
+    """
+
+    def __init__(self, stages: Iterable[Stage]):
+        """
+        Build the graph and check that it is a DAG.
+
+        Args:
+            stages: Stages of the pipeline, in any order
+
+        Raises:
+            ValueError: If a name is declared twice, an input is not produced
+                by any stage or the stages form a cycle
+        """
+        self.stages: dict[str, Stage] = {}
+        self.producers: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Stage {stage.name} is declared twice")
+            self.stages[stage.name] = stage
+
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"Output {output} is produced twice")
+                self.producers[output] = stage
+
+        for stage in self.stages.values():
+            missing = [name for name in stage.inputs if name not in self.producers]
+            if missing:
+                raise ValueError(f"Stage {stage.name} has unknown inputs {missing}")
+
+        self.order = self._topological_order()
+
+    def dependencies(self, stage: Stage) -> list[Stage]:
+        """
+        Stages producing the inputs of a stage.
+
+        Returns:
+            Upstream stages, without duplicates, in input order
+        """
+        upstream = [self.producers[name] for name in stage.inputs]
+        return list({dependency.name: dependency for dependency in upstream}.values())
+
+    def run(
+        self,
+        cache: StageCache | None = None,
+        metrics: StageMetrics | None = None,
+        n_workers: int = 1,
+    ) -> dict[str, Any]:
+        """
+        Run every stage of the graph.
+
+        Args:
+            cache: Stage cache, or None to compute every stage
+            metrics: Metrics collecting one entry per stage
+            n_workers: Number of worker processes; one runs every stage in
+                the calling process, in topological order
+
+        Returns:
+            Mapping of output name to value
+
+        Raises:
+            ValueError: If a stage, or its cache entry, does not return one
+                value per output
+        """
+        cache = cache or StageCache()
+        metrics = metrics or StageMetrics()
+
+        values: dict[str, Any] = {}
+        keys: dict[str, str | None] = {}
+        pending = list(self.order)
+        running: dict[Future, Stage] = {}
+
+        def store(stage, output):
+            if len(stage.outputs) == 1:
+                output = (output,)
+            if not isinstance(output, (tuple, list)) or len(output) != len(
+                stage.outputs
+            ):
+                raise ValueError(
+                    f"Stage {stage.name} must return {len(stage.outputs)} "
+                    f"outputs {stage.outputs}"
+                )
+            values.update(zip(stage.outputs, output))
+
+        def finish(stage, output):
+            store(stage, output)
+            cache.save(stage.name, keys[stage.name], output)
+
+        pool = ProcessPoolExecutor(n_workers) if n_workers > 1 else nullcontext()
+        with pool:
+            while pending or running:
+                ready = [
+                    stage
+                    for stage in pending
+                    if all(name in values for name in stage.inputs)
+                ]
+                if not ready and not running:
+                    names = [stage.name for stage in pending]
+                    raise ValueError(f"Stages {names} have inputs never produced")
+
+                to_compute = []
+                for stage in ready:
+                    pending.remove(stage)
+                    key = cache.stage_key(
+                        stage.name,
+                        stage.version,
+                        [keys[dep.name] for dep in self.dependencies(stage)]
+                        + stage.sources,
+                        stage.params,
+                    )
+                    keys[stage.name] = key
+
+                    if cache.contains(stage.name, key):
+                        store(
+                            stage,
+                            metrics.track(
+                                stage.name,
+                                lambda: cache.load(stage.name, key),
+                                cached=True,
+                            ),
+                        )
+                    else:
+                        to_compute.append(stage)
+
+                if n_workers <= 1 or (len(to_compute) == 1 and not running):
+                    for stage in to_compute:
+                        args = [values[name] for name in stage.inputs]
+                        finish(
+                            stage,
+                            metrics.track(
+                                stage.name, lambda: stage.fn(*args), inputs=args
+                            ),
+                        )
+                else:
+                    for stage in to_compute:
+                        logger.debug("Stage %s submitted to a worker", stage.name)
+                        args = [values[name] for name in stage.inputs]
+                        future = pool.submit(
+                            _run_stage,
+                            stage.name,
+                            stage.fn,
+                            args,
+                            metrics.sample_interval,
+                            metrics.deep,
+                        )
+                        running[future] = stage
+
+                if ready or not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    output, entry = future.result()
+                    metrics.stages.append(entry)
+                    finish(stage, output)
+
+        return values
+
+    def _topological_order(self) -> list[Stage]:
+        """
+        Order the stages so that every stage comes after its dependencies.
+
+        Stages keep their declaration order whenever the dependencies allow
+        it.
+
+        Raises:
+            ValueError: If the stages form a cycle
+        """
+        order: list[Stage] = []
+        done: set[str] = set()
+        remaining = list(self.stages.values())
+
+        while remaining:
+            ready = [
+                stage
+                for stage in remaining
+                if all(dep.name in done for dep in self.dependencies(stage))
+            ]
+            if not ready:
+                names = [stage.name for stage in remaining]
+                raise ValueError(f"Stages {names} form a cycle")
+
+            for stage in ready:
+                remaining.remove(stage)
+                done.add(stage.name)
+            order += ready
+
+        return order
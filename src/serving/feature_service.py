@@ -0,0 +1,330 @@
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.cache.cache_interface import CacheInterface
+from src.source_parser.player_dimension import PlayerDimension
+from src.transformers.feature_transforms import DummyEncoder, FeatureScaler
+from src.transformers.player_stats import PlayerStatsState
+from src.transformers.ratings import RATING_FEATURE_COLS, RatingState
+from src.transformers.transformers import (
+    compute_rating_features,
+    compute_score_features,
+    prepare_tennis_model_data,
+)
+
+
+PLAYER_ATTRIBUTES = ["hand", "ht", "age"]
+
+
+class FeatureService:
+    """
+    Features of upcoming matches, computed in process from fitted state.
+
+    Holds the ratings, the player running averages, the dummy vocabularies
+    and the scaler fitted on the history, plus the latest hand, height and
+    age seen for every player. The features of a match that has not been
+    played yet are read from that state without replaying anything, so a
+    single match costs well under a millisecond of lookups and small array
+    operations; ``features_batch`` does the same for a whole order of play.
+
+    Players are named in requests and resolved to the codes of the player
+    dimension the history was parsed with, which key the state.
+
+    The features are those of the batch pipeline for the same match, in the
+    same columns, up to floating point rounding of the last-N averages.
+    Results of new matches, parsed with the same dimension, are folded in
+    with ``update``.
+    """
+
+    def __init__(
+        self,
+        rating_state: RatingState,
+        stats_state: PlayerStatsState,
+        encoder: DummyEncoder,
+        scaler: FeatureScaler,
+        columns: list[str],
+        player_dimension: PlayerDimension,
+    ):
+        """
+        Initialize the service from fitted state.
+
+        Args:
+            rating_state: Ratings after the last match of the history
+            stats_state: Player running averages after the same match
+            encoder: Fitted dummy encoder
+            scaler: Fitted scaler
+            columns: Feature columns to return, in order: the pipeline
+                output without ``outcome``
+            player_dimension: Dimension the matches were parsed with
+        """
+        self.rating_state = rating_state
+        self.stats_state = stats_state
+        self.encoder = encoder
+        self.scaler = scaler
+        self.columns = list(columns)
+        self.player_dimension = player_dimension
+
+        # Player code to the latest known hand, height and age, and the
+        # date the age was known at.
+        self.players: dict[int, tuple] = {}
+        self.dtypes = {"ht": np.dtype(float), "age": np.dtype(float)}
+
+    def observe(self, matches: pd.DataFrame) -> "FeatureService":
+        """
+        Record the latest attributes of the players of past matches.
+
+        Missing values do not overwrite known ones.
+
+        Args:
+            matches: Parsed matches with the player code, hand, height and
+                age columns and ``tourney_datetime``
+
+        Returns:
+            The service itself
+        """
+        frames = []
+        for side in ["A", "B"]:
+            frame = pd.DataFrame(
+                {
+                    col: matches[f"player_{side}_{col}"].to_numpy()
+                    for col in ["code", *PLAYER_ATTRIBUTES]
+                }
+            )
+            frame["age_datetime"] = (
+                matches["tourney_datetime"]
+                .where(matches[f"player_{side}_age"].notna())
+                .to_numpy()
+            )
+            frames.append(frame)
+
+        # Heights and ages keep the dtype of the history, which the scaling
+        # arithmetic depends on.
+        for attribute in self.dtypes:
+            self.dtypes[attribute] = matches[f"player_A_{attribute}"].dtype
+
+        # groupby().last() takes the last non-missing value of each column.
+        order = np.argsort(
+            np.tile(matches["tourney_datetime"].to_numpy(), 2), kind="stable"
+        )
+        latest = (
+            pd.concat(frames, ignore_index=True)
+            .iloc[order]
+            .groupby("code", sort=False)
+            .last()
+        )
+        self.players.update(
+            zip(latest.index, latest.itertuples(index=False, name=None))
+        )
+
+        return self
+
+    def update(self, matches: pd.DataFrame) -> "FeatureService":
+        """
+        Fold the results of new matches into the state.
+
+        Matches already processed by the rating state are skipped, so the
+        same frame can be passed more than once.
+
+        Args:
+            matches: Matches parsed with ``player_dimension``, in
+                chronological order
+
+        Returns:
+            The service itself
+        """
+        matches = self.rating_state.pending(matches)
+        if len(matches):
+            compute_rating_features(matches, self.rating_state)
+            prepare_tennis_model_data(
+                matches, compute_score_features(matches), self.stats_state
+            )
+            self.observe(matches)
+
+        return self
+
+    def features(
+        self,
+        player_a: str,
+        player_b: str,
+        surface: str,
+        round: str,
+        best_of: int,
+        tourney_level: str,
+        tourney_datetime: pd.Timestamp | None = None,
+        **attributes: Any,
+    ) -> dict[str, Any]:
+        """
+        Features of a single upcoming match.
+
+        Args:
+            player_a: Name of player A
+            player_b: Name of player B
+            surface: Court surface
+            round: Round of the match
+            best_of: Number of sets of the match
+            tourney_level: Level of the tournament
+            tourney_datetime: Date of the match, today by default
+            **attributes: Player attributes overriding the latest seen, such
+                as ``player_A_age`` or ``player_B_hand``
+
+        Returns:
+            Mapping of feature column to value
+        """
+        match = {
+            "player_A_name": [player_a],
+            "player_B_name": [player_b],
+            "surface": [surface],
+            "round": [round],
+            "best_of": [best_of],
+            "tourney_level": [tourney_level],
+            "tourney_datetime": [tourney_datetime],
+            **{col: [value] for col, value in attributes.items()},
+        }
+
+        return {col: values[0] for col, values in self._compute(match).items()}
+
+    def features_batch(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """
+        Features of several upcoming matches, such as an order of play.
+
+        Args:
+            matches: One row per match with ``player_A_name``,
+                ``player_B_name``, the context columns and, optionally,
+                ``tourney_datetime`` and player attribute columns
+
+        Returns:
+            Frame of features with the index of ``matches``
+        """
+        match = {col: matches[col].to_numpy() for col in matches.columns}
+
+        return pd.DataFrame(self._compute(match), index=matches.index)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the service to a pickle file.
+
+        Args:
+            path: File where to save the service
+        """
+        CacheInterface(Path(path)).save(self.__dict__)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FeatureService":
+        """
+        Load a service saved with ``save``.
+
+        Args:
+            path: File where the service was saved
+
+        Returns:
+            The restored FeatureService
+        """
+        service = cls.__new__(cls)
+        service.__dict__.update(CacheInterface(Path(path)).load())
+
+        return service
+
+    def _compute(self, match: dict[str, Any]) -> dict[str, np.ndarray]:
+        """
+        Feature arrays of the matches described by ``match``.
+
+        Args:
+            match: Mapping of column name to one value per match
+
+        Returns:
+            Mapping of feature column to array, in ``columns`` order
+        """
+        names = {
+            side: np.asarray(match[f"player_{side}_name"], dtype=object)
+            for side in ["A", "B"]
+        }
+        codes = {
+            side: self.player_dimension.lookup(names[side]) for side in ["A", "B"]
+        }
+        n_matches = len(names["A"])
+
+        when = match.get("tourney_datetime")
+        if when is None:
+            when = [None] * n_matches
+        today = np.datetime64("today", "ns")
+        when = np.array(
+            [today if w is None else pd.Timestamp(w).asm8 for w in when],
+            dtype="datetime64[ns]",
+        )
+
+        values = {"tourney_datetime": when}
+        for side in ["A", "B"]:
+            values[f"player_{side}_name"] = names[side]
+            values.update(self._attributes(side, codes[side], when, match))
+
+        encoded = self.encoder.encode({**values, **match}).astype(
+            self.encoder.dtype, copy=False
+        )
+        values.update(zip(self.encoder.feature_names, encoded.T))
+
+        means = self.stats_state.current_means(np.r_[codes["A"], codes["B"]])
+        for window, window_means in means.items():
+            for i, col in enumerate(self.stats_state.stats_cols):
+                values[f"player_A_{window}_{col}"] = window_means[:n_matches, i]
+                values[f"player_B_{window}_{col}"] = window_means[n_matches:, i]
+
+        periods = None
+        if self.rating_state.glicko_period:
+            periods = pd.DatetimeIndex(when).to_period(
+                self.rating_state.glicko_period
+            ).asi8
+        ratings = self.rating_state.preview(codes["A"], codes["B"], periods)
+        values.update(zip(RATING_FEATURE_COLS, ratings.T))
+
+        # Same dtype rules as FeatureScaler.transform.
+        to_scale = [values[col] for col in self.scaler.columns]
+        if all(column.dtype.kind == "f" for column in to_scale):
+            dtype = np.result_type(*to_scale)
+        else:
+            dtype = np.float64
+        scaled = self.scaler.transform_array(np.column_stack(to_scale).astype(dtype))
+        values.update(zip(self.scaler.columns, scaled.T))
+
+        return {col: values[col] for col in self.columns}
+
+    def _attributes(
+        self,
+        side: str,
+        codes: np.ndarray,
+        when: np.ndarray,
+        match: dict[str, Any],
+    ) -> dict[str, np.ndarray]:
+        """
+        Hand, height and age of the players of one side of the matches.
+
+        Values passed in ``match`` win over the latest seen ones. Ages are
+        carried forward from the date they were seen to the match date.
+        """
+        unknown = (None, np.nan, np.nan, pd.NaT)
+        known = [self.players.get(code, unknown) for code in codes.tolist()]
+        hands, heights, ages, seen = zip(*known) if known else ([],) * 4
+        seen = np.array(
+            [pd.Timestamp(date).asm8 for date in seen], dtype="datetime64[ns]"
+        )
+        days = (when - seen) / np.timedelta64(1, "D")
+        latest = {
+            "hand": np.array(hands, dtype=object),
+            "ht": np.array(heights, dtype=self.dtypes["ht"]),
+            "age": (np.array(ages, dtype=float) + days / 365.25).astype(
+                self.dtypes["age"]
+            ),
+        }
+
+        attributes = {}
+        for attribute in PLAYER_ATTRIBUTES:
+            col = f"player_{side}_{attribute}"
+            attributes[col] = (
+                np.asarray(match[col], dtype=latest[attribute].dtype)
+                if col in match
+                else latest[attribute]
+            )
+
+        return attributes
@@ -0,0 +1,7 @@
+from ._base_data_sink import BaseDataSink
+from ._arrow_data_sink import ArrowDataSink
+from .loader_data_sink import LoaderDataSink
+from .csv_data_sink import CSVDataSink
+from .parquet_data_sink import ParquetDataSink
+from .feather_data_sink import FeatherDataSink
+from .feature_matrix import FeatureMatrixWriter, load_feature_matrix
@@ -0,0 +1,168 @@
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import os
+from pathlib import Path
+from typing import Any, Unpack
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+
+from src.config.pipeline_config import PipelineConfig
+from src.sink._base_data_sink import BaseDataSink
+
+
+class ArrowDataSink(BaseDataSink):
+    """
+    Base class of the sinks writing Arrow-based columnar files.
+
+    Columns keep their dtypes and are compressed with ``output_compression``
+    (the format default when unset). Without partitioning the output is a
+    single file that stays open between calls, so appended frames become
+    new row groups or record batches of that file. With
+    ``output_partition_by_year`` every year goes to its own hive partition
+    (``<path>/year=YYYY/part-*``), which ``ParquetDataLoader`` reads back,
+    and partitions are written concurrently by ``output_threads`` threads.
+    The conversion from pandas uses the same number of threads.
+    """
+
+    partition_col = "year"
+    suffix: str = None
+    default_compression: str = None
+
+    def __init__(self, **config: Unpack[PipelineConfig]):
+        """
+        Initialize the sink.
+
+        Args:
+            config: Configuration dictionary with sink-specific settings
+        """
+        super().__init__(**config)
+
+        self.compression = config.get("output_compression", self.default_compression)
+        self.partitioned = config.get("output_partition_by_year", False)
+        self.n_threads = config.get("output_threads") or os.cpu_count() or 1
+
+        self._writer = None
+        self._schema: pa.Schema | None = None
+
+    def write(self, data: pd.DataFrame, path: str, append: bool = False) -> None:
+        """
+        Write data to the columnar output.
+
+        Args:
+            data: DataFrame to write
+            path: Output file, or root directory when partitioned by year
+            append: Add the rows to the file still open, or new files next to
+                the existing ones of each partition, instead of replacing them
+        """
+        table = self._to_table(data)
+
+        if self.partitioned:
+            self._write_partitions(data, table, Path(path), append)
+            return
+
+        if not append or self._writer is None:
+            self.close()
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._schema = table.schema
+            self._writer = self._open_writer(path, self._schema)
+
+        self._writer.write_table(self._conform(table))
+
+    def close(self) -> None:
+        """Finalize the file still open, if any."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _to_table(self, data: pd.DataFrame) -> pa.Table:
+        """
+        Convert a frame to an Arrow table, without its index.
+
+        Arrow has no sparse columns, so sparse dummies are written dense.
+        """
+        sparse = [
+            col
+            for col, dtype in data.dtypes.items()
+            if isinstance(dtype, pd.SparseDtype)
+        ]
+        if sparse:
+            data = data.assign(**{col: data[col].sparse.to_dense() for col in sparse})
+
+        return pa.Table.from_pandas(
+            data, preserve_index=False, nthreads=self.n_threads
+        )
+
+    def _conform(self, table: pa.Table) -> pa.Table:
+        """
+        Cast an appended table to the schema of the open file.
+
+        Categorical columns of different frames can map to dictionaries with
+        different index widths.
+        """
+        if table.schema.equals(self._schema):
+            return table
+
+        return table.cast(self._schema)
+
+    def _write_partitions(
+        self, data: pd.DataFrame, table: pa.Table, root: Path, append: bool
+    ) -> None:
+        """
+        Write every year of the table to its partition, one thread per file.
+
+        Without ``append`` the files already in the partitions written are
+        removed first, as ``delete_matching`` does for Arrow datasets.
+        """
+        years = self._get_partition_year(data)
+        if years is None:
+            raise ValueError("Cannot partition data without a date column")
+
+        part = f"part-{uuid.uuid4().hex}" if append else "part"
+        jobs = []
+        for year, rows in pd.Series(range(len(data))).groupby(years.to_numpy()):
+            directory = root / f"{self.partition_col}={year}"
+            directory.mkdir(parents=True, exist_ok=True)
+            if not append:
+                for file in directory.glob("*"):
+                    file.unlink()
+
+            jobs.append((directory / f"{part}-0{self.suffix}", rows.to_numpy()))
+
+        def write_partition(path, rows):
+            part_table = table.take(rows)
+            writer = self._open_writer(path, part_table.schema)
+            try:
+                writer.write_table(part_table)
+            finally:
+                writer.close()
+
+        with ThreadPoolExecutor(max_workers=self.n_threads) as pool:
+            list(pool.map(lambda job: write_partition(*job), jobs))
+
+    def _get_partition_year(self, data: pd.DataFrame) -> pd.Series | None:
+        """
+        Derive the partition year of every row.
+
+        Returns:
+            Series with the year of each row, or None if it cannot be derived
+        """
+        if "tourney_datetime" in data.columns:
+            return data["tourney_datetime"].dt.year.astype("int32")
+
+        if "tourney_date" in data.columns:
+            return (data["tourney_date"] // 10000).astype("int32")
+
+        return None
+
+    @abstractmethod
+    def _open_writer(self, path: str | Path, schema: pa.Schema) -> Any:
+        """
+        Open a file writer with ``write_table`` and ``close`` methods.
+
+        Args:
+            path: File to write
+            schema: Schema of the tables to write
+        """
+        raise NotImplementedError
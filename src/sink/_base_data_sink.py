@@ -0,0 +1,71 @@
+from abc import ABC, abstractmethod
+from inspect import isabstract
+from typing import Unpack
+
+import pandas as pd
+
+from src.config.output_format import OutputFormat
+from src.config.pipeline_config import PipelineConfig
+
+
+class BaseDataSink(ABC):
+    output_format: OutputFormat | None = None
+
+    """
+    Abstract base class for writing the pipeline output.
+
+    A sink may keep a file open between calls to ``write`` so that appended
+    frames end up in the same file; ``close`` (or leaving the sink as a
+    context manager) finalizes it.
+    """
+
+    def __init__(self, **config: Unpack[PipelineConfig]):
+        """
+        Initialize the sink with optional configuration.
+
+        Args:
+            config: Configuration dictionary with sink-specific settings
+        """
+        self.config = config
+
+    @abstractmethod
+    def write(self, data: pd.DataFrame, path: str, append: bool = False) -> None:
+        """
+        Write data to the output.
+
+        Args:
+            data: DataFrame to write
+            path: Path where to write the data
+            append: Add to the data already written at path instead of
+                replacing it
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finalize the files still open."""
+
+    def __enter__(self) -> "BaseDataSink":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @classmethod
+    def from_config(cls, config: PipelineConfig) -> "BaseDataSink":
+        """
+        Build the sink selected by ``output_format``.
+
+        Without ``output_format`` the output is written by the loader, in the
+        format the data was loaded from.
+        """
+        subclasses = list(cls.__subclasses__())
+        while subclasses:
+            sub_clz = subclasses.pop()
+            subclasses += sub_clz.__subclasses__()
+            if isabstract(sub_clz):
+                continue
+            if sub_clz.output_format != config.get("output_format"):
+                continue
+            return sub_clz(**config)
+
+        raise NotImplementedError
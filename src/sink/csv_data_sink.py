@@ -0,0 +1,32 @@
+from pathlib import Path
+
+import pandas as pd
+
+from src.config.output_format import OutputFormat
+from src.sink._base_data_sink import BaseDataSink
+
+
+class CSVDataSink(BaseDataSink):
+    """
+    Sink writing a single CSV file.
+    """
+
+    output_format = OutputFormat.CSV
+
+    def write(self, data: pd.DataFrame, path: str, append: bool = False) -> None:
+        """
+        Write data to a CSV file.
+
+        Args:
+            data: DataFrame to write
+            path: Path of the CSV file
+            append: Add the rows to the end of the file, without a header
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        data.to_csv(
+            path,
+            index=False,
+            mode="a" if append else "w",
+            header=not append,
+            compression=self.config.get("output_compression", "infer"),
+        )
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from src.config.output_format import OutputFormat
+from src.sink._arrow_data_sink import ArrowDataSink
+
+
+class FeatherDataSink(ArrowDataSink):
+    """
+    Sink writing Feather (Arrow IPC) files, compressed with LZ4 by default.
+
+    Buffers are compressed by the Arrow thread pool. The IPC file format
+    cannot replace a dictionary between record batches, so categorical
+    columns are stored as plain values and frames appended to the same file
+    do not need matching categories.
+    """
+
+    output_format = OutputFormat.FEATHER
+    suffix = ".feather"
+    default_compression = "lz4"
+
+    def _to_table(self, data: pd.DataFrame) -> pa.Table:
+        table = super()._to_table(data)
+
+        for i, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(
+                    i, field.name, table.column(i).cast(field.type.value_type)
+                )
+
+        return table
+
+    def _open_writer(
+        self, path: str | Path, schema: pa.Schema
+    ) -> pa.ipc.RecordBatchFileWriter:
+        options = pa.ipc.IpcWriteOptions(
+            compression=self.compression, use_threads=self.n_threads > 1
+        )
+        return pa.ipc.new_file(str(path), schema, options=options)
@@ -0,0 +1,182 @@
+import json
+from pathlib import Path
+import struct
+
+import numpy as np
+import pandas as pd
+
+
+# Size of the .npy header reserved up front, so the final shape can be
+# written in place once every row is known. Magic string, version and
+# header length take 10 bytes, which makes the data start 64-byte aligned.
+NPY_HEADER_LEN = 246
+
+
+class FeatureMatrixWriter:
+    """
+    Exports the numeric features as a memory-mappable matrix for training.
+
+    Writes three files next to each other:
+
+    - ``<path>``: the feature matrix, a C-contiguous float32 ``.npy`` array
+      with one row per match
+    - ``<stem>_target.npy``: the target of each row
+    - ``<stem>.json``: the sidecar with the column names, the target name,
+      the shape and the names of both arrays
+
+    Rows are streamed to disk as they are written, so a chunked run can
+    export season after season, and the ``.npy`` headers get their final
+    shape on ``close``. ``load_feature_matrix`` maps the arrays read-only:
+    every training process shares the same page-cached copy, without parsing
+    text or copying the data.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        target: str = "outcome",
+        dtype: np.dtype = np.float32,
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            path: File of the feature matrix
+            target: Column holding the target
+            dtype: Dtype of the feature matrix
+        """
+        self.path = Path(path)
+        self.target = target
+        self.dtype = np.dtype(dtype)
+
+        self.columns: list[str] | None = None
+        self.target_dtype: np.dtype | None = None
+        self.n_rows = 0
+        self._files = None
+
+    def write(self, data: pd.DataFrame, append: bool = False) -> None:
+        """
+        Write the rows of a frame.
+
+        Features are the numeric and boolean columns other than the target;
+        names, dates and categorical columns are left out.
+
+        Args:
+            data: Frame with the features and the target
+            append: Add the rows after those already written instead of
+                starting a new matrix
+        """
+        if not append or self._files is None:
+            self._open(data)
+
+        features, target = self._files
+        data[self.columns].to_numpy(dtype=self.dtype, na_value=np.nan).tofile(features)
+        data[self.target].to_numpy(dtype=self.target_dtype).tofile(target)
+        self.n_rows += len(data)
+
+    def close(self) -> None:
+        """Write the final shapes and the sidecar, and close the files."""
+        if self._files is None:
+            return
+
+        features, target = self._files
+        _write_npy_header(features, self.dtype, (self.n_rows, len(self.columns)))
+        _write_npy_header(target, self.target_dtype, (self.n_rows,))
+        features.close()
+        target.close()
+        self._files = None
+
+        sidecar = {
+            "features": self.path.name,
+            "target": _target_path(self.path).name,
+            "target_column": self.target,
+            "columns": self.columns,
+            "shape": [self.n_rows, len(self.columns)],
+            "dtype": self.dtype.name,
+        }
+        with open(_sidecar_path(self.path), "w") as f:
+            json.dump(sidecar, f, indent=2)
+
+    def __enter__(self) -> "FeatureMatrixWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _open(self, data: pd.DataFrame) -> None:
+        """Start a new matrix with the feature columns of ``data``."""
+        self.close()
+
+        self.columns = [
+            col
+            for col in data.columns
+            if col != self.target
+            and (
+                pd.api.types.is_numeric_dtype(data[col])
+                or pd.api.types.is_bool_dtype(data[col])
+            )
+        ]
+        self.target_dtype = data[self.target].to_numpy().dtype
+        self.n_rows = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._files = (
+            open(self.path, "wb"),
+            open(_target_path(self.path), "wb"),
+        )
+        for file, dtype, shape in zip(
+            self._files, [self.dtype, self.target_dtype], [(0, 0), (0,)]
+        ):
+            _write_npy_header(file, dtype, shape)
+
+
+def load_feature_matrix(
+    path: str | Path,
+) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """
+    Map a matrix exported by ``FeatureMatrixWriter``, read-only.
+
+    Args:
+        path: File of the feature matrix
+
+    Returns:
+        Tuple with the feature matrix, the target and the feature names
+    """
+    path = Path(path)
+    with open(_sidecar_path(path)) as f:
+        sidecar = json.load(f)
+
+    features = np.load(path, mmap_mode="r")
+    target = np.load(path.with_name(sidecar["target"]), mmap_mode="r")
+
+    return features, target, sidecar["columns"]
+
+
+def _target_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}_target.npy")
+
+
+def _sidecar_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+def _write_npy_header(file, dtype: np.dtype, shape: tuple[int, ...]) -> None:
+    """
+    Write a version 1.0 ``.npy`` header of fixed size at the start of a file.
+
+    The header is padded with spaces to ``NPY_HEADER_LEN``, so it can be
+    rewritten in place with a larger shape. The file position is left at
+    the end of the file.
+    """
+    header = repr(
+        {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": False,
+            "shape": shape,
+        }
+    )
+    file.seek(0)
+    file.write(np.lib.format.magic(1, 0))
+    file.write(struct.pack("<H", NPY_HEADER_LEN))
+    file.write(header.ljust(NPY_HEADER_LEN - 1).encode("latin1") + b"\n")
+    file.seek(0, 2)
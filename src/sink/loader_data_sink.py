@@ -0,0 +1,35 @@
+from pathlib import Path
+from typing import Unpack
+
+import pandas as pd
+
+from src.config.pipeline_config import PipelineConfig
+from src.loader import BaseDataLoader
+from src.sink._base_data_sink import BaseDataSink
+
+
+class LoaderDataSink(BaseDataSink):
+    """
+    Sink writing through ``save_data`` of the configured loader.
+
+    This is the sink used when no ``output_format`` is configured, so the
+    output keeps the format of the input.
+    """
+
+    output_format = None
+
+    def __init__(self, **config: Unpack[PipelineConfig]):
+        super().__init__(**config)
+        self.loader = BaseDataLoader.from_config(config)
+
+    def write(self, data: pd.DataFrame, path: str, append: bool = False) -> None:
+        """
+        Write data with the loader, creating the parent directory first.
+
+        Args:
+            data: DataFrame to write
+            path: Path where to write the data
+            append: Add to the data already written at path
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.loader.save_data(data, path, append=append)
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config.output_format import OutputFormat
+from src.sink._arrow_data_sink import ArrowDataSink
+
+
+class ParquetDataSink(ArrowDataSink):
+    """
+    Sink writing Parquet files, compressed with Snappy by default.
+    """
+
+    output_format = OutputFormat.PARQUET
+    suffix = ".parquet"
+    default_compression = "snappy"
+
+    def _open_writer(self, path: str | Path, schema: pa.Schema) -> pq.ParquetWriter:
+        return pq.ParquetWriter(path, schema, compression=self.compression)
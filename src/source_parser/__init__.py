@@ -1,3 +1,5 @@
 from ._base_parser import BaseDataParser
 
 from .tennis_match_parser import TennisMatchParser
+
+from .player_dimension import PlayerDimension
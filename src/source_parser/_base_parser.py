@@ -68,11 +68,11 @@ class BaseDataParser(ABC):
         return True
 
     @classmethod
-    def from_config(cls, data, config: PipelineConfig):
+    def from_config(cls, data, config: PipelineConfig, **kwargs):
         for sub_clz in cls.__subclasses__():
             if sub_clz.dataset_type != config["dataset_type"]:
                 continue
 
-            return sub_clz(data, **config)
+            return sub_clz(data, **kwargs, **config)
 
         raise NotImplementedError
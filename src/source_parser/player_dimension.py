@@ -0,0 +1,105 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.cache.cache_interface import CacheInterface
+
+
+class PlayerDimension:
+    """
+    Dense integer codes of the players, with their names as attributes.
+
+    Players are identified by their source id (``winner_id`` / ``loser_id``)
+    and get consecutive int32 codes in order of first appearance, so the
+    running state of the ratings and averages can be kept in arrays indexed
+    by code. Two players sharing a name keep distinct codes, and a player
+    whose name changes keeps the same one.
+
+    Parsing consecutive chunks with the same dimension gives every player the
+    same code in all of them.
+    """
+
+    def __init__(self):
+        self.codes: dict = {}
+        self.names: list = []
+        self._by_name: dict | None = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def encode(self, ids, names) -> np.ndarray:
+        """
+        Map player ids to codes, registering unseen players.
+
+        The name of every player is updated to the last one seen.
+
+        Args:
+            ids: Source id of each player, in chronological order
+            names: Name of each player
+
+        Returns:
+            Array with the int32 code of every id
+        """
+        ids = pd.Index(np.asarray(ids, dtype=object))
+        names = np.asarray(names, dtype=object)
+        known = pd.Index(list(self.codes))
+        codes = known.get_indexer(ids) if len(known) else np.full(len(ids), -1)
+
+        new_ids = pd.unique(ids[codes == -1])
+        if len(new_ids):
+            start = len(self.codes)
+            self.codes.update({key: start + i for i, key in enumerate(new_ids)})
+            self.names.extend([None] * len(new_ids))
+            codes = pd.Index(list(self.codes)).get_indexer(ids)
+
+        # Later rows overwrite earlier ones, so each code keeps its last name.
+        for code, name in dict(zip(codes.tolist(), names.tolist())).items():
+            self.names[code] = name
+        self._by_name = None
+
+        return codes.astype(np.int32)
+
+    def lookup(self, names) -> np.ndarray:
+        """
+        Find the codes of players by name.
+
+        A name shared by several players resolves to the last one registered.
+
+        Args:
+            names: Sequence of player names
+
+        Returns:
+            Array with the int32 code of every name, -1 for unknown names
+        """
+        if self._by_name is None:
+            self._by_name = {name: code for code, name in enumerate(self.names)}
+
+        return np.array(
+            [self._by_name.get(name, -1) for name in names], dtype=np.int32
+        )
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the dimension to a pickle file.
+
+        Args:
+            path: File where to save the dimension
+        """
+        CacheInterface(Path(path)).save({"codes": self.codes, "names": self.names})
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PlayerDimension":
+        """
+        Load a dimension saved with ``save``.
+
+        Args:
+            path: File where the dimension was saved
+
+        Returns:
+            The restored PlayerDimension
+        """
+        dimension = cls()
+        dimension.__dict__.update(CacheInterface(Path(path)).load())
+
+        return dimension
@@ -1,7 +1,9 @@
 from src.config.dataset_type import DatasetType
 from src.config.pipeline_config import PipelineConfig
 from src.source_parser._base_parser import BaseDataParser
+from src.source_parser.player_dimension import PlayerDimension
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional, Unpack
 
@@ -9,6 +11,10 @@ from typing import Dict, Any, List, Optional, Unpack
 class TennisMatchParser(BaseDataParser):
     """
     Parser for tennis match data.
+
+    Besides standardizing the matches, the parser maps their players to the
+    dense codes of a ``PlayerDimension``, in the ``winner_code`` and
+    ``loser_code`` columns that downstream stages key on.
     """
 
     dataset_type = DatasetType.TENNIS_MATCH
@@ -16,11 +22,24 @@ class TennisMatchParser(BaseDataParser):
     def __init__(
         self,
         data: pd.DataFrame,
+        player_dimension: Optional[PlayerDimension] = None,
         **config: Unpack[PipelineConfig],
     ):
+        """
+        Initialize the parser.
+
+        Args:
+            data: Raw tennis match data
+            player_dimension: Dimension the players are registered in, shared
+                by the chunks of a chunked run; a new one when omitted
+            config: Configuration dictionary with parser-specific settings
+        """
         super().__init__(**config)
         self._data_col = "tourney_date"
         self.data = data
+        self.player_dimension = (
+            PlayerDimension() if player_dimension is None else player_dimension
+        )
 
     def parse(self) -> pd.DataFrame:
         """
@@ -97,12 +116,33 @@ class TennisMatchParser(BaseDataParser):
         """
         Process and standardize player information.
 
+        Players are identified by ``winner_id`` / ``loser_id``, or by name
+        where the id is missing, and get the codes of the player dimension.
+        Winner and loser of each match are interleaved so that codes follow
+        the chronological order of first appearance.
+
         Args:
             data: DataFrame with player information
 
         Returns:
             DataFrame with processed player information
         """
+        keys = []
+        for side in ["winner", "loser"]:
+            key = data[f"{side}_name"].astype(object)
+            if f"{side}_id" in data.columns:
+                ids = data[f"{side}_id"].astype(object)
+                key = ids.where(ids.notna(), key)
+            keys.append(key.to_numpy())
+
+        codes = self.player_dimension.encode(
+            np.column_stack(keys).ravel(),
+            np.column_stack(
+                [data["winner_name"].to_numpy(), data["loser_name"].to_numpy()]
+            ).ravel(),
+        )
+        data["winner_code"] = codes[0::2]
+        data["loser_code"] = codes[1::2]
 
         return data
 
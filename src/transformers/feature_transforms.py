@@ -0,0 +1,362 @@
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import MinMaxScaler
+
+from src.cache.cache_interface import CacheInterface
+from src.transformers.transformers import count_dummy_values, fit_dummy_categories
+
+
+# Batches up to this size are looked up value by value.
+SMALL_BATCH = 64
+
+
+class DummyEncoder:
+    """
+    One-hot encoder with category vocabularies frozen at fit time.
+
+    Produces the columns of ``create_dummy_variables`` called with the
+    fitted ``categories``, so features built for training and for scoring
+    new matches always line up. Vocabularies are derived from value counts,
+    which ``partial_fit`` accumulates frame by frame.
+
+    ``transform`` looks values up in the frozen vocabularies and fills all
+    dummy columns from one boolean array, without ``pd.get_dummies``, so
+    encoding a small batch is cheap. The dummy columns can be produced as
+    ``uint8`` or as sparse columns, like the ``dtype`` and ``sparse``
+    options of ``create_dummy_variables``.
+    """
+
+    def __init__(
+        self,
+        standard_dummy_cols: list[str] = (),
+        reduced_category_config: list[tuple[str, int]] = (),
+        cols_to_drop: list[str] = (),
+        dtype: Any = bool,
+        sparse: bool = False,
+    ):
+        """
+        Initialize an unfitted encoder.
+
+        Args:
+            standard_dummy_cols: Columns converted directly to dummies
+            reduced_category_config: ``(column, top_n)`` pairs of columns
+                reduced to their top N values, the others becoming
+                ``"Outros"``
+            cols_to_drop: Columns dropped from the output
+            dtype: Dtype of the dummy columns
+            sparse: Whether the dummy columns are pandas sparse columns
+        """
+        self.standard_dummy_cols = list(standard_dummy_cols)
+        self.reduced_category_config = list(reduced_category_config)
+        self.cols_to_drop = list(cols_to_drop)
+        self.dtype = np.dtype(dtype)
+        self.sparse = sparse
+
+        self.counts: dict[str, pd.Series] = {}
+        self.categories: dict[str, list] | None = None
+        self._indexes: dict[str, pd.Index] = {}
+
+    @property
+    def feature_names(self) -> list[str]:
+        """Names of the dummy columns, in output order."""
+        self._check_fitted()
+
+        return [
+            f"{prefix}_{category}"
+            for col, prefix in self._encoded_columns()
+            for category in self.categories[col][1:]
+        ]
+
+    def fit(self, df: pd.DataFrame) -> "DummyEncoder":
+        """
+        Fit the vocabularies on a frame, discarding previous fits.
+
+        Returns:
+            The encoder itself
+        """
+        self.counts = {}
+
+        return self.partial_fit(df)
+
+    def partial_fit(self, df: pd.DataFrame) -> "DummyEncoder":
+        """
+        Add the values of a frame to the counts and refit the vocabularies.
+
+        Fitting frame by frame gives the vocabularies of a single fit on
+        their concatenation.
+
+        Returns:
+            The encoder itself
+        """
+        columns = {
+            "standard_dummy_cols": self.standard_dummy_cols,
+            "reduced_category_config": self.reduced_category_config,
+        }
+        self.counts = count_dummy_values(df, counts=self.counts, **columns)
+        self.categories = fit_dummy_categories(self.counts, **columns)
+        self._indexes = {
+            col: pd.Index(categories, dtype=object)
+            for col, categories in self.categories.items()
+        }
+
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Encode a frame with the frozen vocabularies.
+
+        Values outside the vocabulary of a standard column, and missing
+        values, get no dummy set. In reduced columns they count as
+        ``"Outros"`` when it is part of the vocabulary.
+
+        Args:
+            df: Frame with the columns to encode
+
+        Returns:
+            Frame without the encoded and dropped columns, followed by the
+            dummy columns
+        """
+        encoded = self.encode(df).astype(self.dtype, copy=False)
+        if self.sparse:
+            dummies = pd.DataFrame.sparse.from_spmatrix(
+                csr_matrix(encoded), index=df.index, columns=self.feature_names
+            )
+        else:
+            dummies = pd.DataFrame(encoded, index=df.index, columns=self.feature_names)
+        removed = set(self.standard_dummy_cols) | set(self.cols_to_drop)
+
+        return pd.concat(
+            [df.drop(columns=[col for col in df.columns if col in removed]), dummies],
+            axis=1,
+            copy=False,
+        )
+
+    def encode(self, columns: Mapping[str, Any]) -> np.ndarray:
+        """
+        Dummy values of the encoded columns, without building a frame.
+
+        Args:
+            columns: Frame, or mapping of column name to values, holding
+                the columns to encode
+
+        Returns:
+            Boolean array with one row per value and one column per entry
+            of ``feature_names``
+        """
+        self._check_fitted()
+
+        blocks = []
+        for col, prefix in self._encoded_columns():
+            codes = self._codes(columns[col], self._indexes[col])
+            if prefix != col and "Outros" in self._indexes[col]:
+                codes[codes == -1] = self._indexes[col].get_loc("Outros")
+
+            # drop_first: the first category is the all-false row.
+            blocks.append(codes[:, None] == np.arange(1, len(self._indexes[col])))
+
+        if not blocks:
+            n_rows = len(columns) if isinstance(columns, pd.DataFrame) else 0
+            return np.zeros((n_rows, 0), dtype=bool)
+
+        return np.hstack(blocks)
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit the vocabularies on a frame and encode it.
+
+        Returns:
+            The encoded frame
+        """
+        return self.fit(df).transform(df)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the fitted encoder to a pickle file.
+
+        Args:
+            path: File where to save the encoder
+        """
+        CacheInterface(Path(path)).save(self.__dict__)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "DummyEncoder":
+        """
+        Load an encoder saved with ``save``.
+
+        Args:
+            path: File where the encoder was saved
+
+        Returns:
+            The fitted DummyEncoder
+        """
+        encoder = cls()
+        encoder.__dict__.update(CacheInterface(Path(path)).load())
+
+        return encoder
+
+    def _encoded_columns(self) -> list[tuple[str, str]]:
+        """Source column and dummy prefix of every encoded column."""
+        return [(col, col) for col in self.standard_dummy_cols] + [
+            (col, f"{col}_reduzido") for col, _ in self.reduced_category_config
+        ]
+
+    @staticmethod
+    def _codes(values, index: pd.Index) -> np.ndarray:
+        """
+        Position of every value in a vocabulary, -1 when it is not in it.
+
+        Categorical columns only look up their categories, which is much
+        cheaper than looking up every row. Small batches are looked up
+        value by value, which skips the fixed cost of ``get_indexer``.
+        """
+        if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+            positions = {category: i for i, category in enumerate(index)}
+            category_codes = [positions.get(c, -1) for c in values.dtype.categories]
+            codes = np.array(category_codes + [-1])[values.array.codes]
+        elif len(values) <= SMALL_BATCH:
+            positions = dict(zip(index, range(len(index))))
+            codes = np.array([positions.get(v, -1) for v in values], dtype=np.intp)
+        else:
+            codes = index.get_indexer(np.asarray(values, dtype=object))
+
+        return codes
+
+    def _check_fitted(self) -> None:
+        if self.categories is None:
+            raise RuntimeError("DummyEncoder is not fitted")
+
+
+class FeatureScaler:
+    """
+    Min-max scaler of a fixed set of columns, fitted once and persisted.
+
+    Fitting goes through ``MinMaxScaler``, so ``partial_fit`` can span
+    several frames. ``transform`` applies the fitted ``scale_`` and
+    ``min_`` with the same arithmetic as ``MinMaxScaler.transform``, but
+    without its input validation, which dominates on small batches.
+    """
+
+    def __init__(self, columns: list[str] = ()):
+        """
+        Initialize an unfitted scaler.
+
+        Args:
+            columns: Columns to scale
+        """
+        self.columns = list(columns)
+        self.scaler = MinMaxScaler()
+
+    def fit(self, df: pd.DataFrame) -> "FeatureScaler":
+        """
+        Fit the column ranges on a frame, discarding previous fits.
+
+        Returns:
+            The scaler itself
+        """
+        self.scaler = MinMaxScaler()
+
+        return self.partial_fit(df)
+
+    def partial_fit(self, df: pd.DataFrame) -> "FeatureScaler":
+        """
+        Extend the column ranges with the values of a frame.
+
+        An empty frame leaves the ranges unchanged.
+
+        Returns:
+            The scaler itself
+        """
+        if len(df):
+            self.scaler.partial_fit(df[self.columns])
+
+        return self
+
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Scale the columns of a frame with the fitted ranges.
+
+        Args:
+            df: Frame with the columns to scale
+
+        Returns:
+            Copy of the frame with the columns scaled
+        """
+        if df.empty:
+            return df.copy()
+        self._check_fitted()
+
+        # Same dtype rules as the validation of MinMaxScaler: float columns
+        # keep their precision and anything else becomes float64.
+        dtypes = df[self.columns].dtypes
+        if all(isinstance(dtype, np.dtype) and dtype.kind == "f" for dtype in dtypes):
+            dtype = np.result_type(*dtypes)
+        else:
+            dtype = np.float64
+
+        values = self.transform_array(
+            df[self.columns].to_numpy(dtype=dtype, na_value=np.nan, copy=True)
+        )
+
+        result_df = df.copy()
+        result_df[self.columns] = values
+
+        return result_df
+
+    def transform_array(self, values: np.ndarray) -> np.ndarray:
+        """
+        Scale, in place, an array holding the columns in ``columns`` order.
+
+        Args:
+            values: Float array of shape ``(n_rows, len(columns))``
+
+        Returns:
+            The scaled array
+        """
+        self._check_fitted()
+
+        values *= self.scaler.scale_
+        values += self.scaler.min_
+
+        return values
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fit the column ranges on a frame and scale it.
+
+        Returns:
+            The scaled frame
+        """
+        return self.fit(df).transform(df)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the fitted scaler to a pickle file.
+
+        Args:
+            path: File where to save the scaler
+        """
+        CacheInterface(Path(path)).save(self.__dict__)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FeatureScaler":
+        """
+        Load a scaler saved with ``save``.
+
+        Args:
+            path: File where the scaler was saved
+
+        Returns:
+            The fitted FeatureScaler
+        """
+        scaler = cls()
+        scaler.__dict__.update(CacheInterface(Path(path)).load())
+
+        return scaler
+
+    def _check_fitted(self) -> None:
+        if not hasattr(self.scaler, "scale_"):
+            raise RuntimeError("FeatureScaler is not fitted")
@@ -0,0 +1,312 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.cache.cache_interface import CacheInterface
+
+
+class PlayerStatsState:
+    """
+    Running averages of per-match statistics for every player.
+
+    Players are keyed by code or by name, like in ``RatingState``. Three
+    kinds of window are supported, all averaging the previous matches of a
+    player and skipping missing values:
+
+    - ``avg``: every previous match (an expanding mean)
+    - ``avg_last{n}``: the previous ``n`` matches
+    - ``avg_ewm{h}``: every previous match, with weights halving every ``h``
+      matches
+
+    Rows are grouped by player with one stable sort and every window of
+    every statistic is read from a single cumulative sum over that order.
+    The state keeps the totals, the last matches of each player and the
+    decayed sums, so feeding matches chronologically in several chunks
+    yields the same averages as one call over the whole history.
+    """
+
+    def __init__(
+        self,
+        stats_cols: list[str],
+        last_n: list[int] = (),
+        halflives: list[float] = (),
+    ):
+        self.stats_cols = list(stats_cols)
+        self.last_n = sorted(set(last_n))
+        self.halflives = sorted(set(halflives))
+
+        n_stats = len(self.stats_cols)
+        self.players: dict[str, int] = {}
+        self.sums = np.zeros((0, n_stats))
+        self.counts = np.zeros((0, n_stats))
+        self.ewm_sums = {h: np.zeros((0, n_stats)) for h in self.halflives}
+        self.ewm_weights = {h: np.zeros((0, n_stats)) for h in self.halflives}
+
+        # Last max(last_n) rows of every player, in chronological order.
+        self.tail_ids = np.zeros(0, dtype=np.int64)
+        self.tail_values = np.zeros((0, n_stats))
+
+    @property
+    def windows(self) -> list[str]:
+        """Names of the windows, in the order returned by ``running_means``."""
+        return (
+            ["avg"]
+            + [f"avg_last{n}" for n in self.last_n]
+            + [f"avg_ewm{h:g}" for h in self.halflives]
+        )
+
+    def player_ids(self, names) -> np.ndarray:
+        """
+        Map players to dense ids, registering unseen players.
+
+        Args:
+            names: Sequence of player codes or player names
+
+        Returns:
+            Array with the id of every player
+        """
+        codes = np.asarray(names)
+        if codes.dtype.kind in "iu":
+            if self.players:
+                raise ValueError("The state is keyed by player name")
+            self._grow((codes.max() + 1 if len(codes) else 0) - len(self.sums))
+            return codes.astype(np.int64)
+
+        if len(self.players) != len(self.sums):
+            raise ValueError("The state is keyed by player code")
+
+        names = pd.Index(np.asarray(names, dtype=object))
+        ids = pd.Index(list(self.players)).get_indexer(names)
+
+        new_names = pd.unique(names[ids == -1])
+        if len(new_names):
+            start = len(self.players)
+            self.players.update({name: start + i for i, name in enumerate(new_names)})
+            self._grow(len(new_names))
+            ids = pd.Index(list(self.players)).get_indexer(names)
+
+        return ids
+
+    def _grow(self, n_new: int) -> None:
+        if n_new <= 0:
+            return
+
+        def grow(values):
+            return np.vstack([values, np.zeros((n_new, values.shape[1]))])
+
+        self.sums = grow(self.sums)
+        self.counts = grow(self.counts)
+        for h in self.halflives:
+            self.ewm_sums[h] = grow(self.ewm_sums[h])
+            self.ewm_weights[h] = grow(self.ewm_weights[h])
+
+    def running_means(self, players, values: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Average of each statistic over the previous matches of each player.
+
+        Missing values are skipped, as in ``expanding().mean()``, and an
+        average is NaN until the window holds a first non-missing value.
+
+        Args:
+            players: Player of each row, in chronological order
+            values: Array of shape ``(n_rows, n_stats)``
+
+        Returns:
+            Mapping of window name to an array of shape ``(n_rows, n_stats)``
+            with the averages before each row
+        """
+        ids = self.player_ids(players)
+        n_rows, n_stats = values.shape
+        n_tail = len(self.tail_ids)
+        if not n_rows:
+            return {window: np.zeros((0, n_stats)) for window in self.windows}
+
+        # The last matches of previous calls go first, so last-N windows can
+        # reach back into them.
+        all_ids = np.concatenate([self.tail_ids, ids])
+        all_values = np.vstack([self.tail_values, values])
+        present = ~np.isnan(all_values)
+        filled = np.where(present, all_values, 0.0)
+
+        # Stable sort by player: each player becomes a contiguous segment,
+        # in chronological order, with its tail rows first.
+        order = np.argsort(all_ids, kind="stable")
+        sorted_ids = all_ids[order]
+        position = np.arange(len(order))
+        starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        lengths = np.diff(np.r_[starts, len(order)])
+        seg_start = np.repeat(starts, lengths)
+        seg_end = seg_start + np.repeat(lengths, lengths)
+        seg_tail = np.repeat(
+            np.add.reduceat((order < n_tail).astype(np.int64), starts), lengths
+        )
+
+        # Sums and counts of sorted rows [a, b) are cum[b] - cum[a].
+        cum = np.vstack(
+            [
+                np.zeros((1, 2 * n_stats)),
+                np.cumsum(np.hstack([filled, present])[order], axis=0),
+            ]
+        )
+
+        def mean_since(first, sums=0.0, counts=0.0):
+            window = cum[position] - cum[first]
+            sums = sums + window[:, :n_stats]
+            counts = counts + window[:, n_stats:]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(counts > 0, sums / counts, np.nan)
+
+        sorted_means = {
+            "avg": mean_since(
+                seg_start + seg_tail,
+                self.sums[sorted_ids],
+                self.counts[sorted_ids],
+            )
+        }
+        for n in self.last_n:
+            sorted_means[f"avg_last{n}"] = mean_since(
+                np.maximum(position - n, seg_start)
+            )
+        for h in self.halflives:
+            sorted_means[f"avg_ewm{h:g}"] = self._ewm_means(
+                h,
+                sorted_ids,
+                filled[order],
+                present[order],
+                position - seg_start - seg_tail,
+            )
+
+        # Back to the input order, dropping the tail rows.
+        means = {}
+        for window, sorted_mean in sorted_means.items():
+            mean = np.empty_like(sorted_mean)
+            mean[order] = sorted_mean
+            means[window] = mean[n_tail:]
+
+        current = order >= n_tail
+        np.add.at(self.sums, sorted_ids[current], filled[order][current])
+        np.add.at(self.counts, sorted_ids[current], present[order][current])
+
+        if self.last_n:
+            keep = order[position >= seg_end - max(self.last_n)]
+            self.tail_ids = all_ids[keep]
+            self.tail_values = all_values[keep]
+
+        return means
+
+    def current_means(self, players) -> dict[str, np.ndarray]:
+        """
+        Averages each player would get in their next match.
+
+        Unlike ``running_means`` the state is left untouched and unseen
+        players are not registered, which makes it cheap enough to call for
+        a single upcoming match.
+
+        Args:
+            players: Sequence of player codes or player names
+
+        Returns:
+            Mapping of window name to an array of shape
+            ``(len(players), n_stats)``; unseen players, including codes
+            beyond the players seen so far, get NaN averages
+        """
+        ids = np.asarray(players)
+        if ids.dtype.kind in "iu":
+            ids = np.where(ids < len(self.sums), ids, -1)
+        else:
+            ids = np.array([self.players.get(name, -1) for name in players], dtype=int)
+        n_stats = len(self.stats_cols)
+
+        # Id -1 picks a row of zeros appended after the last player.
+        def per_row(values):
+            return np.vstack([values, np.zeros((1, n_stats))])[ids]
+
+        def ratio(sums, counts):
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return np.where(counts > 0, sums / counts, np.nan)
+
+        means = {"avg": ratio(per_row(self.sums), per_row(self.counts))}
+        if self.last_n:
+            # Tail rows are grouped by player in ascending id order, so the
+            # rows of each player are a slice found by binary search.
+            present = ~np.isnan(self.tail_values)
+            cum = np.vstack(
+                [
+                    np.zeros((1, 2 * n_stats)),
+                    np.cumsum(
+                        np.hstack([np.where(present, self.tail_values, 0.0), present]),
+                        axis=0,
+                    ),
+                ]
+            )
+            first = np.searchsorted(self.tail_ids, ids, side="left")
+            end = np.searchsorted(self.tail_ids, ids, side="right")
+            end[ids < 0] = first[ids < 0]
+        for n in self.last_n:
+            window = cum[end] - cum[np.maximum(end - n, first)]
+            means[f"avg_last{n}"] = ratio(window[:, :n_stats], window[:, n_stats:])
+        for h in self.halflives:
+            means[f"avg_ewm{h:g}"] = ratio(
+                per_row(self.ewm_sums[h]), per_row(self.ewm_weights[h])
+            )
+
+        return means
+
+    def _ewm_means(self, halflife, sorted_ids, filled, present, rank):
+        """
+        Exponentially decayed averages, updated one match rank at a time.
+
+        Rows with the same rank within their player segment belong to
+        different players, so each step is a vectorized update of every
+        player having at least that many matches in the call. The number of
+        steps is the largest number of matches of a single player.
+
+        Returns:
+            Averages before each sorted row
+        """
+        decay = 0.5 ** (1 / halflife)
+        sums = self.ewm_sums[halflife]
+        weights = self.ewm_weights[halflife]
+        means = np.full(filled.shape, np.nan)
+
+        # Tail rows have a negative rank and only matter to last-N windows.
+        valid = np.flatnonzero(rank >= 0)
+        by_rank = valid[np.argsort(rank[valid], kind="stable")]
+        splits = np.flatnonzero(np.diff(rank[by_rank])) + 1
+
+        for rows in np.split(by_rank, splits):
+            ids = sorted_ids[rows]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means[rows] = np.where(
+                    weights[ids] > 0, sums[ids] / weights[ids], np.nan
+                )
+            sums[ids] = decay * sums[ids] + filled[rows]
+            weights[ids] = decay * weights[ids] + present[rows]
+
+        return means
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the state to a pickle file.
+
+        Args:
+            path: File where to save the state
+        """
+        CacheInterface(Path(path)).save(self.__dict__)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "PlayerStatsState":
+        """
+        Load a state saved with ``save``.
+
+        Args:
+            path: File where the state was saved
+
+        Returns:
+            The restored PlayerStatsState
+        """
+        state = cls.__new__(cls)
+        state.__dict__.update(CacheInterface(Path(path)).load())
+
+        return state
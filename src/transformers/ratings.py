@@ -0,0 +1,778 @@
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import trueskill
+
+from src.cache.cache_interface import CacheInterface
+
+
+# Glicko-2 scale factor between the public rating scale and the internal one.
+GLICKO_SCALE = 173.7178
+# Glicko-2 defaults of the glicko2 library: system constant tau, and the
+# rating (1500), deviation (350) and volatility of new players on the
+# internal scale.
+GLICKO_TAU = 0.5
+GLICKO_MU_START = 0.0
+GLICKO_RD_START = 350 / GLICKO_SCALE
+GLICKO_VOL_START = 0.06
+# Glicko-1 constant q of the expected score on the public scale.
+GLICKO_Q = math.log(10) / 400
+
+RATING_FEATURE_COLS = [
+    "winner_elo",
+    "loser_elo",
+    "elo_diff",
+    "winner_elo_exp",
+    "winner_glicko",
+    "winner_glicko_rd",
+    "loser_glicko",
+    "loser_glicko_rd",
+    "glicko_diff",
+    "winner_glicko_exp",
+    "winner_ts_mu",
+    "winner_ts_sigma",
+    "loser_ts_mu",
+    "loser_ts_sigma",
+    "ts_quality",
+]
+
+# Columns of RATING_FEATURE_COLS computed from the Glicko-2 ratings.
+_GLICKO_FEATURES = slice(
+    RATING_FEATURE_COLS.index("winner_glicko"),
+    RATING_FEATURE_COLS.index("winner_glicko_exp") + 1,
+)
+
+
+def _glicko_g(rd):
+    return 1 / math.sqrt(1 + 3 * math.pow(rd, 2) / math.pow(math.pi, 2))
+
+
+def _glicko_e(mu, opp_mu, opp_rd):
+    return 1 / (1 + math.exp(-1 * _glicko_g(opp_rd) * (mu - opp_mu)))
+
+
+def _glicko_f(x, mu, delta, v, a):
+    ex = math.exp(x)
+    num1 = ex * (delta**2 - mu**2 - v - ex)
+    denom1 = 2 * ((mu**2 + v + ex) ** 2)
+    return (num1 / denom1) - ((x - a) / (GLICKO_TAU**2))
+
+
+def _glicko_update(mu, rd, vol, opp_rating, opp_rd, outcome):
+    """
+    Glicko-2 update of one player against a single opponent.
+
+    Mirrors ``glicko2.Player.update_player`` operation by operation, so the
+    results are bit-identical to the library, including its use of the
+    rating instead of the deviation inside ``_f``.
+
+    Args:
+        mu: Player rating on the internal scale
+        rd: Player deviation on the internal scale
+        vol: Player volatility
+        opp_rating: Opponent rating on the public scale
+        opp_rd: Opponent deviation on the public scale
+        outcome: 1 for a win, 0 for a loss
+
+    Returns:
+        Tuple with the new (mu, rd, vol)
+    """
+    opp_mu = (opp_rating - 1500) / GLICKO_SCALE
+    opp_rd = opp_rd / GLICKO_SCALE
+
+    g = _glicko_g(opp_rd)
+    e = _glicko_e(mu, opp_mu, opp_rd)
+    v = 1 / (0 + math.pow(g, 2) * e * (1 - e))
+    delta = v * (0 + g * (outcome - e))
+
+    a = math.log(vol**2)
+    A = a
+    if (delta**2) > ((rd**2) + v):
+        B = math.log(delta**2 - rd**2 - v)
+    else:
+        k = 1
+        while _glicko_f(a - k * math.sqrt(GLICKO_TAU**2), mu, delta, v, a) < 0:
+            k = k + 1
+        B = a - k * math.sqrt(GLICKO_TAU**2)
+
+    fA = _glicko_f(A, mu, delta, v, a)
+    fB = _glicko_f(B, mu, delta, v, a)
+    while math.fabs(B - A) > 0.000001:
+        C = A + ((A - B) * fA) / (fB - fA)
+        fC = _glicko_f(C, mu, delta, v, a)
+        if fC * fB <= 0:
+            A = B
+            fA = fB
+        else:
+            fA = fA / 2.0
+        B = C
+        fB = fC
+    vol = math.exp(A / 2)
+
+    rd = math.sqrt(math.pow(rd, 2) + math.pow(vol, 2))
+    rd = 1 / math.sqrt((1 / math.pow(rd, 2)) + (1 / v))
+    mu += math.pow(rd, 2) * (0 + g * (outcome - e))
+
+    return mu, rd, vol
+
+
+def glicko_period_update(mu, rd, vol, players, opponents, scores):
+    """
+    Glicko-2 update of every player at the end of a rating period.
+
+    Follows Glickman's description of the system: each player is rated
+    against all the games of the period at once, with the opponents'
+    ratings from before the period, and players without games only see
+    their deviation grow. Every step is array arithmetic over the players,
+    and the volatility iteration runs until all of them have converged.
+
+    Args:
+        mu: Rating of every player on the internal scale
+        rd: Deviation of every player on the internal scale
+        vol: Volatility of every player
+        players: Player of each game of the period
+        opponents: Opponent in each game
+        scores: 1 for a win of the player, 0 for a loss
+
+    Returns:
+        Tuple with the new (mu, rd, vol) arrays
+    """
+    n_players = len(mu)
+    opp_rd = rd[opponents]
+    g = 1 / np.sqrt(1 + 3 * opp_rd**2 / math.pi**2)
+    e = 1 / (1 + np.exp(-g * (mu[players] - mu[opponents])))
+    v_inv = np.bincount(players, g**2 * e * (1 - e), minlength=n_players)
+    score_sum = np.bincount(players, g * (scores - e), minlength=n_players)
+
+    active = np.flatnonzero(v_inv > 0)
+    phi, sigma = rd[active], vol[active]
+    v = 1 / v_inv[active]
+    delta = v * score_sum[active]
+
+    # Illinois iteration on f, vectorized over the active players.
+    a = np.log(sigma**2)
+
+    def f(x):
+        ex = np.exp(x)
+        num = ex * (delta**2 - phi**2 - v - ex)
+        return num / (2 * (phi**2 + v + ex) ** 2) - (x - a) / GLICKO_TAU**2
+
+    excess = delta**2 - phi**2 - v
+    large = excess > 0
+    A = a.copy()
+    B = np.where(large, np.log(np.where(large, excess, 1.0)), a - GLICKO_TAU)
+    below = ~large & (f(B) < 0)
+    while below.any():
+        B = np.where(below, B - GLICKO_TAU, B)
+        below &= f(B) < 0
+
+    fA, fB = f(A), f(B)
+    todo = np.abs(B - A) > 0.000001
+    while todo.any():
+        # Converged players keep their bracket: C = B and f(C) = f(B).
+        C = np.where(todo, A + (A - B) * fA / np.where(todo, fB - fA, 1.0), B)
+        fC = f(C)
+        swap = todo & (fC * fB <= 0)
+        fA = np.where(swap, fB, np.where(todo, fA / 2, fA))
+        A = np.where(swap, B, A)
+        B, fB = C, fC
+        todo &= np.abs(B - A) > 0.000001
+    sigma = np.exp(A / 2)
+
+    new_mu, new_vol = mu.copy(), vol.copy()
+    new_rd = np.sqrt(rd**2 + vol**2)
+    new_rd[active] = 1 / np.sqrt(1 / (phi**2 + sigma**2) + 1 / v)
+    new_mu[active] += new_rd[active] ** 2 * score_sum[active]
+    new_vol[active] = sigma
+
+    return new_mu, new_rd, new_vol
+
+
+def _glicko_features(mu_a, rd_a, mu_b, rd_b):
+    """
+    Glicko-2 entries of ``_pre_match_features``, vectorized over matches.
+
+    Returns:
+        Array with one row per match and one column per Glicko-2 feature
+    """
+    A_rating = mu_a * GLICKO_SCALE + 1500
+    A_rd = rd_a * GLICKO_SCALE
+    B_rating = mu_b * GLICKO_SCALE + 1500
+    B_rd = rd_b * GLICKO_SCALE
+
+    g_phi = 1 / np.sqrt(1 + (3 * GLICKO_Q**2 * B_rd**2) / math.pi**2)
+    exp_g = 1 / (1 + 10 ** (-g_phi * (A_rating - B_rating) / 400))
+
+    return np.column_stack(
+        [A_rating, A_rd, B_rating, B_rd, A_rating - B_rating, exp_g]
+    )
+
+
+def _widen(rd, vol, rated, n_idle):
+    """
+    Widen the Glicko-2 deviations of rated players over ``n_idle`` periods
+    without any match.
+    """
+    return np.where(rated & (n_idle > 0), np.sqrt(rd**2 + n_idle * vol**2), rd)
+
+
+def _gaussian_mu(pi, tau):
+    return pi and tau / pi
+
+
+def _pre_match_features(
+    ts, elo_a, elo_b, mu_a, rd_a, mu_b, rd_b, pi_a, tau_a, pi_b, tau_b
+):
+    """
+    Features of a match from the ratings of its players before it.
+
+    Returns:
+        Tuple with one value per entry of ``RATING_FEATURE_COLS``
+    """
+    A_rating = mu_a * GLICKO_SCALE + 1500
+    A_rd = rd_a * GLICKO_SCALE
+    B_rating = mu_b * GLICKO_SCALE + 1500
+    B_rd = rd_b * GLICKO_SCALE
+
+    exp_e = 1 / (1 + 10 ** ((elo_b - elo_a) / 400))
+    g_phi = 1 / math.sqrt(1 + (3 * GLICKO_Q**2 * B_rd**2) / math.pi**2)
+    exp_g = 1 / (1 + 10 ** (-g_phi * (A_rating - B_rating) / 400))
+
+    return (
+        elo_a,
+        elo_b,
+        elo_a - elo_b,
+        exp_e,
+        A_rating,
+        A_rd,
+        B_rating,
+        B_rd,
+        A_rating - B_rating,
+        exp_g,
+        _gaussian_mu(pi_a, tau_a),
+        math.sqrt(1 / pi_a),
+        _gaussian_mu(pi_b, tau_b),
+        math.sqrt(1 / pi_b),
+        ts.quality(pi_a, tau_a, pi_b, tau_b),
+    )
+
+
+class _TrueSkill1vs1:
+    """
+    TrueSkill for a single winner/loser pair on (pi, tau) floats.
+
+    Runs the same message schedule as ``trueskill.TrueSkill.rate`` for two
+    one-player teams, and the same matrix arithmetic as ``quality``, without
+    building the factor graph. Results are bit-identical to the library.
+    """
+
+    def __init__(self, env: trueskill.TrueSkill):
+        self.env = env
+        self.tau = env.tau
+        self.variance = env.beta**2
+        self.draw_margin = trueskill.calc_draw_margin(env.draw_probability, 2, env)
+
+    def initial(self) -> tuple[float, float]:
+        rating = self.env.create_rating()
+        return rating.pi, rating.tau
+
+    def quality(self, pi_a, tau_a, pi_b, tau_b):
+        var_a = math.sqrt(1 / pi_a) ** 2
+        var_b = math.sqrt(1 / pi_b) ** 2
+        diff = _gaussian_mu(pi_a, tau_a) - _gaussian_mu(pi_b, tau_b)
+
+        ata = self.variance + self.variance
+        middle = ata + (var_a + var_b)
+        e_arg = (-0.5 * diff) * (1.0 / middle) * diff
+        s_arg = (1.0 * ata) / (1.0 * middle)
+
+        return math.exp(e_arg) * math.sqrt(s_arg)
+
+    def rate(self, pi_w, tau_w, pi_l, tau_l):
+        # Rating and performance layers, downwards.
+        rw_pi, rw_tau = self._prior(pi_w, tau_w)
+        rl_pi, rl_tau = self._prior(pi_l, tau_l)
+
+        a = 1.0 / (1.0 + self.variance * rw_pi)
+        pw_msg = (a * rw_pi, a * rw_tau)
+        a = 1.0 / (1.0 + self.variance * rl_pi)
+        pl_msg = (a * rl_pi, a * rl_tau)
+
+        tw_msg = self._sum([pw_msg], [1])
+        tl_msg = self._sum([pl_msg], [1])
+
+        # Team difference and truncation, until the update is small enough.
+        d = (0, 0)
+        d_sum_msg = (0, 0)
+        d_trunc_msg = (0, 0)
+        for _ in range(10):
+            msg = self._sum([tw_msg, tl_msg], [+1, -1])
+            d = ((d[0] - d_sum_msg[0]) + msg[0], (d[1] - d_sum_msg[1]) + msg[1])
+            d_sum_msg = msg
+
+            div_pi, div_tau = d[0] - d_trunc_msg[0], d[1] - d_trunc_msg[1]
+            sqrt_pi = math.sqrt(div_pi)
+            args = (div_tau / sqrt_pi, self.draw_margin * sqrt_pi)
+            v = self.env.v_win(*args)
+            w = self.env.w_win(*args)
+            denom = 1.0 - w
+            value = (div_pi / denom, (div_tau + sqrt_pi * v) / denom)
+
+            d_trunc_msg = (
+                (value[0] + d_trunc_msg[0]) - d[0],
+                (value[1] + d_trunc_msg[1]) - d[1],
+            )
+            pi_delta = abs(d[0] - value[0])
+            delta = (
+                0.0
+                if pi_delta == math.inf
+                else max(abs(d[1] - value[1]), math.sqrt(pi_delta))
+            )
+            d = value
+            if delta <= trueskill.DELTA:
+                break
+
+        # Back up to both team performances.
+        d_div = (d[0] - d_sum_msg[0], d[1] - d_sum_msg[1])
+        tw_up = self._sum([d_div, tl_msg], [1.0, 1.0])
+        tw = (tw_msg[0] + tw_up[0], tw_msg[1] + tw_up[1])
+        tl_up = self._sum([(tw[0] - tw_up[0], tw[1] - tw_up[1]), d_div], [1.0, -1.0])
+        tl = (tl_msg[0] + tl_up[0], tl_msg[1] + tl_up[1])
+
+        # Then to the performances and the ratings.
+        new_w = self._rating_up(rw_pi, rw_tau, pw_msg, tw, tw_msg)
+        new_l = self._rating_up(rl_pi, rl_tau, pl_msg, tl, tl_msg)
+
+        return new_w, new_l
+
+    def _prior(self, pi, tau):
+        sigma = math.sqrt(math.sqrt(1 / pi) ** 2 + self.tau**2)
+        prior_pi = sigma**-2
+        return prior_pi, prior_pi * _gaussian_mu(pi, tau)
+
+    @staticmethod
+    def _sum(divs, coeffs):
+        pi_inv = 0
+        mu = 0
+        for (pi, tau), coeff in zip(divs, coeffs):
+            mu += coeff * _gaussian_mu(pi, tau)
+            if pi_inv == math.inf:
+                continue
+            try:
+                pi_inv += coeff**2 / float(pi)
+            except ZeroDivisionError:
+                pi_inv = math.inf
+        pi = 1.0 / pi_inv
+        return pi, pi * mu
+
+    def _rating_up(self, r_pi, r_tau, p_msg, team, team_msg):
+        div = (team[0] - team_msg[0], team[1] - team_msg[1])
+        p = (p_msg[0], p_msg[1])
+        up = self._sum([div], [1.0])
+        p = ((p[0] - 0) + up[0], (p[1] - 0) + up[1])
+
+        msg_pi, msg_tau = p[0] - p_msg[0], p[1] - p_msg[1]
+        a = 1.0 / (1.0 + self.variance * msg_pi)
+        pi, tau = (r_pi - 0) + a * msg_pi, (r_tau - 0) + a * msg_tau
+
+        # The library returns a fresh Rating built from (mu, sigma).
+        new_pi = float(math.sqrt(1 / pi) if pi else math.inf) ** -2
+        return new_pi, new_pi * float(_gaussian_mu(pi, tau))
+
+
+class RatingState:
+    """
+    Elo, Glicko-2 and TrueSkill ratings of every player seen so far.
+
+    Every rating lives in a NumPy array indexed by a dense integer id per
+    player. Players are keyed either by the codes of a ``PlayerDimension``,
+    which are used as ids directly, or by name, mapped to ids once. The
+    state remembers the last match it processed (``tourney_datetime`` and
+    ``match_id``), so it can be saved after a run and later fed only the
+    matches that arrived since, instead of replaying the whole history.
+
+    By default Glicko-2 ratings are updated after every match, like the
+    other systems. With ``glicko_period`` they are updated once per rating
+    period instead, as the system is designed to be used: matches of a
+    period see the ratings from its start, and at its end every player is
+    updated at once with ``glicko_period_update``. The last period stays
+    open, with its games kept in the state, until a match of a later period
+    arrives, so chunked and incremental runs match a single run.
+    """
+
+    ELO_START = 1500
+    ELO_K = 32
+
+    _STATE_KEYS = (
+        "players",
+        "elo",
+        "glicko_mu",
+        "glicko_rd",
+        "glicko_vol",
+        "ts_pi",
+        "ts_tau",
+        "last_datetime",
+        "last_match_id",
+        "glicko_period",
+        "glicko_open",
+        "glicko_games",
+        "glicko_rated",
+    )
+
+    def __init__(self, glicko_period: str | None = None):
+        """
+        Initialize an empty state.
+
+        Args:
+            glicko_period: Pandas frequency of the Glicko-2 rating periods,
+                such as ``"W"`` for tournament weeks, or None to update the
+                Glicko-2 ratings after every match
+        """
+        self.ts_env = trueskill.TrueSkill()
+        self._ts = _TrueSkill1vs1(self.ts_env)
+
+        self.players: dict[str, int] = {}
+        self.elo = np.empty(0)
+        self.glicko_mu = np.empty(0)
+        self.glicko_rd = np.empty(0)
+        self.glicko_vol = np.empty(0)
+        self.ts_pi = np.empty(0)
+        self.ts_tau = np.empty(0)
+
+        self.last_datetime: pd.Timestamp | None = None
+        self.last_match_id: int | None = None
+
+        # Rating period still open and the (A, B, outcome) of its games.
+        self.glicko_period = glicko_period
+        self.glicko_open: int | None = None
+        self.glicko_games = (
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0),
+        )
+        # Players already rated in a closed period; only their deviations
+        # widen over the periods they sit out.
+        self.glicko_rated = np.zeros(0, dtype=bool)
+
+    def player_ids(self, names) -> np.ndarray:
+        """
+        Map players to dense ids, registering unseen players.
+
+        New players get the initial rating of each system.
+
+        Args:
+            names: Sequence of player codes or player names
+
+        Returns:
+            Array with the id of every player
+        """
+        codes = np.asarray(names)
+        if codes.dtype.kind in "iu":
+            if self.players:
+                raise ValueError("The state is keyed by player name")
+            n_new = (codes.max() + 1 if len(codes) else 0) - len(self.elo)
+            if n_new > 0:
+                self._grow(n_new)
+            return codes.astype(np.int64)
+
+        if len(self.players) != len(self.elo):
+            raise ValueError("The state is keyed by player code")
+
+        names = pd.Index(np.asarray(names, dtype=object))
+        known = pd.Index(list(self.players))
+        ids = known.get_indexer(names) if len(known) else np.full(len(names), -1)
+
+        new_names = pd.unique(names[ids == -1])
+        if len(new_names):
+            start = len(self.players)
+            self.players.update(
+                {name: start + i for i, name in enumerate(new_names)}
+            )
+            self._grow(len(new_names))
+            ids = pd.Index(list(self.players)).get_indexer(names)
+
+        return ids.astype(np.int64)
+
+    def _grow(self, n_new: int) -> None:
+        ts_pi, ts_tau = self._ts.initial()
+
+        def extend(values, start):
+            return np.concatenate([values, np.full(n_new, start, dtype=float)])
+
+        self.elo = extend(self.elo, self.ELO_START)
+        self.glicko_mu = extend(self.glicko_mu, GLICKO_MU_START)
+        self.glicko_rd = extend(self.glicko_rd, GLICKO_RD_START)
+        self.glicko_vol = extend(self.glicko_vol, GLICKO_VOL_START)
+        self.ts_pi = extend(self.ts_pi, ts_pi)
+        self.ts_tau = extend(self.ts_tau, ts_tau)
+        self.glicko_rated = np.r_[self.glicko_rated, np.zeros(n_new, dtype=bool)]
+
+    def rate(self, a_ids, b_ids, outcomes, periods=None) -> np.ndarray:
+        """
+        Replay matches in order and return the pre-match ratings.
+
+        Args:
+            a_ids: Id of player A in each match
+            b_ids: Id of player B in each match
+            outcomes: 1 if player A won the match, 0 otherwise
+            periods: Ordinal of the rating period of each match, in
+                non-decreasing order, to update the Glicko-2 ratings once per
+                period; None to update them after every match
+
+        Returns:
+            Array with one row per match and one column per entry of
+            ``RATING_FEATURE_COLS``
+        """
+        out = np.empty((len(a_ids), len(RATING_FEATURE_COLS)))
+
+        # Plain lists are much faster than NumPy arrays for scalar access.
+        elo = self.elo.tolist()
+        g_mu = self.glicko_mu.tolist()
+        g_rd = self.glicko_rd.tolist()
+        g_vol = self.glicko_vol.tolist()
+        ts_pi = self.ts_pi.tolist()
+        ts_tau = self.ts_tau.tolist()
+
+        K = self.ELO_K
+        ts = self._ts
+
+        for i, (A, B, result) in enumerate(
+            zip(a_ids.tolist(), b_ids.tolist(), outcomes.tolist())
+        ):
+            piA, tauA, piB, tauB = ts_pi[A], ts_tau[A], ts_pi[B], ts_tau[B]
+            out[i] = features = _pre_match_features(
+                ts, elo[A], elo[B], g_mu[A], g_rd[A], g_mu[B], g_rd[B],
+                piA, tauA, piB, tauB,
+            )  # fmt: skip
+            exp_e, B_rating, B_rd = features[3], features[6], features[7]
+
+            elo[A] += K * (result - exp_e)
+            elo[B] += K * ((1 - result) - (1 - exp_e))
+
+            # A is updated first and B then sees A's new rating, as in the
+            # original sequential calls to update_player.
+            if periods is None:
+                g_mu[A], g_rd[A], g_vol[A] = _glicko_update(
+                    g_mu[A], g_rd[A], g_vol[A], B_rating, B_rd, result
+                )
+                g_mu[B], g_rd[B], g_vol[B] = _glicko_update(
+                    g_mu[B],
+                    g_rd[B],
+                    g_vol[B],
+                    g_mu[A] * GLICKO_SCALE + 1500,
+                    g_rd[A] * GLICKO_SCALE,
+                    1 - result,
+                )
+
+            if result == 1:
+                (ts_pi[A], ts_tau[A]), (ts_pi[B], ts_tau[B]) = ts.rate(
+                    piA, tauA, piB, tauB
+                )
+            else:
+                (ts_pi[B], ts_tau[B]), (ts_pi[A], ts_tau[A]) = ts.rate(
+                    piB, tauB, piA, tauA
+                )
+
+        self.elo = np.array(elo)
+        self.glicko_mu = np.array(g_mu)
+        self.glicko_rd = np.array(g_rd)
+        self.glicko_vol = np.array(g_vol)
+        self.ts_pi = np.array(ts_pi)
+        self.ts_tau = np.array(ts_tau)
+
+        if periods is not None:
+            self._rate_periods(a_ids, b_ids, outcomes, np.asarray(periods), out)
+
+        return out
+
+    def _rate_periods(self, a_ids, b_ids, outcomes, periods, out) -> None:
+        """
+        Glicko-2 features and updates of matches grouped in rating periods.
+
+        Fills the Glicko-2 columns of ``out`` with the ratings from the start
+        of each period, closing the open period when a later one begins.
+        """
+        starts = np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+        for lo, hi in zip(starts, np.r_[starts[1:], len(periods)]):
+            period = int(periods[lo])
+            if self.glicko_open is not None and period != self.glicko_open:
+                self._close_period(n_idle=period - self.glicko_open - 1)
+            self.glicko_open = period
+
+            a, b = a_ids[lo:hi], b_ids[lo:hi]
+            mu, rd = self.glicko_mu, self.glicko_rd
+            out[lo:hi, _GLICKO_FEATURES] = _glicko_features(mu[a], rd[a], mu[b], rd[b])
+            self.glicko_games = tuple(
+                np.concatenate([games, new])
+                for games, new in zip(self.glicko_games, [a, b, outcomes[lo:hi]])
+            )
+
+    def _close_period(self, n_idle: int = 0) -> None:
+        """
+        Update the Glicko-2 ratings with the games of the open period.
+
+        Args:
+            n_idle: Number of periods without any match before the next one,
+                which only widen the deviations
+        """
+        mu, rd, vol, rated = self._closed_period()
+        self.glicko_mu = mu
+        self.glicko_rd = _widen(rd, vol, rated, n_idle)
+        self.glicko_vol = vol
+        self.glicko_rated = rated
+
+        self.glicko_games = tuple(games[:0] for games in self.glicko_games)
+        self.glicko_open = None
+
+    def _closed_period(self):
+        """
+        Glicko-2 ratings once the open period is closed, leaving the state
+        untouched.
+
+        Returns:
+            Tuple of the mu, rd and vol arrays and the mask of the players
+            rated in a closed period
+        """
+        a, b, outcomes = self.glicko_games
+        mu, rd, vol = glicko_period_update(
+            self.glicko_mu,
+            self.glicko_rd,
+            self.glicko_vol,
+            np.r_[a, b],
+            np.r_[b, a],
+            np.r_[outcomes, 1 - outcomes],
+        )
+        # Players registered for later matches have not been rated yet and
+        # keep their initial deviation, whatever periods have gone by.
+        rated = self.glicko_rated.copy()
+        rated[a] = True
+        rated[b] = True
+
+        return mu, np.where(rated, rd, self.glicko_rd), vol, rated
+
+    def preview(self, a_ids, b_ids, periods=None) -> np.ndarray:
+        """
+        Pre-match ratings of upcoming matches, without rating them.
+
+        The state is left untouched, so any number of candidate matches can
+        be previewed between two calls to ``rate``. With ``glicko_period``,
+        matches of a period after the open one see the Glicko-2 ratings of a
+        copy of the state with the open period closed, as ``rate`` would.
+
+        Args:
+            a_ids: Id of player A in each match, -1 for an unseen player
+            b_ids: Id of player B in each match, -1 for an unseen player
+            periods: Ordinal of the rating period of each match, as in
+                ``rate``; None to preview them within the open period
+
+        Returns:
+            Array with one row per match and one column per entry of
+            ``RATING_FEATURE_COLS``; unseen players, including codes beyond
+            the players rated so far, get initial ratings
+        """
+        ts_pi, ts_tau = self._ts.initial()
+
+        # Id -1 picks the initial rating appended after the last player.
+        def with_initial(values, start):
+            return np.append(values, start).tolist()
+
+        elo = with_initial(self.elo, self.ELO_START)
+        g_mu = with_initial(self.glicko_mu, GLICKO_MU_START)
+        g_rd = with_initial(self.glicko_rd, GLICKO_RD_START)
+        ts_pi = with_initial(self.ts_pi, ts_pi)
+        ts_tau = with_initial(self.ts_tau, ts_tau)
+
+        def unseen_last(ids):
+            ids = np.asarray(ids)
+            return np.where(ids < len(self.elo), ids, -1).tolist()
+
+        out = np.empty((len(a_ids), len(RATING_FEATURE_COLS)))
+        a_ids, b_ids = unseen_last(a_ids), unseen_last(b_ids)
+        for i, (A, B) in enumerate(zip(a_ids, b_ids)):
+            out[i] = _pre_match_features(
+                self._ts, elo[A], elo[B], g_mu[A], g_rd[A], g_mu[B], g_rd[B],
+                ts_pi[A], ts_tau[A], ts_pi[B], ts_tau[B],
+            )  # fmt: skip
+
+        if periods is not None and self.glicko_open is not None:
+            periods = np.asarray(periods)
+            later = periods > self.glicko_open
+            if later.any():
+                mu, rd, vol, rated = (
+                    np.append(values, start)
+                    for values, start in zip(
+                        self._closed_period(),
+                        [GLICKO_MU_START, GLICKO_RD_START, GLICKO_VOL_START, False],
+                    )
+                )
+                a, b = np.asarray(a_ids)[later], np.asarray(b_ids)[later]
+                n_idle = periods[later] - self.glicko_open - 1
+                out[later, _GLICKO_FEATURES] = _glicko_features(
+                    mu[a],
+                    _widen(rd[a], vol[a], rated[a], n_idle),
+                    mu[b],
+                    _widen(rd[b], vol[b], rated[b], n_idle),
+                )
+
+        return out
+
+    def pending(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select the matches that come after the watermark.
+
+        Args:
+            df: Matches with tourney_datetime and match_id columns
+
+        Returns:
+            Rows of ``df`` not yet processed by this state
+        """
+        if self.last_datetime is None:
+            return df
+
+        after = (df["tourney_datetime"] > self.last_datetime) | (
+            (df["tourney_datetime"] == self.last_datetime)
+            & (df["match_id"] > self.last_match_id)
+        )
+        return df[after]
+
+    def advance(self, tourney_datetime: pd.Timestamp, match_id: int) -> None:
+        """Move the watermark to the given match."""
+        self.last_datetime = tourney_datetime
+        self.last_match_id = match_id
+
+    def __getstate__(self) -> dict:
+        # The TrueSkill environment holds local functions and cannot be
+        # pickled, so only the ratings and the watermark are kept.
+        return {key: getattr(self, key) for key in self._STATE_KEYS}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__()
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save the state to a pickle file.
+
+        Args:
+            path: File where to save the state
+        """
+        CacheInterface(Path(path)).save(self.__getstate__())
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RatingState":
+        """
+        Load a state saved with ``save``.
+
+        Args:
+            path: File where the state was saved
+
+        Returns:
+            The restored RatingState
+        """
+        state = cls()
+        state.__setstate__(CacheInterface(Path(path)).load())
+
+        return state
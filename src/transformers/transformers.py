@@ -1,45 +1,56 @@
 import pandas as pd
 import os
 import math
-from collections import defaultdict
-from glicko2 import Player as Glicko2Player
-import trueskill
 import re
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from sklearn.preprocessing import MinMaxScaler
 
+from src.config.match_schema import PAIRED_COLUMNS
+from src.transformers.player_stats import PlayerStatsState
+from src.transformers.ratings import RATING_FEATURE_COLS, RatingState
 
-def invert_winner_loser_names(data):
-    indices_para_inverter = data.sample(frac=0.5).index
-
-    colunas_pares = [
-        ("winner_id", "loser_id"),
-        ("winner_seed", "loser_seed"),
-        ("winner_entry", "loser_entry"),
-        ("winner_name", "loser_name"),
-        ("winner_hand", "loser_hand"),
-        ("winner_ht", "loser_ht"),
-        ("winner_ioc", "loser_ioc"),
-        ("winner_age", "loser_age"),
-        ("winner_rank", "loser_rank"),
-        ("winner_rank_points", "loser_rank_points"),
-        ("w_ace", "l_ace"),
-        ("w_df", "l_df"),
-        ("w_svpt", "l_svpt"),
-        ("w_1stIn", "l_1stIn"),
-        ("w_1stWon", "l_1stWon"),
-        ("w_2ndWon", "l_2ndWon"),
-        ("w_SvGms", "l_SvGms"),
-        ("w_bpSaved", "l_bpSaved"),
-        ("w_bpFaced", "l_bpFaced"),
-    ]
 
-    for col_a, col_b in colunas_pares:
-        temp = data.loc[indices_para_inverter, col_a].copy()
-        data.loc[indices_para_inverter, col_a] = data.loc[indices_para_inverter, col_b]
-        data.loc[indices_para_inverter, col_b] = temp
+PLAYER_STATS_COLS = ["sets_A", "sets_B", "games_A", "games_B", "n_tiebreaks"]
+
+
+def invert_winner_loser_names(data, random_state=None):
+    """
+    Troca vencedor e perdedor em metade das partidas, sorteadas ao acaso.
+
+    Todas as colunas pareadas são trocadas a partir de uma única máscara
+    booleana, uma passada por coluna, e as partidas trocadas recebem
+    outcome = 0. Por fim, winner_/loser_/w_/l_ viram player_A_/player_B_.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Partidas no formato vencedor/perdedor.
+    random_state : int | numpy.random.Generator | None
+        Semente ou gerador usado no sorteio; fixe para resultados
+        reprodutíveis.
+
+    Returns
+    -------
+    pandas.DataFrame
+        O próprio ``data``, alterado.
+    """
+    rng = np.random.default_rng(random_state)
+    inverter = np.zeros(len(data), dtype=bool)
+    inverter[rng.permutation(len(data))[: round(len(data) * 0.5)]] = True
+
+    swapped = {}
+    for col_a, col_b in PAIRED_COLUMNS:
+        if col_a not in data.columns or col_b not in data.columns:
+            continue
+        swapped[col_a] = data[col_a].mask(inverter, data[col_b])
+        swapped[col_b] = data[col_b].mask(inverter, data[col_a])
+
+    for col, values in swapped.items():
+        data[col] = values
 
-    data.loc[indices_para_inverter, "outcome"] = 0
+    data["outcome"] = np.where(inverter, 0, data["outcome"])
 
     rename_dict = {}
 
@@ -104,66 +115,69 @@ def inverter_scores_df(df, outcome_col="outcome", score_col="score", mutate=True
     return target
 
 
-def compute_rating_features(df):
-    elo = defaultdict(lambda: 1500)
-    glicko = defaultdict(lambda: Glicko2Player())
-    ts_env = trueskill.TrueSkill()
-    ts_ratings = defaultdict(ts_env.Rating)
-
-    rows = []
-
-    for _, row in df.iterrows():
-        A, B, result = row["player_A_name"], row["player_B_name"], row["outcome"]
-
-        rA_e, rB_e = elo[A], elo[B]
-        pA, pB = glicko[A], glicko[B]
-        tA, tB = ts_ratings[A], ts_ratings[B]
-
-        exp_e = 1 / (1 + 10 ** ((rB_e - rA_e) / 400))
-        q = math.log(10) / 400
-        g_phi = 1 / math.sqrt(1 + (3 * q**2 * pB.rd**2) / math.pi**2)
-        exp_g = 1 / (1 + 10 ** (-g_phi * (pA.rating - pB.rating) / 400))
-
-        quality = ts_env.quality_1vs1(tA, tB)
-
-        rows.append(
-            {
-                "tourney_datetime": row["tourney_datetime"],
-                "player_A_name": A,
-                "player_B_name": B,
-                "winner_elo": rA_e,
-                "loser_elo": rB_e,
-                "elo_diff": rA_e - rB_e,
-                "winner_elo_exp": exp_e,
-                "winner_glicko": pA.rating,
-                "winner_glicko_rd": pA.rd,
-                "loser_glicko": pB.rating,
-                "loser_glicko_rd": pB.rd,
-                "glicko_diff": pA.rating - pB.rating,
-                "winner_glicko_exp": exp_g,
-                "winner_ts_mu": tA.mu,
-                "winner_ts_sigma": tA.sigma,
-                "loser_ts_mu": tB.mu,
-                "loser_ts_sigma": tB.sigma,
-                "ts_quality": quality,
-                "match_id": row["match_id"],
-            }
-        )
+def _player_keys(df, side):
+    """
+    Chave dos jogadores de um lado das partidas.
 
-        K = 32
-        elo[A] += K * (result - exp_e)
-        elo[B] += K * ((1 - result) - (1 - exp_e))
+    Usa os códigos do ``PlayerDimension`` atribuídos pelo parser e, na falta
+    deles, os nomes.
+    """
+    if f"player_{side}_code" in df.columns:
+        return df[f"player_{side}_code"].to_numpy()
+    return df[f"player_{side}_name"].to_numpy()
 
-        pA.update_player([pB.rating], [pB.rd], [result])
-        pB.update_player([pA.rating], [pA.rd], [1 - result])
 
-        if result == 1:
-            new_tA, new_tB = ts_env.rate_1vs1(tA, tB)
-        else:
-            new_tB, new_tA = ts_env.rate_1vs1(tB, tA)
-        ts_ratings[A], ts_ratings[B] = new_tA, new_tB
+def compute_rating_features(df, state=None):
+    """
+    Calcula Elo, Glicko-2 e TrueSkill antes de cada partida.
 
-    return pd.DataFrame(rows)
+    Os jogadores são identificados pelos códigos ``player_A_code`` /
+    ``player_B_code`` do parser (ou pelos nomes, na falta deles), que indexam
+    os arrays de ``RatingState``.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Partidas em ordem cronológica.
+    state : RatingState | None
+        Estado acumulado de execuções anteriores. Se informado, apenas as
+        partidas depois da marca d'água do estado são processadas, e o
+        estado é atualizado no lugar; sem ele, o histórico é todo
+        reprocessado a partir do zero. Com ``state.glicko_period``, o
+        Glicko-2 é atualizado uma vez por período de rating dessa
+        frequência (por exemplo ``"W"``, a semana do torneio).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha de features por partida processada.
+    """
+    if state is None:
+        state = RatingState()
+
+    df = state.pending(df)
+
+    a_ids = state.player_ids(_player_keys(df, "A"))
+    b_ids = state.player_ids(_player_keys(df, "B"))
+    periods = None
+    if state.glicko_period:
+        periods = df["tourney_datetime"].dt.to_period(state.glicko_period).array.asi8
+    ratings = state.rate(a_ids, b_ids, df["outcome"].to_numpy(), periods)
+
+    if len(df):
+        state.advance(df["tourney_datetime"].iloc[-1], df["match_id"].iloc[-1])
+
+    features = pd.DataFrame(
+        {
+            "tourney_datetime": df["tourney_datetime"].to_numpy(),
+            "player_A_name": df["player_A_name"].to_numpy(),
+            "player_B_name": df["player_B_name"].to_numpy(),
+        }
+    )
+    features[RATING_FEATURE_COLS] = ratings
+    features["match_id"] = df["match_id"].to_numpy()
+
+    return features
 
 
 def _invert_score_if_needed(score: str, outcome: int) -> str:
@@ -227,21 +241,138 @@ def extract_score_features(row):
     }
 
 
-def prepare_tennis_model_data(data, score_feats):
+_SPECIAL_SCORES = ["W/O", "WO", "RET", "RETIRE"]
+_SET_PATTERN = r"(\d+)-(\d+)(?:\((\d+)\))?"
+
+
+def _sets_pattern(n_sets):
+    """
+    Monta uma regex que captura os ``n_sets`` primeiros sets de um placar.
+
+    Cada set opcional começa depois do anterior, o que reproduz a ordem e a
+    sobreposição de ``re.findall`` com ``_SET_PATTERN`` em uma única busca.
+    """
+    pattern = ""
+    for i in reversed(range(n_sets)):
+        set_pattern = rf"(?P<a{i}>\d+)-(?P<b{i}>\d+)(?:\((?P<tb{i}>\d+)\))?"
+        pattern = rf"(?:.*?{set_pattern}{pattern})?"
+    return "(?s)^" + pattern
+
+
+def _extracted_ints(found, field):
+    """Converte um grupo de ``pc.extract_regex`` em floats (NaN se vazio)."""
+    values = found.field(field)
+    values = pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.string()), values)
+    return pc.cast(values, pa.int64()).to_numpy(zero_copy_only=False).astype(float)
+
+
+def compute_score_features(df, score_col="score", outcome_col="outcome"):
+    """
+    Versão vetorizada de ``extract_score_features``.
+
+    Processa a coluna de placar inteira de uma vez com as funções de texto do
+    Arrow, capturando todos os sets em uma única regex, e devolve as mesmas
+    colunas com o mesmo índice de ``df``.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Tabela com colunas de outcome e score.
+    score_col : str
+        Nome da coluna com o placar em texto.
+    outcome_col : str
+        Nome da coluna que indica quem venceu (0 → inverter).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Features de score por partida.
+    """
+    raw = df[score_col]
+    text = raw.astype(pd.ArrowDtype(pa.string()))
+    upper = text.str.strip().str.upper()
+    is_walkover = (upper.isin(_SPECIAL_SCORES) | raw.isna()).to_numpy(bool)
+
+    # Mesma regra de _invert_score_if_needed: inverte os sets completos quando
+    # outcome == 0. Os espaços são duplicados para que cada token tenha seus
+    # próprios delimitadores e a regex não precise de lookaround.
+    to_invert = (df[outcome_col] != 1).to_numpy(bool) & ~is_walkover
+    inverted = (
+        (" " + upper[to_invert].str.replace(r"\s+", "  ", regex=True) + " ")
+        .str.replace(r" (\d+)-(\d+)(\(\d+\))? ", r" \2-\1\3 ", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+    )
+    score = raw.astype(object)
+    score[to_invert] = inverted.astype(object)
+
+    text = pa.array(score.mask(is_walkover), type=pa.string(), from_pandas=True)
+    n_sets = pc.max(pc.count_substring_regex(text, _SET_PATTERN)).as_py() or 0
+    found = pc.extract_regex(text, _sets_pattern(n_sets))
+
+    sets_A = np.zeros(len(df))
+    sets_B = np.zeros(len(df))
+    games_A = np.zeros(len(df))
+    games_B = np.zeros(len(df))
+    n_tie = np.zeros(len(df))
+    for i in range(n_sets):
+        a = _extracted_ints(found, f"a{i}")
+        b = _extracted_ints(found, f"b{i}")
+        tb = _extracted_ints(found, f"tb{i}")
+
+        sets_A += a > b
+        sets_B += b > a
+        games_A += np.nan_to_num(a)
+        games_B += np.nan_to_num(b)
+        n_tie += tb > 0
+
+    for values in (sets_A, sets_B, games_A, games_B, n_tie):
+        values[is_walkover] = np.nan
+
+    total_games = games_A + games_B
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct_games_A = np.where(total_games != 0, games_A / total_games, np.nan)
+
+    return pd.DataFrame(
+        {
+            "score": score,
+            "is_walkover": is_walkover.astype("int64"),
+            "sets_A": sets_A,
+            "sets_B": sets_B,
+            "games_A": games_A,
+            "games_B": games_B,
+            "set_diff": sets_A - sets_B,
+            "game_diff": games_A - games_B,
+            "n_tiebreaks": n_tie,
+            "pct_games_A": pct_games_A,
+        },
+        index=df.index,
+    )
+
+
+def prepare_tennis_model_data(data, score_feats, state=None):
     """
     Prepare tennis match data for modeling by:
     1. Combining match data with score features
-    2. Sorting by datetime and resetting match IDs
-    3. Creating player-level statistics using expanding means
-    4. Merging player statistics back to the match data
+    2. Sorting by datetime
+    3. Creating player-level statistics using running means over every
+       previous match, plus the windows configured in ``state``
+    4. Placing player statistics back on the rows of their match
 
     Parameters:
     -----------
     data : pandas.DataFrame
         DataFrame containing match data with columns: match_id, tourney_datetime,
-        player_A_name, player_B_name, score, outcome
+        player_A_name, player_B_name, score, outcome, and the player_A_code /
+        player_B_code keys of the parser, which players are keyed on when
+        present
     score_feats : pandas.DataFrame
         DataFrame containing score-related features with match_id as index
+    state : PlayerStatsState, optional
+        Running statistics of the matches already seen, which also sets the
+        last-N and decayed windows computed. Passing the same state to
+        consecutive chronological chunks carries the averages across them;
+        it is updated in place.
 
     Returns:
     --------
@@ -265,57 +396,35 @@ def prepare_tennis_model_data(data, score_feats):
         ],
         axis=1,
     )
+    players = np.column_stack([_player_keys(data, "A"), _player_keys(data, "B")])
 
-    # Sort by datetime and reset match IDs
-    df_final = df_feats.sort_values("tourney_datetime").reset_index(drop=True)
-    df_final["match_id"] = df_final.index
+    # Sort by datetime, keeping the match IDs assigned by the parser
+    order = np.argsort(df_feats["tourney_datetime"].to_numpy(), kind="stable")
+    df_final = df_feats.iloc[order].reset_index(drop=True)
 
     # Define statistics columns to track
-    stats_cols = ["sets_A", "sets_B", "games_A", "games_B", "n_tiebreaks"]
-
-    # Create long-format DataFrame for player-level statistics
-    long = pd.concat(
-        [
-            df_final[
-                ["match_id", "tourney_datetime", "player_A_name"] + stats_cols
-            ].rename(columns={"player_A_name": "player"}),
-            df_final[
-                ["match_id", "tourney_datetime", "player_B_name"] + stats_cols
-            ].rename(columns={"player_B_name": "player"}),
-        ]
-    ).sort_values(["player", "tourney_datetime", "match_id"])
-
-    # Calculate expanding averages for each statistic by player
-    for c in stats_cols:
-        long[f"avg_{c}"] = long.groupby("player")[c].transform(
-            lambda x: x.expanding().mean().shift()
-        )
-
-    # Extract player statistics
-    long_stats = long[["match_id", "player"] + [f"avg_{c}" for c in stats_cols]]
-
-    # Merge player A statistics
-    df_model = (
-        df_final.merge(
-            long_stats,
-            left_on=["match_id", "player_A_name"],
-            right_on=["match_id", "player"],
-            how="left",
-        )
-        .rename(columns={f"avg_{c}": f"player_A_avg_{c}" for c in stats_cols})
-        .drop(columns=["player"])
-    )
-
-    # Merge player B statistics
-    df_model = (
-        df_model.merge(
-            long_stats,
-            left_on=["match_id", "player_B_name"],
-            right_on=["match_id", "player"],
-            how="left",
-        )
-        .rename(columns={f"avg_{c}": f"player_B_avg_{c}" for c in stats_cols})
-        .drop(columns=["player"])
+    stats_cols = PLAYER_STATS_COLS
+
+    if state is None:
+        state = PlayerStatsState(stats_cols)
+
+    # Long format with one row per player and match: players A and B of
+    # each match are interleaved, so row 2 * i is player A of match i and
+    # row 2 * i + 1 player B, both with the statistics of the match.
+    players = players[order].ravel()
+    values = np.repeat(df_final[stats_cols].to_numpy(dtype=float), 2, axis=0)
+
+    # Calculate running averages of every statistic and window by player
+    means = state.running_means(players, values)
+
+    # Put player A and B statistics back on the rows of their match
+    stats = {}
+    for side, offset in [("A", 0), ("B", 1)]:
+        for window, window_means in means.items():
+            for i, c in enumerate(stats_cols):
+                stats[f"player_{side}_{window}_{c}"] = window_means[offset::2, i]
+    df_model = pd.concat(
+        [df_final, pd.DataFrame(stats, index=df_final.index)], axis=1
     )
 
     # Drop unnecessary columns
@@ -339,7 +448,8 @@ def prepare_tennis_model_data(data, score_feats):
 def finalize_tennis_model_data(data, df_model, df_features):
     """
     Finalize the tennis match data preparation by:
-    1. Merging the original data with model data and feature data
+    1. Joining the original data with model data and feature data on
+       match_id
     2. Removing unnecessary columns to create a clean dataset for modeling
 
     Parameters:
@@ -356,25 +466,17 @@ def finalize_tennis_model_data(data, df_model, df_features):
     pandas.DataFrame
         Final cleaned DataFrame ready for modeling
     """
-    # Merge the original data with model data
-    df_final = data.merge(
-        df_model,
-        on=[
-            "outcome",
-            "match_id",
-            "tourney_datetime",
-            "player_A_name",
-            "player_B_name",
-        ],
-        how="left",
-    )
+    # Every frame has one row per match, so they are aligned on match_id
+    # and concatenated instead of merged on the composite key.
+    match_ids = pd.Index(data["match_id"])
 
-    # Merge with additional features
-    df_final = df_final.merge(
-        df_features,
-        on=["match_id", "tourney_datetime", "player_A_name", "player_B_name"],
-        how="left",
-    )
+    def aligned(df):
+        columns = [c for c in df.columns if c not in data.columns]
+        return df.set_index("match_id")[columns].reindex(match_ids)
+
+    df_final = pd.concat(
+        [data.set_axis(match_ids), aligned(df_model), aligned(df_features)], axis=1
+    ).set_axis(data.index)
 
     # Drop unnecessary columns
     columns_to_drop = [
@@ -393,6 +495,8 @@ def finalize_tennis_model_data(data, df_model, df_features):
         "player_B_entry",
         "player_B_seed",
         "player_B_id",
+        "player_A_code",
+        "player_B_code",
         "match_num",
         "tourney_id",
         "minutes",
@@ -426,7 +530,13 @@ def finalize_tennis_model_data(data, df_model, df_features):
 
 
 def create_dummy_variables(
-    df, standard_dummy_cols=None, reduced_category_config=None, cols_to_drop=None
+    df,
+    standard_dummy_cols=None,
+    reduced_category_config=None,
+    cols_to_drop=None,
+    categories=None,
+    dtype=bool,
+    sparse=False,
 ):
     """
     Create dummy variables from categorical columns with options to:
@@ -445,47 +555,182 @@ def create_dummy_variables(
         before creating dummy variables
     cols_to_drop : list, optional
         List of column names to drop after dummy creation
+    categories : dict, optional
+        Fixed categories of each column, as returned by ``fit_dummy_categories``.
+        Frames processed separately then get the same dummy columns, instead
+        of columns derived from the values present in each frame.
+    dtype : dtype, default bool
+        Dtype of the dummy columns; ``np.uint8`` takes as little memory as
+        bool and is written as 0/1 instead of True/False.
+    sparse : bool, default False
+        Return the dummy columns as pandas sparse columns, which
+        ``df[dummy_cols].sparse.to_coo()`` turns into a SciPy matrix for
+        scikit-learn.
 
     Returns:
     --------
     pandas.DataFrame
         DataFrame with dummy variables created and specified columns dropped
     """
-    result_df = df.copy()
+    categories = categories or {}
+    standard_dummy_cols = standard_dummy_cols or []
+    cols_to_drop = set(cols_to_drop or [])
+
+    # Dummies are built from the encoded columns alone and joined to the
+    # remaining ones once, instead of copying and re-concatenating the
+    # whole frame at every step.
+    def dummies(columns):
+        return pd.get_dummies(
+            pd.DataFrame(columns, index=df.index),
+            columns=list(columns),
+            drop_first=True,
+            dtype=dtype,
+            sparse=sparse,
+        )
+
+    blocks = []
 
     # Step 1: Create standard dummy variables
     if standard_dummy_cols:
-        result_df = pd.get_dummies(
-            result_df, columns=standard_dummy_cols, drop_first=True
+        blocks.append(
+            dummies(
+                {
+                    col: pd.Categorical(df[col], categories=categories[col])
+                    if col in categories
+                    else df[col]
+                    for col in standard_dummy_cols
+                }
+            )
         )
 
     # Step 2: Reduce high-cardinality columns and create dummies
     if reduced_category_config:
-        reduced_cols = []
+        reduced = {}
         for col, n in reduced_category_config:
             # Get top N categories
-            top = result_df[col].value_counts().nlargest(n).index
+            if col in categories:
+                top = categories[col]
+            else:
+                top = _top_values(df[col].value_counts(), n)
 
             # Create new column with reduced categories
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+
             reduced_col = f"{col}_reduzido"
-            result_df[reduced_col] = result_df[col].where(
-                result_df[col].isin(top), "Outros"
-            )
-            reduced_cols.append(reduced_col)
+            reduced[reduced_col] = values.where(values.isin(top), "Outros")
+            if col in categories:
+                reduced[reduced_col] = pd.Categorical(
+                    reduced[reduced_col], categories=categories[col]
+                )
 
         # Create dummies for reduced columns
-        result_df = pd.get_dummies(result_df, columns=reduced_cols, drop_first=True)
+        blocks.append(dummies(reduced))
 
     # Step 3: Drop specified columns
-    if cols_to_drop:
-        result_df = result_df.drop(
-            columns=[c for c in cols_to_drop if c in result_df.columns]
-        )
+    removed = cols_to_drop | set(standard_dummy_cols)
+    kept = [col for col in df.columns if col not in removed]
+    blocks = [block.drop(columns=cols_to_drop & set(block.columns)) for block in blocks]
 
-    return result_df
+    return pd.concat([df[kept], *blocks], axis=1, copy=False)
+
+
+def count_dummy_values(
+    df, standard_dummy_cols=None, reduced_category_config=None, counts=None
+):
+    """
+    Count the values of the columns turned into dummies.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        Input DataFrame containing categorical columns
+    standard_dummy_cols : list, optional
+        List of column names converted directly to dummy variables
+    reduced_category_config : list of tuples, optional
+        List of (column_name, top_n) tuples of the reduced columns
+    counts : dict, optional
+        Counts of previous frames, which are added to
+
+    Returns:
+    --------
+    dict
+        Value counts of each column, missing values included
+    """
+    counts = dict(counts or {})
+    columns = list(standard_dummy_cols or []) + [
+        col for col, _ in reduced_category_config or []
+    ]
+
+    for col in columns:
+        col_counts = df[col].value_counts(dropna=False)
+        col_counts.index = col_counts.index.astype(object)
+        col_counts = col_counts[col_counts > 0]
+        if col in counts:
+            col_counts = counts[col].add(col_counts, fill_value=0)
+        counts[col] = col_counts
+
+    return counts
+
+
+def fit_dummy_categories(
+    counts, standard_dummy_cols=None, reduced_category_config=None
+):
+    """
+    Derive the dummy categories of each column from its value counts.
+
+    The categories are the ones ``create_dummy_variables`` would find on the
+    frame the counts came from: the sorted values of standard columns, and
+    the sorted top N values of reduced columns plus ``"Outros"`` when any
+    value falls outside them.
+
+    Parameters:
+    -----------
+    counts : dict
+        Value counts of each column, as returned by ``count_dummy_values``
+    standard_dummy_cols : list, optional
+        List of column names converted directly to dummy variables
+    reduced_category_config : list of tuples, optional
+        List of (column_name, top_n) tuples of the reduced columns
+
+    Returns:
+    --------
+    dict
+        Categories of each column, for the ``categories`` argument of
+        ``create_dummy_variables``
+    """
+    categories = {}
+
+    for col in standard_dummy_cols or []:
+        categories[col] = sorted(v for v in counts[col].index if pd.notna(v))
+
+    for col, n in reduced_category_config or []:
+        col_counts = counts[col]
+        reduced = list(_top_values(col_counts, n))
+        if col_counts.sum() > col_counts[reduced].sum():
+            reduced.append("Outros")
+        categories[col] = sorted(reduced)
+
+    return categories
+
+
+def _top_values(counts, n):
+    """
+    Os N valores mais frequentes, com empates resolvidos pelo valor.
+
+    A ordem não depende da ordem em que os valores aparecem, então contagens
+    acumuladas por temporada escolhem os mesmos valores que uma contagem do
+    histórico inteiro.
+    """
+    counts = counts[[pd.notna(v) for v in counts.index]]
+    ranked = counts.sort_index(kind="stable").sort_values(
+        ascending=False, kind="stable"
+    )
+    return ranked.index[:n]
 
 
-def scale_numerical_features(df, columns_to_scale):
+def scale_numerical_features(df, columns_to_scale, scaler=None):
     """
     Scale numerical features using MinMaxScaler.
 
@@ -495,6 +740,9 @@ def scale_numerical_features(df, columns_to_scale):
         Input DataFrame containing numerical columns to scale
     columns_to_scale : list
         List of column names to scale
+    scaler : MinMaxScaler, optional
+        Scaler already fitted, e.g. with ``partial_fit`` over several frames.
+        When omitted a new scaler is fitted on ``df``.
 
     Returns:
     --------
@@ -504,10 +752,12 @@ def scale_numerical_features(df, columns_to_scale):
     # Create a copy of the input DataFrame to avoid modifying the original
     result_df = df.copy()
 
-    # Initialize the MinMaxScaler
-    scaler = MinMaxScaler()
+    if scaler is None:
+        # Initialize the MinMaxScaler
+        scaler = MinMaxScaler()
+        scaler.fit(result_df[columns_to_scale])
 
     # Apply scaling to the specified columns
-    result_df[columns_to_scale] = scaler.fit_transform(result_df[columns_to_scale])
+    result_df[columns_to_scale] = scaler.transform(result_df[columns_to_scale])
 
     return result_df
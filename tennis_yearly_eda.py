@@ -5,6 +5,9 @@ This script performs exploratory data analysis on tennis match data by year,
 analyzing individual years and creating a combined analysis for the last 5 years.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -13,26 +16,244 @@ import re
 from pathlib import Path
 import glob
 
+from src.cache.cache_interface import CacheInterface
+
 plt.style.use("ggplot")
 sns.set_palette("viridis")
 
+# Summary keys of the match counts, with the column they count
+COUNT_COLUMNS = [
+    ("surface_counts", "surface"),
+    ("level_counts", "tourney_level"),
+    ("winner_counts", "winner_name"),
+]
+
+# Version of the cached yearly summaries, bumped whenever their content changes
+SUMMARY_CACHE_VERSION = 2
+
+# Number of bins of the match duration histograms
+DURATION_BINS = 30
+
+
+def summarize_years(yearly_data):
+    """
+    Compute the aggregates of several years in a single grouped pass.
+
+    Only the columns that are summarized are combined, and every aggregate
+    is computed once for all years by grouping on the year.
+
+    Args:
+        yearly_data (dict): Match data of each year
+
+    Returns:
+        dict: Aggregates of each year, with the shape of its data, the
+        match counts by surface and by tournament level, the match duration
+        statistics and histogram (for the columns present that year) and the
+        top 10 players by wins
+    """
+    columns = ["surface", "tourney_level", "minutes", "winner_name"]
+    combined = pd.concat(
+        [
+            data[[col for col in columns if col in data.columns]].assign(year=year)
+            for year, data in yearly_data.items()
+        ],
+        ignore_index=True,
+    )
+    by_year = combined.groupby("year", sort=False)
+
+    # Counts are kept in order of first appearance and only sorted per year,
+    # so that ties are ordered as by value_counts on each year alone.
+    aggregates = {}
+    for key, col in COUNT_COLUMNS:
+        if col in combined.columns:
+            aggregates[key] = (
+                combined.groupby(["year", col], sort=False).size().rename("count")
+            )
+    if "minutes" in combined.columns:
+        aggregates["duration_stats"] = by_year["minutes"].describe()
+
+    summaries = {}
+    for year, data in yearly_data.items():
+        summary = {"shape": data.shape}
+        for key, col in COUNT_COLUMNS:
+            if col in data.columns:
+                counts = aggregates[key]
+                counts = (
+                    counts.xs(year, level="year")
+                    if year in counts.index.get_level_values("year")
+                    else counts.iloc[:0].droplevel("year")
+                ).sort_values(ascending=False)
+                summary[key] = counts.head(10) if key == "winner_counts" else counts
+        if "minutes" in data.columns:
+            summary["duration_stats"] = (
+                aggregates["duration_stats"].loc[year].rename("minutes")
+            )
+            summary["duration_hist"] = np.histogram(
+                data["minutes"].dropna(), bins=DURATION_BINS
+            )
+        summaries[year] = summary
+
+    return summaries
+
+
+def player_year_matrix(data):
+    """
+    Count the wins and losses of every player in every year.
+
+    The counts are built with one grouped pass per side of the match, so
+    taking any number of players or years from the matrix is a lookup.
+
+    Args:
+        data (DataFrame): Match data with a "year" column
+
+    Returns:
+        DataFrame: One row per player, with the columns ("wins", year) and
+        ("losses", year)
+    """
+    sides = {"wins": "winner_name", "losses": "loser_name"}
+    matrix = pd.concat(
+        {
+            result: data.groupby([col, "year"]).size().unstack("year", fill_value=0)
+            for result, col in sides.items()
+            if col in data.columns
+        },
+        axis=1,
+    )
+
+    return matrix.fillna(0).astype(int).rename_axis(index="player")
+
+
+def file_fingerprint(path):
+    """
+    Fingerprint a file by its size, modification time and content.
+
+    Taken before the file is read, so that a change made while it is read
+    invalidates the summary computed from it.
+
+    Args:
+        path (Path): The file to fingerprint
+
+    Returns:
+        dict: Size, modification time in nanoseconds and SHA-256 hex digest
+    """
+    stat = path.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": file_digest(path),
+    }
+
+
+def file_digest(path):
+    """
+    Hash the content of a file.
+
+    Args:
+        path (Path): The file to hash
+
+    Returns:
+        str: SHA-256 hex digest of the file
+    """
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def plot_year(year, summary, output_dir):
+    """
+    Render and save the figures of a year.
+
+    Kept at module level so it can be shipped to worker processes.
+
+    Args:
+        year (int): The year of the summary
+        summary (dict): Aggregates of the year, from summarize_years
+        output_dir (Path): Directory of the year's results
+    """
+    if "surface_counts" in summary:
+        plt.figure(figsize=(10, 6))
+        summary["surface_counts"].plot(kind="bar")
+        plt.title(f"Number of Matches by Surface Type ({year})", fontsize=15)
+        plt.xlabel("Surface", fontsize=12)
+        plt.ylabel("Number of Matches", fontsize=12)
+        plt.tight_layout()
+        plt.savefig(output_dir / "matches_by_surface.png")
+        plt.close()
+
+    if "level_counts" in summary:
+        plt.figure(figsize=(10, 6))
+        summary["level_counts"].plot(kind="bar")
+        plt.title(f"Number of Matches by Tournament Level ({year})", fontsize=15)
+        plt.xlabel("Tournament Level", fontsize=12)
+        plt.ylabel("Number of Matches", fontsize=12)
+        plt.tight_layout()
+        plt.savefig(output_dir / "matches_by_tournament_level.png")
+        plt.close()
+
+    if "duration_stats" in summary:
+        duration_stats = summary["duration_stats"]
+        counts, edges = summary["duration_hist"]
+
+        plt.figure(figsize=(10, 6))
+        plt.stairs(counts, edges, fill=True, alpha=0.6)
+        plt.axvline(
+            duration_stats["mean"],
+            color="red",
+            linestyle="--",
+            label=f"Mean: {duration_stats['mean']:.1f} min",
+        )
+        plt.axvline(
+            duration_stats["50%"],
+            color="green",
+            linestyle="--",
+            label=f"Median: {duration_stats['50%']:.1f} min",
+        )
+        plt.title(f"Distribution of Match Duration ({year})", fontsize=15)
+        plt.xlabel("Duration (minutes)", fontsize=12)
+        plt.ylabel("Frequency", fontsize=12)
+        plt.legend()
+        plt.tight_layout()
+        plt.savefig(output_dir / "match_duration_distribution.png")
+        plt.close()
+
+    plt.figure(figsize=(12, 6))
+    summary["winner_counts"].plot(kind="bar")
+    plt.title(f"Top 10 Players by Number of Wins ({year})", fontsize=15)
+    plt.xlabel("Player", fontsize=12)
+    plt.ylabel("Number of Wins", fontsize=12)
+    plt.xticks(rotation=45, ha="right")
+    plt.tight_layout()
+    plt.savefig(output_dir / "top_players_by_wins.png")
+    plt.close()
+
 
 class TennisYearlyEDA:
-    def __init__(self, data_dir):
+    def __init__(self, data_dir, n_workers=None, cache_dir=None):
         """
         Initialize the EDA class with the path to the tennis data directory.
 
         Args:
             data_dir (str): Path to the directory containing yearly tennis match data CSV files
+            n_workers (int): Number of processes rendering the yearly figures.
+                If None, one per CPU.
+            cache_dir (str): Directory of the cached yearly summaries. If None,
+                "cache" under the output directory.
         """
         self.data_dir = Path(data_dir)
+        self.n_workers = n_workers or os.cpu_count() or 1
         self.yearly_data = {}
         self.combined_data = None
+        self._player_matrix = None
 
         self.base_output_dir = Path("eda_results")
         if not self.base_output_dir.exists():
             self.base_output_dir.mkdir(parents=True)
 
+        self.cache_dir = (
+            Path(cache_dir) if cache_dir else self.base_output_dir / "cache"
+        )
+        if not self.cache_dir.exists():
+            self.cache_dir.mkdir(parents=True)
+
     def find_data_files(self):
         """Find all yearly tennis data files in the data directory."""
         pattern = os.path.join(self.data_dir, "atp_matches_*.csv")
@@ -84,7 +305,9 @@ class TennisYearlyEDA:
 
         print(f"Loading data for the last {n} years: {recent_years}")
 
-        self.load_yearly_data(recent_years)
+        self.load_yearly_data(
+            [year for year in recent_years if year not in self.yearly_data]
+        )
 
         dfs = []
         for year in recent_years:
@@ -95,6 +318,7 @@ class TennisYearlyEDA:
 
         if dfs:
             self.combined_data = pd.concat(dfs, ignore_index=True)
+            self._player_matrix = None
             print(
                 f"Combined data for {len(dfs)} years: {self.combined_data.shape[0]} matches"
             )
@@ -108,116 +332,107 @@ class TennisYearlyEDA:
         Args:
             year (int): The year to analyze
         """
-        if year not in self.yearly_data:
-            print(f"No data loaded for {year}")
-            return
+        self.run_yearly_analyses([year])
 
-        data = self.yearly_data[year]
-        output_dir = self.base_output_dir / f"year_{year}"
-
-        if not output_dir.exists():
-            output_dir.mkdir(parents=True)
+    def report_year(self, year, summary, output_dir):
+        """
+        Print the summary of a year and save it as text.
 
+        Args:
+            year (int): The year of the summary
+            summary (dict): Aggregates of the year, from summarize_years
+            output_dir (Path): Directory of the year's results
+        """
         print(f"\n=== ANALYZING YEAR {year} ===")
 
-        print(f"Dataset shape: {data.shape}")
+        print(f"Dataset shape: {summary['shape']}")
 
-        if "surface" in data.columns:
-            surface_counts = data["surface"].value_counts()
+        if "surface_counts" in summary:
             print("\nMatch counts by surface:")
-            print(surface_counts)
-
-            plt.figure(figsize=(10, 6))
-            surface_counts.plot(kind="bar")
-            plt.title(f"Number of Matches by Surface Type ({year})", fontsize=15)
-            plt.xlabel("Surface", fontsize=12)
-            plt.ylabel("Number of Matches", fontsize=12)
-            plt.tight_layout()
-            plt.savefig(output_dir / "matches_by_surface.png")
-            plt.close()
+            print(summary["surface_counts"])
 
-        if "tourney_level" in data.columns:
-            level_counts = data["tourney_level"].value_counts()
+        if "level_counts" in summary:
             print("\nTournament level distribution:")
-            print(level_counts)
-
-            plt.figure(figsize=(10, 6))
-            level_counts.plot(kind="bar")
-            plt.title(f"Number of Matches by Tournament Level ({year})", fontsize=15)
-            plt.xlabel("Tournament Level", fontsize=12)
-            plt.ylabel("Number of Matches", fontsize=12)
-            plt.tight_layout()
-            plt.savefig(output_dir / "matches_by_tournament_level.png")
-            plt.close()
+            print(summary["level_counts"])
 
-        if "minutes" in data.columns:
-            duration_stats = data["minutes"].describe()
+        if "duration_stats" in summary:
             print("\nMatch duration statistics (minutes):")
-            print(duration_stats)
-
-            plt.figure(figsize=(10, 6))
-            sns.histplot(data["minutes"].dropna(), kde=True, bins=30)
-            plt.axvline(
-                duration_stats["mean"],
-                color="red",
-                linestyle="--",
-                label=f"Mean: {duration_stats['mean']:.1f} min",
-            )
-            plt.axvline(
-                duration_stats["50%"],
-                color="green",
-                linestyle="--",
-                label=f"Median: {duration_stats['50%']:.1f} min",
-            )
-            plt.title(f"Distribution of Match Duration ({year})", fontsize=15)
-            plt.xlabel("Duration (minutes)", fontsize=12)
-            plt.ylabel("Frequency", fontsize=12)
-            plt.legend()
-            plt.tight_layout()
-            plt.savefig(output_dir / "match_duration_distribution.png")
-            plt.close()
+            print(summary["duration_stats"])
 
-        winner_counts = data["winner_name"].value_counts().head(10)
         print("\nTop 10 players by wins:")
-        print(winner_counts)
-
-        plt.figure(figsize=(12, 6))
-        winner_counts.plot(kind="bar")
-        plt.title(f"Top 10 Players by Number of Wins ({year})", fontsize=15)
-        plt.xlabel("Player", fontsize=12)
-        plt.ylabel("Number of Wins", fontsize=12)
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-        plt.savefig(output_dir / "top_players_by_wins.png")
-        plt.close()
+        print(summary["winner_counts"])
 
         with open(output_dir / "summary.txt", "w") as f:
             f.write(f"=== TENNIS DATA SUMMARY FOR {year} ===\n\n")
-            f.write(f"Total matches: {data.shape[0]}\n\n")
+            f.write(f"Total matches: {summary['shape'][0]}\n\n")
 
-            if "surface" in data.columns:
+            if "surface_counts" in summary:
                 f.write("Matches by surface:\n")
-                for surface, count in surface_counts.items():
+                for surface, count in summary["surface_counts"].items():
                     f.write(f"- {surface}: {count}\n")
                 f.write("\n")
 
-            if "tourney_level" in data.columns:
+            if "level_counts" in summary:
                 f.write("Matches by tournament level:\n")
-                for level, count in level_counts.items():
+                for level, count in summary["level_counts"].items():
                     f.write(f"- {level}: {count}\n")
                 f.write("\n")
 
-            if "minutes" in data.columns:
+            if "duration_stats" in summary:
                 f.write("Match duration statistics (minutes):\n")
-                for stat, value in duration_stats.items():
+                for stat, value in summary["duration_stats"].items():
                     f.write(f"- {stat}: {value:.2f}\n")
                 f.write("\n")
 
             f.write("Top 10 players by wins:\n")
-            for player, wins in winner_counts.items():
+            for player, wins in summary["winner_counts"].items():
                 f.write(f"- {player}: {wins}\n")
 
-        print(f"Analysis for {year} complete. Results saved to {output_dir}/")
+    def get_player_year_matrix(self):
+        """
+        Get the player by year win/loss matrix of the combined data.
+
+        Computed once per combined data, see player_year_matrix.
+
+        Returns:
+            DataFrame: Wins and losses of every player in every year
+        """
+        if self._player_matrix is None:
+            self._player_matrix = player_year_matrix(self.combined_data)
+
+        return self._player_matrix
+
+    def top_players(self, n=15):
+        """
+        Get the players with the most wins across all combined years.
+
+        Args:
+            n (int): Number of players
+
+        Returns:
+            Series: Wins of each player, in decreasing order
+        """
+        return self.get_player_year_matrix()["wins"].sum(axis=1).nlargest(n)
+
+    def top_players_by_year(self, n=5, result="wins"):
+        """
+        Get the results by year of the players with the most wins.
+
+        Args:
+            n (int): Number of players
+            result (str): "wins" or "losses"
+
+        Returns:
+            DataFrame: One row per year and one column per player, the players
+            in the order of top_players
+        """
+        top_players = self.top_players(n).index
+
+        return (
+            self.get_player_year_matrix()[result]
+            .loc[top_players]
+            .T.rename_axis(columns=None)
+        )
 
     def analyze_combined_data(self):
         """Analyze the combined data from the last several years."""
@@ -284,7 +499,7 @@ class TennisYearlyEDA:
             plt.savefig(output_dir / "duration_trends.png")
             plt.close()
 
-        top_winners = data["winner_name"].value_counts().head(15)
+        top_winners = self.top_players(15)
         print("\nTop 15 players by wins across all years:")
         print(top_winners)
 
@@ -298,14 +513,7 @@ class TennisYearlyEDA:
         plt.savefig(output_dir / "top_players_combined.png")
         plt.close()
 
-        top5_players = top_winners.index[:5]
-        player_wins_by_year = pd.DataFrame()
-
-        for player in top5_players:
-            wins = data[data["winner_name"] == player].groupby("year").size()
-            player_wins_by_year[player] = wins
-
-        player_wins_by_year = player_wins_by_year.fillna(0)
+        player_wins_by_year = self.top_players_by_year(5)
         print("\nTop 5 players' wins by year:")
         print(player_wins_by_year)
 
@@ -359,21 +567,139 @@ class TennisYearlyEDA:
 
         print(f"Combined analysis complete. Results saved to {output_dir}/")
 
+    def summarize_yearly_data(self, years):
+        """
+        Get the summaries of several years, from the cache where possible.
+
+        The summary of a year is cached together with the size, modification
+        time and hash of its data file. An entry whose file has the same size
+        and modification time is used as is; when only the modification time
+        differs, the file is hashed and the entry is still used if the content
+        is unchanged. The other years are fingerprinted, read and summarized
+        together, and their entries are written. Years already loaded are
+        summarized from memory, and as their file may have changed since it
+        was read, their entries are not written.
+
+        Args:
+            years (list): List of years to summarize
+
+        Returns:
+            dict: Summary of each year that is loaded or has a data file
+        """
+        summaries = {}
+        misses = {}
+        for year in years:
+            file_path = self.data_dir / f"atp_matches_{year}.csv"
+            if not file_path.exists():
+                if year in self.yearly_data:
+                    misses[year] = None
+                else:
+                    print(f"No data loaded for {year}")
+                continue
+
+            summary = self.load_cached_summary(year, file_path)
+            if summary is not None:
+                summaries[year] = summary
+            elif year in self.yearly_data:
+                misses[year] = None
+            else:
+                misses[year] = file_fingerprint(file_path)
+
+        print(f"Cached summaries for {len(summaries)} of {len(years)} years")
+
+        if misses:
+            self.load_yearly_data(
+                [year for year in misses if year not in self.yearly_data]
+            )
+            loaded = [year for year in misses if year in self.yearly_data]
+            if loaded:
+                computed = summarize_years(
+                    {year: self.yearly_data[year] for year in loaded}
+                )
+                for year, summary in computed.items():
+                    if misses[year] is not None:
+                        self.save_cached_summary(year, misses[year], summary)
+                summaries.update(computed)
+
+        return {year: summaries[year] for year in years if year in summaries}
+
+    def load_cached_summary(self, year, file_path):
+        """
+        Load the cached summary of a year if its data file is unchanged.
+
+        Args:
+            year (int): The year of the summary
+            file_path (Path): Data file of the year
+
+        Returns:
+            dict: The cached summary, or None if it is missing or stale
+        """
+        cache = CacheInterface(self.cache_dir / f"year_{year}.pkl")
+        if not cache.check_exists():
+            return None
+
+        entry = cache.load()
+        stat = file_path.stat()
+        if entry["version"] != SUMMARY_CACHE_VERSION or entry["size"] != stat.st_size:
+            return None
+
+        if entry["mtime_ns"] != stat.st_mtime_ns:
+            if entry["sha256"] != file_digest(file_path):
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            cache.save(entry)
+
+        return entry["summary"]
+
+    def save_cached_summary(self, year, fingerprint, summary):
+        """
+        Cache the summary of a year with the fingerprint of its data file.
+
+        Args:
+            year (int): The year of the summary
+            fingerprint (dict): Fingerprint of the data file taken before it
+                was read, from file_fingerprint
+            summary (dict): Aggregates of the year, from summarize_years
+        """
+        CacheInterface(self.cache_dir / f"year_{year}.pkl").save(
+            {"version": SUMMARY_CACHE_VERSION, **fingerprint, "summary": summary}
+        )
+
     def run_yearly_analyses(self, years=None):
         """
         Run analyses for individual years.
 
+        The aggregates of the years that are not cached are computed in a
+        single grouped pass over the years combined, and the figures are
+        rendered in a process pool of n_workers processes.
+
         Args:
             years (list): List of years to analyze. If None, analyze all loaded years.
         """
         if years is None:
             years = list(self.yearly_data.keys())
 
-        for year in years:
-            if year in self.yearly_data:
-                self.analyze_year(year)
-            else:
-                print(f"No data loaded for {year}")
+        summaries = self.summarize_yearly_data(years)
+
+        jobs = []
+        for year, summary in summaries.items():
+            output_dir = self.base_output_dir / f"year_{year}"
+            if not output_dir.exists():
+                output_dir.mkdir(parents=True)
+
+            self.report_year(year, summary, output_dir)
+            jobs.append((year, summary, output_dir))
+
+        n_workers = min(self.n_workers, len(jobs))
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                list(pool.map(plot_year, *zip(*jobs)))
+        else:
+            for job in jobs:
+                plot_year(*job)
+
+        for year, _, output_dir in jobs:
+            print(f"Analysis for {year} complete. Results saved to {output_dir}/")
 
     def run_all_analyses(self, last_n_years=5):
         """
@@ -385,9 +711,7 @@ class TennisYearlyEDA:
         all_years = self.find_data_files()
         print(f"Found data files for years: {all_years}")
 
-        self.load_yearly_data(all_years)
-
-        self.run_yearly_analyses()
+        self.run_yearly_analyses(all_years)
 
         self.load_last_n_years(last_n_years)
         self.analyze_combined_data()
@@ -0,0 +1,54 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.cache.stage_cache import StageCache
+
+import pandas as pd
+
+
+class TestStageCache(TestCase):
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.cache = StageCache(self.tmp_dir.name)
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _compute(self):
+        self.calls += 1
+        return pd.DataFrame({"a": [1, 2, 3]})
+
+    def test_hit_after_miss(self):
+        first, key = self.cache.run("stage", 1, self._compute, ["input"])
+        second, second_key = self.cache.run("stage", 1, self._compute, ["input"])
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(key, second_key)
+        self.assertEqual(self.cache.misses, ["stage"])
+        self.assertEqual(self.cache.hits, ["stage"])
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_key_changes(self):
+        key = StageCache.key("stage", 1, ["input"], {"cols": ["a"]})
+
+        self.assertEqual(key, StageCache.key("stage", 1, ["input"], {"cols": ["a"]}))
+        self.assertNotEqual(key, StageCache.key("stage", 2, ["input"], {"cols": ["a"]}))
+        self.assertNotEqual(key, StageCache.key("stage", 1, ["other"], {"cols": ["a"]}))
+        self.assertNotEqual(key, StageCache.key("stage", 1, ["input"], {"cols": ["b"]}))
+
+    def test_unknown_input_is_not_cached(self):
+        _, key = self.cache.run("stage", 1, self._compute, [None])
+        self.cache.run("stage", 1, self._compute, [None])
+
+        self.assertIsNone(key)
+        self.assertEqual(self.calls, 2)
+
+    def test_disabled(self):
+        cache = StageCache()
+
+        _, key = cache.run("stage", 1, self._compute, ["input"])
+        cache.run("stage", 1, self._compute, ["input"])
+
+        self.assertIsNone(key)
+        self.assertEqual(self.calls, 2)
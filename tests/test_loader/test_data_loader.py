@@ -1,8 +1,10 @@
+from pathlib import Path
 from tempfile import TemporaryDirectory, tempdir
 from unittest import TestCase
 from unittest import mock
 from unittest.mock import mock_open
 
+from src.config.match_schema import ATP_MATCH_FILE_CONFIG
 from src.config.pipeline_config import PipelineConfig
 from src.loader.csv_data_loader import CSVDataLoader
 from src.loader._base_data_loader import BaseDataLoader
@@ -39,6 +41,113 @@ class TestDataLoader(TestCase):
 
         self.assertTrue(len(test_df) > 0)
 
+    def test_load_data_parallel(self):
+        loader = CSVDataLoader(self.test_dataset_path, **PipelineConfig())
+        parallel_loader = CSVDataLoader(
+            self.test_dataset_path, **PipelineConfig(n_workers=4)
+        )
+
+        pd.testing.assert_frame_equal(
+            parallel_loader.load_data(), loader.load_data()
+        )
+        self.assertEqual(
+            len(parallel_loader.file_timings),
+            len(list(Path(self.test_dataset_path).rglob("*.csv"))),
+        )
+
+    def test_load_data_with_schema(self):
+        loader = CSVDataLoader(
+            self.test_dataset_path,
+            **PipelineConfig(file_config=ATP_MATCH_FILE_CONFIG),
+        )
+
+        test_df = loader.load_data()
+
+        self.assertIsInstance(test_df["surface"].dtype, pd.CategoricalDtype)
+        self.assertEqual(test_df["w_ace"].dtype, "Int16")
+        self.assertEqual(test_df["winner_age"].dtype, "float32")
+        self.assertTrue(
+            test_df["winner_name"]
+            .cat.categories.equals(test_df["loser_name"].cat.categories)
+        )
+
+    def test_apply_dtypes(self):
+        data = pd.DataFrame({"rank": [1.0, None, 3.0], "ht": [180.0, None, 190.5]})
+
+        casted = BaseDataLoader._apply_dtypes(
+            data, {"rank": "Int16", "ht": "Float32", "missing": "Int8"}
+        )
+
+        pd.testing.assert_series_equal(
+            casted["rank"], pd.Series([1, None, 3], name="rank", dtype="Int16")
+        )
+        pd.testing.assert_series_equal(
+            casted["ht"], data["ht"].astype("Float32")
+        )
+
+    def test_fingerprint(self):
+        with TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / "atp_matches_2024.csv"
+            file.write_text("a,b\n1,2\n")
+            loader = CSVDataLoader(tmp_dir, **PipelineConfig())
+            fingerprint = loader.fingerprint()
+
+            self.assertEqual(loader.fingerprint(), fingerprint)
+
+            file.write_text("a,b\n1,2\n3,4\n")
+            self.assertNotEqual(loader.fingerprint(), fingerprint)
+
+            (Path(tmp_dir) / "atp_matches_2023.csv").write_text("a,b\n")
+            self.assertNotEqual(loader.fingerprint(), fingerprint)
+
+    def test_iter_seasons(self):
+        with TemporaryDirectory() as tmp_dir:
+            pd.DataFrame({"tourney_date": [20221230, 20230102, 20231231]}).to_csv(
+                Path(tmp_dir) / "atp_matches_2023.csv", index=False
+            )
+            pd.DataFrame({"tourney_date": [20231231, 20240101]}).to_csv(
+                Path(tmp_dir) / "atp_matches_2024.csv", index=False
+            )
+            loader = CSVDataLoader(tmp_dir, **PipelineConfig())
+
+            seasons = [
+                season["tourney_date"].tolist() for season in loader.iter_seasons()
+            ]
+
+        self.assertEqual(
+            seasons, [[20221230], [20230102, 20231231, 20231231], [20240101]]
+        )
+
+    def test_year_range(self):
+        with TemporaryDirectory() as tmp_dir:
+            for year, dates in {
+                2021: [20210104],
+                2022: [20220103, 20221230],
+                2023: [20221231, 20230102],
+                2024: [20240101],
+            }.items():
+                pd.DataFrame({"tourney_date": dates}).to_csv(
+                    Path(tmp_dir) / f"atp_matches_{year}.csv", index=False
+                )
+
+            for n_workers in [1, 2]:
+                config = PipelineConfig(year_range=(2021, 2022), n_workers=n_workers)
+                loader = CSVDataLoader(tmp_dir, **config)
+                seasons = [
+                    season["tourney_date"].tolist() for season in loader.iter_seasons()
+                ]
+
+                self.assertEqual(
+                    [file.stem[-4:] for file in loader.source_files()],
+                    ["2021", "2022", "2023"],
+                )
+                self.assertEqual(seasons, [[20210104], [20220103, 20221230, 20221231]])
+                self.assertEqual(len(loader.file_timings), 3)
+                self.assertEqual(
+                    loader.load_data()["tourney_date"].tolist(),
+                    [20210104, 20220103, 20221230, 20221231],
+                )
+
     def test_validate(self):
         test_config = PipelineConfig()
 
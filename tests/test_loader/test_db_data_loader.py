@@ -0,0 +1,121 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import sqlite3
+from unittest import TestCase, mock
+
+from src.config.load_type import LoaderType
+from src.config.pipeline_config import PipelineConfig
+from src.loader._base_data_loader import BaseDataLoader
+from src.loader.db_data_loader import DBDataLoader
+
+import pandas as pd
+
+
+class TestDBDataLoader(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "tourney_date": [19991231, 20000103, 20010108, 20020107],
+                "winner_id": [1, 2, 3, 1],
+                "winner_name": ["A", "B", "C", "A"],
+                "loser_id": [5, 1, 7, 8],
+                "loser_name": ["E", "A", "G", "H"],
+                "score": ["6-4 6-4", "6-3 6-3", None, "7-6(5) 6-1"],
+            }
+        )
+
+    def _save(self, tmp_dir):
+        path = Path(tmp_dir) / "matches.db"
+        # The loader only reads from an existing database.
+        path.touch()
+        DBDataLoader(path, **PipelineConfig()).save_data(self.test_df, str(path))
+        return path
+
+    def test_cannot_instantiate(self):
+        with self.assertRaises(RuntimeError):
+            DBDataLoader("invalid_file", **PipelineConfig())
+
+    def test_from_config(self):
+        with TemporaryDirectory() as tmp_dir:
+            config = PipelineConfig(
+                loader_type=LoaderType.DB, dataset_path=self._save(tmp_dir)
+            )
+
+            self.assertIsInstance(BaseDataLoader.from_config(config), DBDataLoader)
+
+    def test_round_trip(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = self._save(tmp_dir)
+
+            test_df = DBDataLoader(path, **PipelineConfig()).process()
+
+            pd.testing.assert_frame_equal(test_df, self.test_df)
+
+    def test_indexes(self):
+        with TemporaryDirectory() as tmp_dir:
+            with sqlite3.connect(self._save(tmp_dir)) as conn:
+                indexes = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                ).fetchall()
+
+            self.assertEqual(
+                sorted(name for (name,) in indexes),
+                [
+                    "idx_matches_loser_id",
+                    "idx_matches_tourney_date",
+                    "idx_matches_winner_id",
+                ],
+            )
+
+    def test_filters(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = self._save(tmp_dir)
+
+            loader = DBDataLoader(
+                path, **PipelineConfig(year_range=(2000, 2002), player_ids=[1])
+            )
+            test_df = loader.load_data()
+
+            self.assertEqual(list(test_df["tourney_date"]), [20000103, 20020107])
+
+    def test_chunks(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = self._save(tmp_dir)
+
+            loader = DBDataLoader(
+                path, **PipelineConfig(columns=["winner_name"], chunk_size=3)
+            )
+            chunks = list(loader.iter_chunks())
+
+            self.assertEqual([len(chunk) for chunk in chunks], [3, 1])
+            self.assertEqual(list(chunks[0].columns), ["winner_name"])
+
+    def test_chunks_close_connection(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = self._save(tmp_dir)
+            connections = []
+            sqlite_connect = sqlite3.connect
+
+            def connect(*args, **kwargs):
+                connections.append(sqlite_connect(*args, **kwargs))
+                return connections[-1]
+
+            loader = DBDataLoader(path, **PipelineConfig(chunk_size=1))
+            with mock.patch("src.loader.db_data_loader.sqlite3.connect", connect):
+                chunks = loader.iter_chunks()
+                next(chunks)
+                chunks.close()
+
+            with self.assertRaises(sqlite3.ProgrammingError):
+                connections[0].execute("SELECT 1")
+
+    def test_save_creates_database(self):
+        with TemporaryDirectory() as tmp_dir:
+            new_path = Path(tmp_dir) / "new" / "matches.db"
+
+            loader = DBDataLoader(self._save(tmp_dir), **PipelineConfig())
+            loader.save_data(self.test_df, str(new_path))
+
+            pd.testing.assert_frame_equal(
+                DBDataLoader(new_path, **PipelineConfig()).load_data(), self.test_df
+            )
@@ -0,0 +1,74 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.config.load_type import LoaderType
+from src.config.pipeline_config import PipelineConfig
+from src.loader._base_data_loader import BaseDataLoader
+from src.loader.parquet_data_loader import ParquetDataLoader
+
+import pandas as pd
+
+
+class TestParquetDataLoader(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "tourney_date": [19991231, 20000103, 20010108, 20020107],
+                "winner_name": ["A", "B", "C", "D"],
+                "loser_name": ["E", "F", "G", "H"],
+                "score": ["6-4 6-4", "6-3 6-3", "W/O", "7-6(5) 6-1"],
+            }
+        )
+
+    def _save(self, tmp_dir):
+        ParquetDataLoader(tmp_dir, **PipelineConfig()).save_data(
+            self.test_df, tmp_dir
+        )
+
+    def test_cannot_instantiate(self):
+        with self.assertRaises(RuntimeError):
+            ParquetDataLoader("invalid_file", **PipelineConfig())
+
+    def test_from_config(self):
+        with TemporaryDirectory() as tmp_dir:
+            config = PipelineConfig(
+                loader_type=LoaderType.PARQUET, dataset_path=tmp_dir
+            )
+
+            self.assertIsInstance(
+                BaseDataLoader.from_config(config), ParquetDataLoader
+            )
+
+    def test_round_trip(self):
+        with TemporaryDirectory() as tmp_dir:
+            self._save(tmp_dir)
+
+            test_df = ParquetDataLoader(tmp_dir, **PipelineConfig()).process()
+
+            test_df = test_df.sort_values("tourney_date").reset_index(drop=True)
+            pd.testing.assert_frame_equal(test_df, self.test_df)
+
+    def test_year_range(self):
+        with TemporaryDirectory() as tmp_dir:
+            self._save(tmp_dir)
+
+            loader = ParquetDataLoader(
+                tmp_dir, **PipelineConfig(year_range=(2000, 2001))
+            )
+            test_df = loader.load_data()
+
+            self.assertEqual(
+                sorted(test_df["tourney_date"]), [20000103, 20010108]
+            )
+
+    def test_columns(self):
+        with TemporaryDirectory() as tmp_dir:
+            self._save(tmp_dir)
+
+            loader = ParquetDataLoader(
+                tmp_dir, **PipelineConfig(columns=["winner_name", "year"])
+            )
+            test_df = loader.load_data()
+
+            self.assertEqual(list(test_df.columns), ["winner_name", "year"])
+            self.assertEqual(len(test_df), 4)
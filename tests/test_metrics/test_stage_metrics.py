@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.metrics.stage_metrics import StageMetrics
+
+import pandas as pd
+
+
+class TestStageMetrics(TestCase):
+    def setUp(self):
+        self.metrics = StageMetrics()
+        self.df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+
+    def test_track(self):
+        output = self.metrics.track(
+            "stage", lambda: (self.df.head(2), None), inputs=[self.df], season=2000
+        )
+
+        self.assertEqual(len(output[0]), 2)
+        (entry,) = self.metrics.stages
+        self.assertEqual(entry["stage"], "stage")
+        self.assertEqual(entry["season"], 2000)
+        self.assertEqual(entry["input"]["rows"], 3)
+        self.assertEqual(entry["input"]["cols"], 2)
+        self.assertEqual(entry["output"]["rows"], 2)
+        self.assertGreater(entry["output"]["memory_bytes"], 0)
+        self.assertGreaterEqual(entry["wall_s"], 0)
+        self.assertGreaterEqual(entry["cpu_s"], 0)
+        self.assertGreaterEqual(entry["rss_peak_bytes"], entry["rss_start_bytes"])
+
+    def test_shallow_memory(self):
+        shallow = StageMetrics(deep=False)
+        shallow.track("stage", lambda: self.df)
+        self.metrics.track("stage", lambda: self.df)
+
+        self.assertEqual(
+            shallow.stages[0]["output"]["memory_bytes"],
+            self.df.memory_usage(deep=False).sum(),
+        )
+        self.assertLess(
+            shallow.stages[0]["output"]["memory_bytes"],
+            self.metrics.stages[0]["output"]["memory_bytes"],
+        )
+
+    def test_measure_without_output(self):
+        with self.metrics.measure("stage"):
+            pass
+
+        self.assertEqual(self.metrics.stages[0]["output"]["rows"], 0)
+
+    def test_track_iter(self):
+        def chunks():
+            for lo in [0, 2]:
+                yield self.df.iloc[lo : lo + 2]
+
+        items = list(
+            self.metrics.track_iter(
+                "load", chunks(), labels=lambda chunk: {"first": chunk["a"].iloc[0]}
+            )
+        )
+
+        self.assertEqual(len(items), 2)
+        self.assertEqual(
+            [entry["stage"] for entry in self.metrics.stages], ["load", "load"]
+        )
+        self.assertEqual([entry["first"] for entry in self.metrics.stages], [1, 3])
+        self.assertEqual(
+            [entry["output"]["rows"] for entry in self.metrics.stages], [2, 1]
+        )
+        self.assertEqual(list(self.metrics.stages[0])[:2], ["stage", "first"])
+
+    def test_save(self):
+        self.metrics.track("first", lambda: self.df)
+        self.metrics.track("second", lambda: None)
+
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "reports" / "metrics.json"
+            report = self.metrics.save(path)
+
+            with open(path) as f:
+                saved = json.load(f)
+
+        self.assertEqual(saved, json.loads(json.dumps(report)))
+        self.assertEqual(
+            [entry["stage"] for entry in saved["stages"]], ["first", "second"]
+        )
+        self.assertGreater(saved["peak_rss_bytes"], 0)
@@ -1,9 +1,13 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from src.config.pipeline_config import PipelineConfig
 from src.source_parser.tennis_match_parser import TennisMatchParser
 from src.source_parser._base_parser import BaseDataParser
+from src.source_parser.player_dimension import PlayerDimension
 from src.loader.csv_data_loader import CSVDataLoader
 
+import numpy as np
 import pandas as pd
 
 
@@ -25,3 +29,52 @@ class TestParser(TestCase):
 
         with self.assertRaises(NotImplementedError):
             TennisMatchParser(None, **test_config).from_config(None, test_config)
+
+    def test_player_dimension(self):
+        test_df = pd.DataFrame(
+            {
+                "tourney_date": [20240101, 20240101, 20240108],
+                "winner_id": [10, 30, 20],
+                "winner_name": ["A", "Same Name", "B"],
+                "loser_id": [20, 40, 10],
+                "loser_name": ["B", "Same Name", "A renamed"],
+            }
+        )
+        dimension = PlayerDimension()
+
+        first = TennisMatchParser(test_df.iloc[:2].copy(), dimension).process()
+        second = TennisMatchParser(test_df.iloc[2:].copy(), dimension).process()
+
+        self.assertEqual(first["winner_code"].dtype, np.int32)
+        self.assertEqual(first["winner_code"].tolist(), [0, 2])
+        self.assertEqual(first["loser_code"].tolist(), [1, 3])
+        self.assertEqual(second["winner_code"].tolist(), [1])
+        self.assertEqual(second["loser_code"].tolist(), [0])
+        self.assertEqual(dimension.names, ["A renamed", "B", "Same Name", "Same Name"])
+        self.assertEqual(dimension.lookup(["B", "Nobody"]).tolist(), [1, -1])
+
+    def test_player_dimension_reloaded(self):
+        test_df = pd.DataFrame(
+            {
+                "tourney_date": [20240101, 20240108, 20240115],
+                "winner_id": [10, 30, 50],
+                "winner_name": ["A", "C", "E"],
+                "loser_id": [20, 10, 30],
+                "loser_name": ["B", "A", "C"],
+            }
+        )
+        shared = PlayerDimension()
+        TennisMatchParser(test_df.iloc[:2].copy(), shared).process()
+
+        with TemporaryDirectory() as tmp_dir:
+            shared.save(Path(tmp_dir) / "dimension.pkl")
+            reloaded = PlayerDimension.load(Path(tmp_dir) / "dimension.pkl")
+
+        expected = TennisMatchParser(test_df.iloc[2:].copy(), shared).process()
+        parsed = TennisMatchParser(test_df.iloc[2:].copy(), reloaded).process()
+
+        self.assertEqual(parsed["winner_code"].tolist(), [3])
+        self.assertEqual(parsed["loser_code"].tolist(), [2])
+        pd.testing.assert_frame_equal(parsed, expected)
+        self.assertEqual(reloaded.names, shared.names)
+        self.assertEqual(reloaded.lookup(["C"]).tolist(), [2])
@@ -1,9 +1,22 @@
-from unittest import TestCase
+from pathlib import Path
+import re
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
 
 from src.config.dataset_type import DatasetType
 from src.config.load_type import LoaderType
+from src.config.match_schema import ATP_MATCH_FILE_CONFIG
+from src.config.output_format import OutputFormat
 from src.config.pipeline_config import PipelineConfig
+from src.loader import BaseDataLoader
 from src.pipeline import PipelineRunner
+from src.source_parser.player_dimension import PlayerDimension
+from src.transformers.feature_transforms import DummyEncoder, FeatureScaler
+from src.transformers.player_stats import PlayerStatsState
+from src.transformers.ratings import RatingState
+
+import numpy as np
+import pandas as pd
 
 
 class TestPipeline(TestCase):
@@ -17,3 +30,203 @@ class TestPipeline(TestCase):
         )
 
         PipelineRunner.run(config)
+
+    def test_sources_fingerprinted_only_for_cache(self):
+        config = PipelineConfig(
+            dataset_type=DatasetType.TENNIS_MATCH,
+            dataset_path="dataset/raw/",
+            loader_type=LoaderType.CSV,
+            cache_hash_files=True,
+        )
+
+        with mock.patch.object(
+            BaseDataLoader, "fingerprint", return_value="digest"
+        ) as fingerprint:
+            PipelineRunner.build_graph(config)
+            fingerprint.assert_not_called()
+
+            with TemporaryDirectory() as tmp_dir:
+                graph = PipelineRunner.build_graph(dict(config, cache_dir=tmp_dir))
+            fingerprint.assert_called_once()
+
+        self.assertEqual(graph.stages["load"].sources, ["digest"])
+
+    def test_parse_params_cover_parser_config(self):
+        config = PipelineConfig(
+            dataset_type=DatasetType.TENNIS_MATCH,
+            dataset_path="dataset/raw/",
+            loader_type=LoaderType.CSV,
+        )
+        params = [
+            PipelineRunner.build_graph(changed).stages["parse"].params
+            for changed in [
+                config,
+                dict(config, required_columns=["winner_name"]),
+                dict(config, column_mapping={"winner": "winner_name"}),
+            ]
+        ]
+
+        self.assertNotEqual(params[0], params[1])
+        self.assertNotEqual(params[0], params[2])
+        self.assertNotEqual(params[1], params[2])
+
+    def test_pipeline_sparse_dummies(self):
+        with TemporaryDirectory() as tmp_dir:
+            name = "atp_matches_2024.csv"
+            source = Path("dataset/raw") / name
+            (Path(tmp_dir) / name).write_bytes(source.read_bytes())
+
+            config = PipelineConfig(
+                dataset_type=DatasetType.TENNIS_MATCH,
+                dataset_path=tmp_dir,
+                loader_type=LoaderType.CSV,
+                file_config=ATP_MATCH_FILE_CONFIG,
+                random_state=0,
+                output_format=OutputFormat.PARQUET,
+                dummy_dtype="uint8",
+            )
+            PipelineRunner.run(dict(config, path=f"{tmp_dir}/dense.parquet"))
+            PipelineRunner.run(
+                dict(config, path=f"{tmp_dir}/sparse.parquet", dummy_sparse=True)
+            )
+
+            pd.testing.assert_frame_equal(
+                pd.read_parquet(f"{tmp_dir}/sparse.parquet"),
+                pd.read_parquet(f"{tmp_dir}/dense.parquet"),
+            )
+
+    def test_pipeline_chunked(self):
+        def rename_only(data, random_state=None):
+            return data.rename(
+                columns=lambda col: re.sub(
+                    r"^(w|winner)_",
+                    "player_A_",
+                    re.sub(r"^(l|loser)_", "player_B_", col),
+                )
+            )
+
+        with TemporaryDirectory() as tmp_dir:
+            for year in [2023, 2024]:
+                name = f"atp_matches_{year}.csv"
+                (Path(tmp_dir) / name).write_bytes(
+                    (Path("dataset/raw") / name).read_bytes()
+                )
+
+            config = PipelineConfig(
+                dataset_type=DatasetType.TENNIS_MATCH,
+                dataset_path=tmp_dir,
+                loader_type=LoaderType.CSV,
+                file_config=ATP_MATCH_FILE_CONFIG,
+            )
+
+            # Without the random swap both modes must give the same output.
+            with mock.patch("src.pipeline.invert_winner_loser_names", rename_only):
+                PipelineRunner.run(dict(config, path=f"{tmp_dir}/full.out"))
+                report = PipelineRunner.run(
+                    dict(config, path=f"{tmp_dir}/chunked.out", chunked=True)
+                )
+
+            pd.testing.assert_frame_equal(
+                pd.read_csv(f"{tmp_dir}/chunked.out"),
+                pd.read_csv(f"{tmp_dir}/full.out"),
+            )
+            for stage in ["load", "save"]:
+                self.assertEqual(
+                    [
+                        entry["season"]
+                        for entry in report["stages"]
+                        if entry["stage"] == stage
+                    ],
+                    [2023, 2024],
+                )
+
+    def test_pipeline_resumes_from_rating_state(self):
+        with TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "raw"
+            source.mkdir()
+            for year in [2023, 2024]:
+                name = f"atp_matches_{year}.csv"
+                (source / name).write_bytes((Path("dataset/raw") / name).read_bytes())
+
+            config = PipelineConfig(
+                dataset_type=DatasetType.TENNIS_MATCH,
+                dataset_path=str(source),
+                loader_type=LoaderType.CSV,
+                file_config=ATP_MATCH_FILE_CONFIG,
+                random_state=0,
+                path=f"{tmp_dir}/out.csv",
+            )
+            PipelineRunner.run(
+                dict(
+                    config,
+                    rating_state_path=f"{tmp_dir}/full.pkl",
+                    player_dimension_path=f"{tmp_dir}/full_players.pkl",
+                    player_stats_state_path=f"{tmp_dir}/full_stats.pkl",
+                )
+            )
+
+            new_matches = pd.read_csv(source / "atp_matches_2024.csv")
+            n_new = len(new_matches)
+            new_season = (source / "atp_matches_2024.csv").read_bytes()
+            # The new season brings a round the saved encoder has not seen.
+            old_rounds = pd.read_csv(source / "atp_matches_2023.csv")["round"]
+            self.assertFalse(set(new_matches["round"]) <= set(old_rounds))
+            for chunked in [False, True]:
+                resumed = dict(
+                    config,
+                    chunked=chunked,
+                    rating_state_path=f"{tmp_dir}/state_{chunked}.pkl",
+                    player_dimension_path=f"{tmp_dir}/players_{chunked}.pkl",
+                    player_stats_state_path=f"{tmp_dir}/stats_{chunked}.pkl",
+                    dummy_encoder_path=f"{tmp_dir}/encoder_{chunked}.pkl",
+                    feature_scaler_path=f"{tmp_dir}/scaler_{chunked}.pkl",
+                )
+                (source / "atp_matches_2024.csv").unlink()
+                PipelineRunner.run(resumed)
+                columns = list(pd.read_csv(f"{tmp_dir}/out.csv").columns)
+                encoder = DummyEncoder.load(resumed["dummy_encoder_path"])
+                scaler = FeatureScaler.load(resumed["feature_scaler_path"]).scaler
+
+                (source / "atp_matches_2024.csv").write_bytes(new_season)
+                report = PipelineRunner.run(resumed)
+
+                # Only the new matches go past the parser.
+                self.assertEqual(
+                    {
+                        entry["output"]["rows"]
+                        for entry in report["stages"]
+                        if entry["stage"] == "invert" and entry["output"]["rows"]
+                    },
+                    {n_new},
+                )
+
+                output = pd.read_csv(f"{tmp_dir}/out.csv")
+                self.assertEqual(len(output), n_new)
+                self.assertEqual(list(output.columns), columns)
+                self.assertEqual(
+                    DummyEncoder.load(resumed["dummy_encoder_path"]).categories,
+                    encoder.categories,
+                )
+                resumed_scaler = FeatureScaler.load(resumed["feature_scaler_path"])
+                np.testing.assert_array_equal(
+                    resumed_scaler.scaler.data_min_, scaler.data_min_
+                )
+                np.testing.assert_array_equal(
+                    resumed_scaler.scaler.data_max_, scaler.data_max_
+                )
+                state = RatingState.load(resumed["rating_state_path"])
+                full = RatingState.load(f"{tmp_dir}/full.pkl")
+                np.testing.assert_allclose(state.elo, full.elo)
+                np.testing.assert_allclose(state.ts_pi, full.ts_pi)
+                self.assertEqual(state.last_match_id, full.last_match_id)
+                players = PlayerDimension.load(resumed["player_dimension_path"])
+                full_players = PlayerDimension.load(f"{tmp_dir}/full_players.pkl")
+                self.assertEqual(players.codes, full_players.codes)
+                stats = PlayerStatsState.load(resumed["player_stats_state_path"])
+                full_stats = PlayerStatsState.load(f"{tmp_dir}/full_stats.pkl")
+                np.testing.assert_allclose(stats.sums, full_stats.sums)
+                np.testing.assert_array_equal(stats.counts, full_stats.counts)
+
+                without_players = dict(resumed, player_dimension_path=None)
+                with self.assertRaisesRegex(ValueError, "player_dimension_path"):
+                    PipelineRunner.run(without_players)
@@ -0,0 +1,133 @@
+from functools import partial
+from tempfile import TemporaryDirectory
+import time
+from unittest import TestCase
+
+from src.cache.stage_cache import StageCache
+from src.metrics.stage_metrics import StageMetrics
+from src.scheduler.stage_graph import Stage, StageGraph
+
+
+def source():
+    return 2
+
+
+def add(value, other=1):
+    return value + other
+
+
+def split(value):
+    return value, -value
+
+
+def truncated(value):
+    return (value,)
+
+
+def slow(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+class TestStageGraph(TestCase):
+    def setUp(self):
+        self.stages = [
+            Stage("total", add, inputs=["left", "right"]),
+            Stage("split", split, inputs=["start"], outputs=["left", "right"]),
+            Stage("start", source),
+        ]
+
+    def test_order(self):
+        graph = StageGraph(self.stages)
+
+        self.assertEqual(
+            [stage.name for stage in graph.order], ["start", "split", "total"]
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            StageGraph(self.stages + [Stage("start", source)])
+        with self.assertRaises(ValueError):
+            StageGraph(self.stages + [Stage("other", source, outputs=["start"])])
+        with self.assertRaises(ValueError):
+            StageGraph([Stage("orphan", add, inputs=["missing"])])
+        with self.assertRaises(ValueError):
+            StageGraph(
+                [
+                    Stage("a", add, inputs=["b"]),
+                    Stage("b", add, inputs=["a"]),
+                ]
+            )
+
+    def test_run(self):
+        metrics = StageMetrics()
+
+        values = StageGraph(self.stages).run(metrics=metrics)
+
+        self.assertEqual(values, {"start": 2, "left": 2, "right": -2, "total": 0})
+        self.assertEqual(
+            [entry["stage"] for entry in metrics.stages], ["start", "split", "total"]
+        )
+
+    def test_wrong_number_of_outputs(self):
+        stages = self.stages[:1] + [
+            Stage("split", truncated, inputs=["start"], outputs=["left", "right"]),
+            Stage("start", source),
+        ]
+
+        for n_workers in [1, 2]:
+            with self.assertRaisesRegex(ValueError, "split"):
+                StageGraph(stages).run(n_workers=n_workers)
+
+    def test_wrong_number_of_cached_outputs(self):
+        with TemporaryDirectory() as tmp_dir:
+            cache = StageCache(tmp_dir)
+            StageGraph(self.stages).run(cache)
+
+            key = cache.stage_key("start", 1, [], {})
+            cache.save("split", cache.stage_key("split", 1, [key], {}), (1,))
+            with self.assertRaisesRegex(ValueError, "split"):
+                StageGraph(self.stages).run(cache)
+
+    def test_run_concurrent(self):
+        graph = StageGraph(
+            [
+                Stage("start", source),
+                Stage("a", partial(slow, 1), inputs=["start"]),
+                Stage("b", partial(slow, 1), inputs=["start"]),
+                Stage("total", add, inputs=["a", "b"]),
+            ]
+        )
+        metrics = StageMetrics()
+
+        start = time.perf_counter()
+        values = graph.run(metrics=metrics, n_workers=2)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(values["total"], 4)
+        self.assertLess(elapsed, 1.8)
+        workers = {entry["stage"]: entry.get("worker") for entry in metrics.stages}
+        self.assertIsNone(workers["start"])
+        self.assertIsNotNone(workers["a"])
+        self.assertIsNotNone(workers["b"])
+
+    def test_cached(self):
+        with TemporaryDirectory() as tmp_dir:
+            cache = StageCache(tmp_dir)
+            StageGraph(self.stages).run(cache)
+
+            second = StageCache(tmp_dir)
+            values = StageGraph(self.stages).run(second)
+
+        self.assertEqual(values["total"], 0)
+        self.assertEqual(cache.misses, ["start", "split", "total"])
+        self.assertEqual(second.hits, ["start", "split", "total"])
+
+    def test_uncached_source(self):
+        stages = self.stages[:2] + [Stage("start", source, sources=[None])]
+        with TemporaryDirectory() as tmp_dir:
+            cache = StageCache(tmp_dir)
+            StageGraph(stages).run(cache)
+            StageGraph(stages).run(cache)
+
+        self.assertEqual(cache.hits, [])
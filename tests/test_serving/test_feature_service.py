@@ -0,0 +1,183 @@
+import copy
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.loader.csv_data_loader import CSVDataLoader
+from src.pipeline import DUMMY_CONFIG, SCALE_COLUMNS
+from src.serving.feature_service import FeatureService
+from src.source_parser.tennis_match_parser import TennisMatchParser
+from src.transformers.feature_transforms import DummyEncoder, FeatureScaler
+from src.transformers.player_stats import PlayerStatsState
+from src.transformers.ratings import RATING_FEATURE_COLS, RatingState
+from src.transformers.transformers import (
+    PLAYER_STATS_COLS,
+    compute_rating_features,
+    compute_score_features,
+    finalize_tennis_model_data,
+    invert_winner_loser_names,
+    inverter_scores_df,
+    prepare_tennis_model_data,
+)
+
+import numpy as np
+import pandas as pd
+
+
+CONTEXT_COLUMNS = ["surface", "round", "best_of", "tourney_level"]
+
+
+class TestFeatureService(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "atp_matches_2024.csv"
+            path.write_bytes(Path("dataset/raw/atp_matches_2024.csv").read_bytes())
+            data = CSVDataLoader(tmp_dir).load_data()
+
+        parser = TennisMatchParser(data)
+        data = parser.process()
+        cls.player_dimension = parser.player_dimension
+        cls.data = inverter_scores_df(invert_winner_loser_names(data, random_state=0))
+
+        # Batch features of the whole season, as computed by the pipeline.
+        stats = PlayerStatsState(PLAYER_STATS_COLS, last_n=[5], halflives=[3])
+        model_features = finalize_tennis_model_data(
+            cls.data,
+            prepare_tennis_model_data(
+                cls.data, compute_score_features(cls.data), stats
+            ),
+            compute_rating_features(cls.data),
+        )
+        cls.encoder = DummyEncoder(**DUMMY_CONFIG)
+        cls.scaler = FeatureScaler(SCALE_COLUMNS)
+        cls.expected = cls.scaler.fit_transform(
+            cls.encoder.fit_transform(model_features)
+        )
+
+    def service(self, n_matches, glicko_period=None):
+        """Service fed with the first ``n_matches`` of the season."""
+        service = FeatureService(
+            RatingState(glicko_period),
+            PlayerStatsState(PLAYER_STATS_COLS, last_n=[5], halflives=[3]),
+            self.encoder,
+            self.scaler,
+            columns=[col for col in self.expected.columns if col != "outcome"],
+            player_dimension=self.player_dimension,
+        )
+        return service.update(self.data.iloc[:n_matches])
+
+    def match_columns(self, rows):
+        """Columns describing upcoming matches, with their players."""
+        columns = ["player_A_name", "player_B_name", "tourney_datetime"]
+        columns += CONTEXT_COLUMNS
+        columns += [
+            f"player_{side}_{attribute}"
+            for side in "AB"
+            for attribute in ["hand", "ht", "age"]
+        ]
+
+        return self.data.iloc[rows][columns]
+
+    def test_matches_batch_features(self):
+        last = len(self.data) - 1
+        match = self.match_columns([last]).iloc[0]
+        attributes = match.drop(["player_A_name", "player_B_name", *CONTEXT_COLUMNS])
+
+        features = self.service(last).features(
+            match["player_A_name"],
+            match["player_B_name"],
+            match["surface"],
+            match["round"],
+            match["best_of"],
+            match["tourney_level"],
+            **attributes,
+        )
+
+        expected = self.expected.iloc[last].drop("outcome")
+        self.assertEqual(list(features), list(expected.index))
+        pd.testing.assert_series_equal(
+            pd.Series(features, dtype=object),
+            expected.astype(object),
+            check_names=False,
+            check_exact=False,
+        )
+
+    def test_batch_matches_single(self):
+        service = self.service(len(self.data) - 10)
+        matches = self.match_columns(range(len(self.data) - 10, len(self.data)))
+
+        batch = service.features_batch(matches)
+        single = service.features(
+            *matches.iloc[3][["player_A_name", "player_B_name", *CONTEXT_COLUMNS]],
+            tourney_datetime=matches.iloc[3]["tourney_datetime"],
+        )
+
+        self.assertEqual(len(batch), 10)
+        self.assertEqual(list(batch.columns), service.columns)
+        np.testing.assert_array_equal(
+            batch.iloc[3][RATING_FEATURE_COLS].to_numpy(dtype=float),
+            [single[col] for col in RATING_FEATURE_COLS],
+        )
+
+    def test_unseen_players(self):
+        features = self.service(100).features(
+            "Nobody", "Nobody Else", "Clay", "R32", 3, "A", pd.Timestamp("2025-01-06")
+        )
+
+        self.assertTrue(np.isnan(features["player_A_avg_sets_A"]))
+        self.assertEqual(features["winner_elo"], RatingState.ELO_START)
+        self.assertEqual(features["elo_diff"], 0)
+        self.assertEqual(features["surface_Hard"], False)
+
+    def test_preview_closes_open_period(self):
+        weeks = self.data["tourney_datetime"].dt.to_period("W").array.asi8
+        n_first_week = int(np.argmax(weeks != weeks[0]))
+        service = self.service(n_first_week, glicko_period="W")
+        # Players of the first week meeting again weeks later, whose
+        # deviations widen over the weeks in between.
+        first_week = self.data.iloc[:n_first_week]
+        seen = np.r_[first_week["player_A_code"], first_week["player_B_code"]]
+        again = np.flatnonzero(
+            self.data["player_A_code"].isin(seen)
+            & self.data["player_B_code"].isin(seen)
+            & (weeks > weeks[n_first_week] + 1)
+        )
+        rows = [n_first_week, int(again[-1])]
+
+        preview = service.features_batch(self.match_columns(rows))
+
+        for i, row in enumerate(rows):
+            expected = compute_rating_features(
+                self.data.iloc[[row]], copy.deepcopy(service.rating_state)
+            )
+            np.testing.assert_allclose(
+                preview.iloc[i][RATING_FEATURE_COLS].to_numpy(dtype=float),
+                expected.iloc[0][RATING_FEATURE_COLS].to_numpy(dtype=float),
+            )
+
+        open_period = service.rating_state.preview(
+            self.data["player_A_code"].iloc[rows].to_numpy(),
+            self.data["player_B_code"].iloc[rows].to_numpy(),
+        )
+        self.assertFalse(
+            np.allclose(
+                preview[RATING_FEATURE_COLS].to_numpy(dtype=float), open_period
+            )
+        )
+
+    def test_save_load_and_update(self):
+        service = self.service(len(self.data) // 2)
+        with TemporaryDirectory() as tmp_dir:
+            service.save(Path(tmp_dir) / "service.pkl")
+            service = FeatureService.load(Path(tmp_dir) / "service.pkl")
+
+        service.update(self.data)
+        matches = self.match_columns([len(self.data) - 1])
+
+        np.testing.assert_allclose(
+            service.features_batch(matches)[RATING_FEATURE_COLS].to_numpy(dtype=float),
+            self.service(len(self.data))
+            .features_batch(matches)[RATING_FEATURE_COLS]
+            .to_numpy(dtype=float),
+        )
@@ -0,0 +1,116 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.config.load_type import LoaderType
+from src.config.output_format import OutputFormat
+from src.config.pipeline_config import PipelineConfig
+from src.loader.parquet_data_loader import ParquetDataLoader
+from src.sink import (
+    BaseDataSink,
+    CSVDataSink,
+    FeatherDataSink,
+    LoaderDataSink,
+    ParquetDataSink,
+)
+
+import numpy as np
+import pandas as pd
+
+
+class TestDataSink(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "tourney_datetime": pd.to_datetime(
+                    ["2023-01-02", "2023-06-05", "2024-01-01", "2024-03-04"]
+                ),
+                "player_A_name": pd.Categorical(["A", "B", "C", "D"]),
+                "player_A_ht": np.array([180, np.nan, 190, 185], dtype="float32"),
+                "surface_Hard": [True, False, True, True],
+            }
+        )
+
+    def test_from_config(self):
+        with TemporaryDirectory() as tmp_dir:
+            config = PipelineConfig(loader_type=LoaderType.CSV, dataset_path=tmp_dir)
+
+            self.assertIsInstance(BaseDataSink.from_config(config), LoaderDataSink)
+            for output_format, sink_type in [
+                (OutputFormat.CSV, CSVDataSink),
+                (OutputFormat.PARQUET, ParquetDataSink),
+                (OutputFormat.FEATHER, FeatherDataSink),
+            ]:
+                self.assertIsInstance(
+                    BaseDataSink.from_config(
+                        dict(config, output_format=output_format)
+                    ),
+                    sink_type,
+                )
+
+    def test_append_keeps_dtypes(self):
+        first, second = self.test_df.iloc[:2], self.test_df.iloc[2:]
+
+        for sink_type, read in [
+            (ParquetDataSink, pd.read_parquet),
+            (FeatherDataSink, pd.read_feather),
+        ]:
+            with TemporaryDirectory() as tmp_dir:
+                path = Path(tmp_dir) / "result" / "out"
+                with sink_type(output_compression="zstd") as sink:
+                    sink.write(first, path)
+                    sink.write(second, path, append=True)
+
+                result = read(path)
+
+            self.assertEqual(result["player_A_ht"].dtype, np.float32)
+            pd.testing.assert_frame_equal(
+                result.astype({"player_A_name": object}),
+                self.test_df.astype({"player_A_name": object}),
+            )
+
+    def test_sparse_columns(self):
+        sparse_df = self.test_df.astype({"surface_Hard": pd.SparseDtype(bool)})
+
+        with TemporaryDirectory() as tmp_dir:
+            for sink_type, read in [
+                (ParquetDataSink, pd.read_parquet),
+                (FeatherDataSink, pd.read_feather),
+            ]:
+                path = Path(tmp_dir) / sink_type.__name__
+                with sink_type() as sink:
+                    sink.write(sparse_df, path)
+
+                pd.testing.assert_frame_equal(
+                    read(path).astype({"player_A_name": object}),
+                    self.test_df.astype({"player_A_name": object}),
+                )
+
+            ParquetDataLoader(tmp_dir).save_data(sparse_df, f"{tmp_dir}/dataset")
+            result = ParquetDataLoader(f"{tmp_dir}/dataset").load_data()
+
+        self.assertEqual(result["surface_Hard"].tolist(), [True, False, True, True])
+
+    def test_partition_by_year(self):
+        with TemporaryDirectory() as tmp_dir:
+            with ParquetDataSink(output_partition_by_year=True) as sink:
+                sink.write(self.test_df, tmp_dir)
+                sink.write(self.test_df.iloc[3:], tmp_dir)
+
+            self.assertEqual(
+                sorted(path.name for path in Path(tmp_dir).iterdir()),
+                ["year=2023", "year=2024"],
+            )
+            result = ParquetDataLoader(
+                tmp_dir, **PipelineConfig(year_range=(2024, 2024))
+            ).load_data()
+
+        # The second write replaced the 2024 partition only.
+        self.assertEqual(result["player_A_name"].tolist(), ["D"])
+
+    def test_csv_creates_directory(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "result" / "out.csv"
+            CSVDataSink().write(self.test_df, path)
+
+            self.assertEqual(len(pd.read_csv(path)), len(self.test_df))
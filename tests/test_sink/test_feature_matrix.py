@@ -0,0 +1,57 @@
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.sink.feature_matrix import FeatureMatrixWriter, load_feature_matrix
+
+import numpy as np
+import pandas as pd
+
+
+class TestFeatureMatrix(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "player_A_name": pd.Categorical(["A", "B", "C", "D", "E"]),
+                "player_A_ht": np.array([0.1, np.nan, 0.5, 1.0, 0.0], "float32"),
+                "outcome": [1, 0, 0, 1, 1],
+                "tourney_datetime": pd.date_range("2024-01-01", periods=5),
+                "winner_elo": [1500.0, 1510.5, 1490.0, 1502.0, 1488.25],
+                "surface_Hard": [True, False, True, True, False],
+            }
+        )
+
+    def test_round_trip_in_chunks(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "result" / "features.npy"
+            with FeatureMatrixWriter(path) as writer:
+                writer.write(self.test_df.iloc[:2])
+                writer.write(self.test_df.iloc[2:], append=True)
+
+            features, target, columns = load_feature_matrix(path)
+
+            self.assertEqual(columns, ["player_A_ht", "winner_elo", "surface_Hard"])
+            self.assertIsInstance(features, np.memmap)
+            self.assertFalse(features.flags.writeable)
+            self.assertTrue(features.flags.c_contiguous)
+            self.assertEqual(features.dtype, np.float32)
+            np.testing.assert_array_equal(
+                features, self.test_df[columns].to_numpy(dtype=np.float32)
+            )
+            np.testing.assert_array_equal(target, self.test_df["outcome"])
+
+            with open(path.with_suffix(".json")) as f:
+                self.assertEqual(json.load(f)["shape"], [5, 3])
+
+            del features, target
+
+    def test_rewrite(self):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "features.npy"
+            with FeatureMatrixWriter(path) as writer:
+                writer.write(self.test_df)
+            with FeatureMatrixWriter(path) as writer:
+                writer.write(self.test_df.iloc[:1])
+
+            self.assertEqual(np.load(path).shape, (1, 3))
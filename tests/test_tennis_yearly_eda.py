@@ -0,0 +1,213 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase, mock
+
+import numpy as np
+import pandas as pd
+
+import tennis_yearly_eda
+from tennis_yearly_eda import TennisYearlyEDA, player_year_matrix, summarize_years
+
+
+def matches(year, n):
+    rng = np.random.default_rng(year)
+    players = ["Alcaraz", "Sinner", "Medvedev", "Zverev", "Rune"]
+    winners = rng.choice(players, n)
+
+    return pd.DataFrame(
+        {
+            "surface": rng.choice(["Hard", "Clay", "Grass"], n),
+            "tourney_level": rng.choice(["G", "M", "A"], n),
+            "minutes": np.where(
+                rng.random(n) < 0.1, np.nan, rng.integers(50, 300, n)
+            ),
+            "winner_name": winners,
+            "loser_name": [players[(players.index(w) + 1) % 5] for w in winners],
+        }
+    )
+
+
+class TestSummarizeYears(TestCase):
+    def test_matches_each_year_alone(self):
+        yearly_data = {2023: matches(2023, 200), 2024: matches(2024, 150)}
+        yearly_data[2024] = yearly_data[2024].drop(columns="tourney_level")
+
+        summaries = summarize_years(yearly_data)
+
+        for year, data in yearly_data.items():
+            summary = summaries[year]
+            self.assertEqual(summary["shape"], data.shape)
+            self.assertEqual(
+                summary["surface_counts"].to_dict(),
+                data["surface"].value_counts().to_dict(),
+            )
+            self.assertEqual(
+                list(summary["winner_counts"].index),
+                list(data["winner_name"].value_counts().head(10).index),
+            )
+            pd.testing.assert_series_equal(
+                summary["duration_stats"], data["minutes"].describe()
+            )
+            counts, edges = summary["duration_hist"]
+            expected_counts, expected_edges = np.histogram(
+                data["minutes"].dropna(), bins=tennis_yearly_eda.DURATION_BINS
+            )
+            np.testing.assert_array_equal(counts, expected_counts)
+            np.testing.assert_array_equal(edges, expected_edges)
+
+        self.assertEqual(
+            summaries[2023]["level_counts"].to_dict(),
+            yearly_data[2023]["tourney_level"].value_counts().to_dict(),
+        )
+        self.assertNotIn("level_counts", summaries[2024])
+
+
+class TestPlayerYearMatrix(TestCase):
+    def test_counts(self):
+        data = pd.concat(
+            [matches(2023, 200).assign(year=2023), matches(2024, 150).assign(year=2024)]
+        )
+
+        matrix = player_year_matrix(data)
+
+        for (result, col) in [("wins", "winner_name"), ("losses", "loser_name")]:
+            for year in [2023, 2024]:
+                expected = data.loc[data["year"] == year, col].value_counts()
+                self.assertEqual(
+                    matrix[result][year].loc[expected.index].to_dict(),
+                    expected.to_dict(),
+                )
+        self.assertEqual(matrix.values.sum(), 2 * len(data))
+
+
+class TestSummaryCache(TestCase):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp_dir.name)
+
+        self.data_dir = Path(tmp_dir.name) / "data"
+        self.data_dir.mkdir()
+        for year in [2023, 2024]:
+            matches(year, 100).to_csv(self.path(year), index=False)
+
+        self.summaries = self.eda().summarize_yearly_data([2023, 2024])
+
+    def path(self, year):
+        return self.data_dir / f"atp_matches_{year}.csv"
+
+    def eda(self):
+        return TennisYearlyEDA(self.data_dir, n_workers=1, cache_dir="cache")
+
+    def summarize(self):
+        read_csv = mock.patch.object(
+            tennis_yearly_eda.pd, "read_csv", wraps=pd.read_csv
+        )
+        digest = mock.patch.object(
+            tennis_yearly_eda, "file_digest", wraps=tennis_yearly_eda.file_digest
+        )
+        with read_csv as read, digest as hashed:
+            summaries = self.eda().summarize_yearly_data([2023, 2024])
+
+        return summaries, read, hashed
+
+    def assertSameSummary(self, summary, expected):
+        self.assertEqual(summary["shape"], expected["shape"])
+        pd.testing.assert_series_equal(
+            summary["surface_counts"], expected["surface_counts"]
+        )
+        np.testing.assert_array_equal(
+            summary["duration_hist"][0], expected["duration_hist"][0]
+        )
+
+    def test_unchanged_file_hits_without_read(self):
+        summaries, read, hashed = self.summarize()
+
+        read.assert_not_called()
+        hashed.assert_not_called()
+        for year in [2023, 2024]:
+            self.assertSameSummary(summaries[year], self.summaries[year])
+
+    def test_touched_file_hits_after_hashing(self):
+        stat = self.path(2023).stat()
+        os.utime(self.path(2023), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        summaries, read, hashed = self.summarize()
+
+        read.assert_not_called()
+        hashed.assert_called_once_with(self.path(2023))
+        self.assertSameSummary(summaries[2023], self.summaries[2023])
+
+        _, _, hashed = self.summarize()
+        hashed.assert_not_called()
+
+    def test_changed_file_recomputes_only_its_year(self):
+        matches(2000, 120).to_csv(self.path(2023), index=False)
+
+        summaries, read, _ = self.summarize()
+
+        read.assert_called_once_with(self.path(2023))
+        self.assertEqual(summaries[2023]["shape"], (120, 5))
+        self.assertSameSummary(summaries[2024], self.summaries[2024])
+
+        _, read, _ = self.summarize()
+        read.assert_not_called()
+
+    def test_loaded_year_not_cached(self):
+        eda = self.eda()
+        eda.load_yearly_data([2023])
+        matches(2000, 120).to_csv(self.path(2023), index=False)
+
+        summaries = eda.summarize_yearly_data([2023, 2024])
+        self.assertEqual(summaries[2023]["shape"], (100, 5))
+
+        summaries, read, _ = self.summarize()
+        read.assert_called_once_with(self.path(2023))
+        self.assertEqual(summaries[2023]["shape"], (120, 5))
+
+
+class TestCombinedAnalysis(TestCase):
+    def setUp(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tmp_dir.name)
+
+        data_dir = Path(tmp_dir.name) / "data"
+        data_dir.mkdir()
+        for year in [2022, 2023, 2024]:
+            matches(year, 100).to_csv(
+                data_dir / f"atp_matches_{year}.csv", index=False
+            )
+
+        self.eda = TennisYearlyEDA(data_dir, n_workers=1, cache_dir="cache")
+        self.eda.load_last_n_years(2)
+        self.data = self.eda.combined_data
+
+    def test_top_players_by_year(self):
+        wins = self.data["winner_name"].value_counts()
+
+        for result, col in [("wins", "winner_name"), ("losses", "loser_name")]:
+            by_year = self.eda.top_players_by_year(n=3, result=result)
+
+            self.assertEqual(list(by_year.index), [2023, 2024])
+            self.assertEqual(list(by_year.columns), list(wins.index[:3]))
+            for player in by_year.columns:
+                self.assertEqual(
+                    by_year[player].to_dict(),
+                    self.data[self.data[col] == player]
+                    .groupby("year")
+                    .size()
+                    .reindex([2023, 2024], fill_value=0)
+                    .to_dict(),
+                )
+
+    def test_analyze_combined_data_uses_top_players(self):
+        self.eda.analyze_combined_data()
+
+        summary = (
+            self.eda.base_output_dir / "combined_analysis" / "summary.txt"
+        ).read_text()
+        self.assertIn(self.eda.top_players_by_year(5).to_string(), summary)
@@ -0,0 +1,140 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.transformers.feature_transforms import DummyEncoder, FeatureScaler
+from src.transformers.transformers import (
+    create_dummy_variables,
+    scale_numerical_features,
+)
+
+import numpy as np
+import pandas as pd
+
+
+class TestDummyEncoder(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "surface": pd.Categorical(
+                    ["Hard", "Clay", "Grass", "Hard", "Clay", None]
+                ),
+                "level": ["G", "A", "A", "M", "D", "A"],
+                "best_of": pd.array([3, 5, 3, 3, 5, 3], dtype="Int8"),
+                "ht": [180.0, 190.0, 185.0, np.nan, 170.0, 200.0],
+            }
+        )
+        self.config = {
+            "standard_dummy_cols": ["surface", "best_of"],
+            "reduced_category_config": [("level", 1)],
+            "cols_to_drop": ["level"],
+        }
+
+    def test_matches_create_dummy_variables(self):
+        encoder = DummyEncoder(**self.config).fit(self.test_df)
+
+        pd.testing.assert_frame_equal(
+            encoder.transform(self.test_df),
+            create_dummy_variables(self.test_df, **self.config),
+        )
+        self.assertEqual(
+            encoder.feature_names,
+            ["surface_Grass", "surface_Hard", "best_of_5", "level_reduzido_Outros"],
+        )
+
+    def test_compact_dummies(self):
+        for options in [{"dtype": np.uint8}, {"dtype": np.uint8, "sparse": True}]:
+            encoder = DummyEncoder(**self.config, **options).fit(self.test_df)
+
+            pd.testing.assert_frame_equal(
+                encoder.transform(self.test_df),
+                create_dummy_variables(self.test_df, **self.config, **options),
+            )
+
+    def test_frozen_vocabulary(self):
+        encoder = DummyEncoder(**self.config).fit(self.test_df)
+
+        batch = pd.DataFrame(
+            {
+                "surface": ["Carpet", "Grass"],
+                "level": ["F", "A"],
+                "best_of": [5, 3],
+                "ht": [175.0, 188.0],
+            }
+        )
+        result = encoder.transform(batch)
+
+        self.assertEqual(list(result.columns), ["ht"] + encoder.feature_names)
+        self.assertEqual(
+            result[encoder.feature_names].values.tolist(),
+            [[False, False, True, True], [True, False, False, False]],
+        )
+
+    def test_partial_fit(self):
+        encoder = DummyEncoder(**self.config)
+        encoder.partial_fit(self.test_df.iloc[:3]).partial_fit(self.test_df.iloc[3:])
+
+        expected = DummyEncoder(**self.config).fit(self.test_df)
+        self.assertEqual(encoder.categories, expected.categories)
+
+    def test_partial_fit_ties(self):
+        test_df = self.test_df.assign(level=["M", "D", "A", "A", "M", "D"])
+        encoder = DummyEncoder(**self.config)
+        for start in range(0, len(test_df), 2):
+            encoder.partial_fit(test_df.iloc[start : start + 2])
+
+        expected = DummyEncoder(**self.config).fit(test_df)
+        self.assertEqual(encoder.categories, expected.categories)
+        self.assertEqual(expected.categories["level"], ["A", "Outros"])
+        pd.testing.assert_frame_equal(
+            expected.transform(test_df),
+            create_dummy_variables(test_df, **self.config),
+        )
+
+    def test_save_load(self):
+        encoder = DummyEncoder(**self.config).fit(self.test_df)
+
+        with TemporaryDirectory() as tmp_dir:
+            encoder.save(Path(tmp_dir) / "encoder.pkl")
+            loaded = DummyEncoder.load(Path(tmp_dir) / "encoder.pkl")
+
+        pd.testing.assert_frame_equal(
+            loaded.transform(self.test_df), encoder.transform(self.test_df)
+        )
+
+    def test_not_fitted(self):
+        with self.assertRaises(RuntimeError):
+            DummyEncoder(**self.config).transform(self.test_df)
+
+
+class TestFeatureScaler(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "ht": np.array([180.0, 190.0, np.nan, 170.0], dtype="float32"),
+                "age": [20.0, 30.0, 25.0, 35.0],
+                "name": ["a", "b", "c", "d"],
+            }
+        )
+
+    def test_matches_scale_numerical_features(self):
+        scaler = FeatureScaler(["ht", "age"]).fit(self.test_df)
+
+        pd.testing.assert_frame_equal(
+            scaler.transform(self.test_df),
+            scale_numerical_features(self.test_df, ["ht", "age"]),
+        )
+
+    def test_save_load(self):
+        scaler = FeatureScaler(["ht", "age"])
+        scaler.partial_fit(self.test_df.iloc[:2]).partial_fit(self.test_df.iloc[2:])
+
+        with TemporaryDirectory() as tmp_dir:
+            scaler.save(Path(tmp_dir) / "scaler.pkl")
+            loaded = FeatureScaler.load(Path(tmp_dir) / "scaler.pkl")
+
+        result = loaded.transform(self.test_df.iloc[:1])
+
+        self.assertAlmostEqual(result["ht"].iloc[0], 0.5)
+        self.assertAlmostEqual(result["age"].iloc[0], 0.0)
+        self.assertEqual(self.test_df["ht"].iloc[0], 180.0)
@@ -0,0 +1,373 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.loader.csv_data_loader import CSVDataLoader
+from src.source_parser.tennis_match_parser import TennisMatchParser
+from src.transformers.player_stats import PlayerStatsState
+from src.transformers.ratings import RatingState, glicko_period_update
+from src.transformers.transformers import (
+    compute_rating_features,
+    compute_score_features,
+    count_dummy_values,
+    create_dummy_variables,
+    extract_score_features,
+    finalize_tennis_model_data,
+    fit_dummy_categories,
+    invert_winner_loser_names,
+)
+
+import numpy as np
+import pandas as pd
+import trueskill
+from glicko2 import Player as Glicko2Player
+
+
+class TestScoreFeatures(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "score": [
+                    "7-6(5) 6-4",
+                    "4-6 6-3 7-6(0)",
+                    "6-4 2-1 RET",
+                    "W/O",
+                    None,
+                    "6-7(3) 7-6(4) [10-8]",
+                    "DEF",
+                    "6-3  3-6 7-5 ",
+                ],
+                "outcome": [1, 0, 0, 0, 1, 0, 1, 0],
+            },
+            index=[10, 11, 12, 13, 14, 15, 16, 17],
+        )
+
+    def test_matches_row_wise(self):
+        expected = self.test_df.apply(
+            extract_score_features, axis=1, result_type="expand"
+        )
+
+        result = compute_score_features(self.test_df)
+
+        pd.testing.assert_frame_equal(
+            result.drop(columns="score"),
+            expected.drop(columns="score"),
+            check_dtype=False,
+        )
+        self.assertEqual(
+            result["score"].fillna("").tolist(), expected["score"].fillna("").tolist()
+        )
+
+    def test_walkover(self):
+        result = compute_score_features(self.test_df)
+
+        self.assertEqual(result["is_walkover"].tolist(), [0, 0, 0, 1, 1, 0, 0, 0])
+        self.assertTrue(result.loc[[13, 14], "sets_A"].isna().all())
+
+
+class TestInvertWinnerLoserNames(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "winner_name": [f"W{i}" for i in range(10)],
+                "loser_name": [f"L{i}" for i in range(10)],
+                "w_ace": range(10),
+                "l_ace": range(10, 20),
+                "outcome": 1,
+            }
+        )
+
+    def test_swaps_half(self):
+        result = invert_winner_loser_names(self.test_df.copy(), random_state=0)
+
+        swapped = result["outcome"] == 0
+        self.assertEqual(swapped.sum(), 5)
+        self.assertTrue(result.loc[swapped, "player_A_name"].str.startswith("L").all())
+        self.assertTrue(result.loc[~swapped, "player_A_name"].str.startswith("W").all())
+        self.assertTrue((result.loc[swapped, "player_A_ace"] >= 10).all())
+        self.assertTrue((result.loc[swapped, "player_B_ace"] < 10).all())
+
+    def test_random_state(self):
+        first = invert_winner_loser_names(self.test_df.copy(), random_state=42)
+        second = invert_winner_loser_names(self.test_df.copy(), random_state=42)
+
+        pd.testing.assert_frame_equal(first, second)
+
+
+class TestRatingFeatures(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "atp_matches_2024.csv"
+            path.write_bytes(Path("dataset/raw/atp_matches_2024.csv").read_bytes())
+            data = CSVDataLoader(tmp_dir).load_data()
+
+        data = TennisMatchParser(data).process()
+        cls.data = invert_winner_loser_names(data, random_state=0)
+
+    def test_incremental_matches_full_replay(self):
+        expected = compute_rating_features(self.data)
+
+        split = len(self.data) // 2
+        state = RatingState()
+        first = compute_rating_features(self.data.iloc[:split], state)
+
+        with TemporaryDirectory() as tmp_dir:
+            state.save(Path(tmp_dir) / "ratings.pkl")
+            state = RatingState.load(Path(tmp_dir) / "ratings.pkl")
+
+        second = compute_rating_features(self.data, state)
+
+        self.assertEqual(len(second), len(self.data) - split)
+        pd.testing.assert_frame_equal(
+            pd.concat([first, second], ignore_index=True), expected
+        )
+
+    def test_codes_match_names(self):
+        by_name = self.data.drop(columns=["player_A_code", "player_B_code"])
+
+        pd.testing.assert_frame_equal(
+            compute_rating_features(self.data), compute_rating_features(by_name)
+        )
+
+    def test_up_to_date_state_processes_nothing(self):
+        state = RatingState()
+        compute_rating_features(self.data, state)
+
+        self.assertTrue(compute_rating_features(self.data, state).empty)
+
+    def test_matches_reference_libraries(self):
+        ts_env = trueskill.TrueSkill()
+        a, b = Glicko2Player(), Glicko2Player()
+        ta, tb = ts_env.create_rating(), ts_env.create_rating()
+
+        state = RatingState()
+        ids = state.player_ids(["a", "b"])
+        for result in [1, 0, 0, 1, 1]:
+            state.rate(ids[:1], ids[1:], np.array([result]))
+
+            a.update_player([b.rating], [b.rd], [result])
+            b.update_player([a.rating], [a.rd], [1 - result])
+            if result == 1:
+                ta, tb = ts_env.rate_1vs1(ta, tb)
+            else:
+                tb, ta = ts_env.rate_1vs1(tb, ta)
+
+        out = state.rate(ids[:1], ids[1:], np.array([1]))[0]
+        self.assertEqual(out[4], a.rating)
+        self.assertEqual(out[5], a.rd)
+        self.assertEqual(out[6], b.rating)
+        self.assertEqual(out[10], ta.mu)
+        self.assertEqual(out[13], tb.sigma)
+        self.assertEqual(out[14], ts_env.quality_1vs1(ta, tb))
+
+    def test_matches_reference_libraries_on_season(self):
+        matches = self.data.iloc[:800]
+        features = compute_rating_features(matches)
+
+        ts_env = trueskill.TrueSkill()
+        glicko, ts = {}, {}
+        expected = []
+        for a, b, result in zip(
+            matches["player_A_code"], matches["player_B_code"], matches["outcome"]
+        ):
+            # Players keep arriving all along the season.
+            ga = glicko.setdefault(a, Glicko2Player())
+            gb = glicko.setdefault(b, Glicko2Player())
+            ta = ts.setdefault(a, ts_env.create_rating())
+            tb = ts.setdefault(b, ts_env.create_rating())
+            expected.append(
+                [ga.rating, ga.rd, gb.rating, gb.rd, ta.mu, ta.sigma, tb.mu, tb.sigma]
+            )
+
+            ga.update_player([gb.rating], [gb.rd], [result])
+            gb.update_player([ga.rating], [ga.rd], [1 - result])
+            if result == 1:
+                ts[a], ts[b] = ts_env.rate_1vs1(ta, tb)
+            else:
+                ts[b], ts[a] = ts_env.rate_1vs1(tb, ta)
+
+        self.assertGreater(len(glicko), 200)
+        np.testing.assert_allclose(
+            features[
+                [
+                    "winner_glicko",
+                    "winner_glicko_rd",
+                    "loser_glicko",
+                    "loser_glicko_rd",
+                    "winner_ts_mu",
+                    "winner_ts_sigma",
+                    "loser_ts_mu",
+                    "loser_ts_sigma",
+                ]
+            ].to_numpy(),
+            np.array(expected),
+            rtol=1e-12,
+        )
+
+    def test_periods_incremental_matches_full_replay(self):
+        expected = compute_rating_features(self.data, RatingState("W"))
+
+        split = len(self.data) // 3
+        state = RatingState("W")
+        first = compute_rating_features(self.data.iloc[:split], state)
+
+        with TemporaryDirectory() as tmp_dir:
+            state.save(Path(tmp_dir) / "ratings.pkl")
+            state = RatingState.load(Path(tmp_dir) / "ratings.pkl")
+
+        second = compute_rating_features(self.data, state)
+
+        pd.testing.assert_frame_equal(
+            pd.concat([first, second], ignore_index=True), expected
+        )
+
+    def test_periods_leave_other_systems_unchanged(self):
+        per_match = compute_rating_features(self.data)
+        per_week = compute_rating_features(self.data, RatingState("W"))
+        glicko = [col for col in per_match.columns if "glicko" in col]
+
+        pd.testing.assert_frame_equal(
+            per_week.drop(columns=glicko), per_match.drop(columns=glicko)
+        )
+        self.assertFalse(per_week[glicko].equals(per_match[glicko]))
+
+    def test_glicko_period_update_matches_glickman_example(self):
+        scale = 173.7178
+        ratings = np.array([1500, 1400, 1550, 1700])
+        rds = np.array([200, 30, 100, 300])
+
+        mu, rd, vol = glicko_period_update(
+            (ratings - 1500) / scale,
+            rds / scale,
+            np.full(4, 0.06),
+            np.array([0, 0, 0]),
+            np.array([1, 2, 3]),
+            np.array([1.0, 0.0, 0.0]),
+        )
+
+        self.assertAlmostEqual(mu[0] * scale + 1500, 1464.06, places=1)
+        self.assertAlmostEqual(rd[0] * scale, 151.52, places=1)
+        self.assertAlmostEqual(vol[0], 0.05999, places=4)
+
+
+class TestPlayerStatsState(TestCase):
+    def setUp(self):
+        self.players = ["a", "b", "a", "c", "b", "a", "c", "a"] * 3
+        self.values = np.array(
+            [[1.0, 2.0], [3.0, np.nan], [np.nan, 4.0], [5.0, 6.0]] * 6
+        )
+
+    def _expected(self, window):
+        return (
+            pd.DataFrame(self.values)
+            .groupby(self.players)
+            .transform(lambda x: window(x).mean().shift())
+            .to_numpy()
+        )
+
+    def test_matches_pandas_windows(self):
+        result = PlayerStatsState(
+            ["x", "y"], last_n=[3], halflives=[2]
+        ).running_means(self.players, self.values)
+
+        self.assertEqual(list(result), ["avg", "avg_last3", "avg_ewm2"])
+        np.testing.assert_array_equal(
+            result["avg"], self._expected(lambda x: x.expanding())
+        )
+        np.testing.assert_array_equal(
+            result["avg_last3"],
+            self._expected(lambda x: x.rolling(3, min_periods=1)),
+        )
+        np.testing.assert_allclose(
+            result["avg_ewm2"], self._expected(lambda x: x.ewm(halflife=2))
+        )
+
+    def test_chunks_match_single_pass(self):
+        expected = PlayerStatsState(
+            ["x", "y"], last_n=[3], halflives=[2]
+        ).running_means(self.players, self.values)
+
+        state = PlayerStatsState(["x", "y"], last_n=[3], halflives=[2])
+        chunks = [
+            state.running_means(self.players[lo:hi], self.values[lo:hi])
+            for lo, hi in [(0, 3), (3, 4), (4, 17), (17, 24)]
+        ]
+
+        for window, values in expected.items():
+            np.testing.assert_array_equal(
+                np.vstack([chunk[window] for chunk in chunks]), values
+            )
+
+    def test_save_load(self):
+        expected = PlayerStatsState(
+            ["x", "y"], last_n=[3], halflives=[2]
+        ).running_means(self.players, self.values)
+
+        state = PlayerStatsState(["x", "y"], last_n=[3], halflives=[2])
+        first = state.running_means(self.players[:10], self.values[:10])
+        with TemporaryDirectory() as tmp_dir:
+            state.save(Path(tmp_dir) / "stats.pkl")
+            state = PlayerStatsState.load(Path(tmp_dir) / "stats.pkl")
+        second = state.running_means(self.players[10:], self.values[10:])
+
+        for window, values in expected.items():
+            np.testing.assert_array_equal(
+                np.vstack([first[window], second[window]]), values
+            )
+
+
+class TestDummyVariables(TestCase):
+    def setUp(self):
+        self.test_df = pd.DataFrame(
+            {
+                "surface": ["Hard", "Clay", "Grass", "Hard", "Clay", "Hard"],
+                "level": ["G", "A", "A", "M", "D", "A"],
+            }
+        )
+        self.config = {
+            "standard_dummy_cols": ["surface"],
+            "reduced_category_config": [("level", 1)],
+        }
+
+    def test_fixed_categories_match_full_frame(self):
+        expected = create_dummy_variables(self.test_df, **self.config)
+
+        counts = count_dummy_values(self.test_df.iloc[:3], **self.config)
+        counts = count_dummy_values(self.test_df.iloc[3:], counts=counts, **self.config)
+        categories = fit_dummy_categories(counts, **self.config)
+
+        result = pd.concat(
+            [
+                create_dummy_variables(
+                    self.test_df.iloc[:2], categories=categories, **self.config
+                ),
+                create_dummy_variables(
+                    self.test_df.iloc[2:], categories=categories, **self.config
+                ),
+            ]
+        )
+
+        pd.testing.assert_frame_equal(result, expected)
+
+
+class TestFinalizeModelData(TestCase):
+    def test_aligns_on_match_id(self):
+        data = pd.DataFrame(
+            {
+                "match_id": [10, 11, 12],
+                "player_A_name": ["a", "b", "c"],
+                "outcome": [1, 0, 1],
+            }
+        )
+        df_model = pd.DataFrame(
+            {"match_id": [12, 10, 11], "player_A_avg_sets_A": [3.0, 1.0, 2.0]}
+        )
+        df_features = pd.DataFrame({"match_id": [11, 12], "winner_elo": [5.0, 6.0]})
+
+        result = finalize_tennis_model_data(data, df_model, df_features)
+
+        self.assertEqual(result["player_A_name"].tolist(), ["a", "b", "c"])
+        self.assertEqual(result["player_A_avg_sets_A"].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(result["winner_elo"].tolist()[1:], [5.0, 6.0])
+        self.assertTrue(np.isnan(result["winner_elo"].iloc[0]))
@@ -0,0 +1,56 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from src.config.dataset_type import DatasetType
+from src.config.match_schema import ATP_MATCH_FILE_CONFIG
+from src.loader import CSVDataLoader
+from src.source_parser._base_parser import BaseDataParser
+from tests.utils.generate_test_data import (
+    ATP_COLUMNS,
+    MATCHES_PER_SEASON,
+    generate_test_data,
+    write_test_data,
+)
+
+
+class TestGenerateTestData(TestCase):
+    def test_shape(self):
+        test_df = generate_test_data(years=(2020, 2021))
+
+        self.assertEqual(list(test_df.columns), ATP_COLUMNS)
+        self.assertTrue(test_df["tourney_date"].is_monotonic_increasing)
+        self.assertEqual(set(test_df["tourney_date"] // 10000), {2020, 2021})
+        self.assertAlmostEqual(len(test_df) / 2, MATCHES_PER_SEASON, delta=500)
+        self.assertFalse((test_df["winner_id"] == test_df["loser_id"]).any())
+        self.assertTrue((test_df["score"] == "W/O").any())
+        self.assertTrue(test_df["score"].str.endswith(" RET").any())
+
+    def test_scale(self):
+        small = generate_test_data(scale=1, years=(2020, 2020))
+        large = generate_test_data(scale=10, years=(2020, 2020))
+
+        self.assertAlmostEqual(len(large) / len(small), 10, delta=1)
+        self.assertEqual(large["winner_rank"].min(), 1)
+
+    def test_reproducible(self):
+        first = generate_test_data(years=(2020, 2020), seed=1)
+        second = generate_test_data(years=(2020, 2020), seed=1)
+
+        self.assertTrue(first.equals(second))
+
+    def test_write_and_parse(self):
+        with TemporaryDirectory() as tmp_dir:
+            files = write_test_data(tmp_dir, years=(2020, 2021))
+            config = {
+                "dataset_type": DatasetType.TENNIS_MATCH,
+                "file_config": ATP_MATCH_FILE_CONFIG,
+            }
+            test_df = CSVDataLoader(tmp_dir, **config).process()
+
+        parsed = BaseDataParser.from_config(test_df, config).process()
+
+        self.assertEqual(
+            [file.name for file in files],
+            ["atp_matches_2020.csv", "atp_matches_2021.csv"],
+        )
+        self.assertEqual(len(parsed), len(test_df))
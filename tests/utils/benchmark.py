@@ -0,0 +1,264 @@
+"""
+Benchmark the loaders and transformers on synthetic data.
+
+Every scale is a multiple of the real history (see ``generate_test_data``).
+Results are saved as ``<output>/<commit>.json`` so runs of two commits can be
+compared::
+
+    python -m tests.utils.benchmark --scales 1 10
+    python -m tests.utils.benchmark --compare dataset/benchmarks/<old>.json
+
+Scale 100 holds about 13 million matches in memory at once; narrow it with
+``--years`` on smaller machines.
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import subprocess
+from tempfile import TemporaryDirectory
+
+import pandas as pd
+
+from src.config.dataset_type import DatasetType
+from src.config.match_schema import ATP_MATCH_FILE_CONFIG
+from src.config.output_format import OutputFormat
+from src.loader import CSVDataLoader, DBDataLoader, ParquetDataLoader
+from src.metrics.stage_metrics import StageMetrics
+from src.pipeline import DUMMY_CONFIG, SCALE_COLUMNS
+from src.sink import BaseDataSink
+from src.source_parser._base_parser import BaseDataParser
+from src.transformers.player_stats import PlayerStatsState
+from src.transformers.ratings import RatingState
+from src.transformers.transformers import (
+    PLAYER_STATS_COLS,
+    compute_rating_features,
+    compute_score_features,
+    create_dummy_variables,
+    extract_score_features,
+    finalize_tennis_model_data,
+    invert_winner_loser_names,
+    inverter_scores_df,
+    prepare_tennis_model_data,
+    scale_numerical_features,
+)
+from tests.utils.generate_test_data import HISTORY_YEARS, write_test_data
+
+
+# extract_score_features works on one row at a time, so it only gets a
+# sample of the matches.
+ROW_SAMPLE = 10_000
+
+
+def run_benchmarks(
+    scales: list[float],
+    years: tuple[int, int] = HISTORY_YEARS,
+    seed: int = 0,
+) -> dict:
+    """
+    Time the loaders and every transformer at each scale.
+
+    Args:
+        scales: Multiples of the real history to benchmark
+        years: First and last season of the synthetic data
+        seed: Seed of the synthetic data and of the winner/loser swap
+
+    Returns:
+        Metrics report with one entry per stage and scale
+    """
+    metrics = StageMetrics()
+    for scale in scales:
+        with TemporaryDirectory() as tmp_dir:
+            _benchmark_scale(metrics, scale, years, seed, Path(tmp_dir))
+
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "scales": list(scales),
+        "years": list(years),
+        **metrics.report(),
+    }
+
+
+def _benchmark_scale(
+    metrics: StageMetrics,
+    scale: float,
+    years: tuple[int, int],
+    seed: int,
+    tmp_dir: Path,
+) -> None:
+    """Record the stages of one scale in ``metrics``."""
+    config = {
+        "dataset_type": DatasetType.TENNIS_MATCH,
+        "file_config": ATP_MATCH_FILE_CONFIG,
+    }
+
+    def track(stage, fn, inputs=(), **labels):
+        return metrics.track(stage, fn, inputs=inputs, scale=scale, **labels)
+
+    csv_dir = tmp_dir / "csv"
+    track("generate", lambda: write_test_data(csv_dir, scale, years, seed))
+    raw = track("load_csv", CSVDataLoader(csv_dir, **config).load_data)
+
+    parquet_dir = tmp_dir / "parquet"
+    parquet_dir.mkdir()
+    db_path = tmp_dir / "matches.db"
+    db_path.touch()
+
+    for name, loader in [
+        ("load_parquet", ParquetDataLoader(parquet_dir, **config)),
+        ("load_db", DBDataLoader(db_path, **config)),
+    ]:
+        loader.save_data(raw, str(loader.dataset_path))
+        track(name, loader.load_data)
+
+    data = track(
+        "parse",
+        lambda: BaseDataParser.from_config(raw, config).process(),
+        inputs=[raw],
+    )
+    del raw
+
+    data = track(
+        "invert_winner_loser_names",
+        lambda: invert_winner_loser_names(data, random_state=seed),
+        inputs=[data],
+    )
+    data = track("inverter_scores_df", lambda: inverter_scores_df(data), inputs=[data])
+
+    df_features = track(
+        "compute_rating_features",
+        lambda: compute_rating_features(data, RatingState()),
+        inputs=[data],
+    )
+    score_feats = track(
+        "compute_score_features", lambda: compute_score_features(data), inputs=[data]
+    )
+
+    sample = data.head(ROW_SAMPLE)
+    track(
+        "extract_score_features",
+        lambda: pd.DataFrame(list(sample.apply(extract_score_features, axis=1))),
+        inputs=[sample],
+    )
+
+    df_model = track(
+        "prepare_tennis_model_data",
+        lambda: prepare_tennis_model_data(
+            data, score_feats, PlayerStatsState(PLAYER_STATS_COLS)
+        ),
+        inputs=[data, score_feats],
+    )
+    df_model_feats = track(
+        "finalize_tennis_model_data",
+        lambda: finalize_tennis_model_data(data, df_model, df_features),
+        inputs=[data, df_model, df_features],
+    )
+    df_dummies = track(
+        "create_dummy_variables",
+        lambda: create_dummy_variables(df=df_model_feats, **DUMMY_CONFIG),
+        inputs=[df_model_feats],
+    )
+    df_scaled = track(
+        "scale_numerical_features",
+        lambda: scale_numerical_features(df_dummies, SCALE_COLUMNS),
+        inputs=[df_dummies],
+    )
+
+    for output_format in OutputFormat:
+        with BaseDataSink.from_config({"output_format": output_format}) as sink:
+            track(
+                f"save_{output_format.value}",
+                lambda: sink.write(df_scaled, tmp_dir / f"out.{output_format.value}"),
+                inputs=[df_scaled],
+            )
+
+
+def compare(old: dict, new: dict) -> pd.DataFrame:
+    """
+    Compare the wall time of two benchmark reports.
+
+    Args:
+        old: Report of the baseline run
+        new: Report of the run to compare
+
+    Returns:
+        DataFrame indexed by stage and scale with both wall times and their
+        ratio, for the stages present in both reports
+    """
+
+    def wall_times(report):
+        return (
+            pd.DataFrame(report["stages"])
+            .groupby(["stage", "scale"], sort=False)["wall_s"]
+            .sum()
+        )
+
+    times = pd.concat(
+        {"old_s": wall_times(old), "new_s": wall_times(new)}, axis=1, join="inner"
+    )
+    times["speedup"] = times["old_s"] / times["new_s"]
+
+    return times
+
+
+def _git_commit() -> str:
+    """
+    Short hash of the checked out commit, marked when the tree has changes.
+
+    Returns:
+        Commit hash, or ``"unknown"`` outside a git repository
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return f"{commit}-dirty" if dirty else commit
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 10])
+    parser.add_argument("--years", type=int, nargs=2, default=list(HISTORY_YEARS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="dataset/benchmarks")
+    parser.add_argument("--compare", help="Report of a previous run to compare with")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.scales, tuple(args.years), args.seed)
+
+    path = Path(args.output) / f"{report['commit']}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Saved benchmark results to {path}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(json.load(f), report).to_string(float_format="%.3f"))
+    else:
+        print(
+            pd.DataFrame(report["stages"])
+            .set_index(["stage", "scale"])[["wall_s", "cpu_s", "rss_peak_bytes"]]
+            .to_string(float_format="%.3f")
+        )
+
+
+if __name__ == "__main__":
+    main()
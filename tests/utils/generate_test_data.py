@@ -1,6 +1,476 @@
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
 import pandas as pd
 
+from src.config.match_schema import ATP_MATCH_SCHEMA
+
+
+# Shape of the real history in dataset/raw, which scale 1 reproduces.
+HISTORY_YEARS = (1985, 2024)
+MATCHES_PER_SEASON = 3240
+PLAYERS = 4250
+
+# Column order of the ATP match files.
+ATP_COLUMNS = [
+    "tourney_id",
+    "tourney_name",
+    "surface",
+    "draw_size",
+    "tourney_level",
+    "tourney_date",
+    "match_num",
+    *[
+        f"{side}_{col}"
+        for side in ["winner", "loser"]
+        for col in ["id", "seed", "entry", "name", "hand", "ht", "ioc", "age"]
+    ],
+    "score",
+    "best_of",
+    "round",
+    "minutes",
+    *[
+        f"{side}_{col}"
+        for side in ["w", "l"]
+        for col in [
+            "ace",
+            "df",
+            "svpt",
+            "1stIn",
+            "1stWon",
+            "2ndWon",
+            "SvGms",
+            "bpSaved",
+            "bpFaced",
+        ]
+    ],
+    "winner_rank",
+    "winner_rank_points",
+    "loser_rank",
+    "loser_rank_points",
+]
+
+# Tournament levels with their draw size, best-of and share of tournaments.
+LEVELS = [
+    ("G", 128, 5, 0.03),
+    ("M", 64, 3, 0.06),
+    ("A", 32, 3, 0.66),
+    ("D", 4, 5, 0.25),
+]
+SURFACES = (["Hard", "Clay", "Grass", "Carpet"], [0.48, 0.34, 0.10, 0.08])
+HANDS = (["R", "L", "U"], [0.85, 0.14, 0.01])
+ENTRIES = (["Q", "WC", "LL", "PR"], [0.6, 0.3, 0.07, 0.03])
+IOCS = ["USA", "ESP", "FRA", "ARG", "ITA", "GER", "AUS", "GBR", "SWE", "CZE"]
+ROUNDS = {128: "R128", 64: "R64", 32: "R32", 16: "R16", 8: "QF", 4: "SF", 2: "F"}
+
+# Sets won by the winner of the set, as (games won, games lost) and weights.
+SET_SCORES = [(6, 0), (6, 1), (6, 2), (6, 3), (6, 4), (7, 5), (7, 6)]
+SET_WEIGHTS = [0.04, 0.1, 0.17, 0.21, 0.22, 0.11, 0.15]
+
+# Serve statistics are only recorded from this season on.
+STATS_SINCE = 1991
+WALKOVER_RATE = 0.004
+RETIREMENT_RATE = 0.024
+
+
+def generate_test_data(
+    scale: float = 1.0, years: tuple[int, int] = HISTORY_YEARS, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generate synthetic ATP matches shaped like the real history.
+
+    Args:
+        scale: Multiple of the number of matches and players of the real
+            history
+        years: First and last season, inclusive
+        seed: Seed of the random generator
+
+    Returns:
+        DataFrame with the columns of the ATP match files
+    """
+    return pd.concat(iter_test_seasons(scale, years, seed), ignore_index=True)
+
+
+def write_test_data(
+    path: str | Path,
+    scale: float = 1.0,
+    years: tuple[int, int] = HISTORY_YEARS,
+    seed: int = 0,
+) -> list[Path]:
+    """
+    Write synthetic ATP matches as one ``atp_matches_YYYY.csv`` per season.
+
+    Seasons are generated and written one at a time, so large scales do not
+    have to fit in memory.
+
+    Args:
+        path: Directory where to write the files
+        scale: Multiple of the number of matches and players of the real
+            history
+        years: First and last season, inclusive
+        seed: Seed of the random generator
+
+    Returns:
+        Paths of the written files
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    files = []
+    for season in iter_test_seasons(scale, years, seed):
+        file = path / f"atp_matches_{season['tourney_date'].iloc[0] // 10000}.csv"
+        season.to_csv(file, index=False)
+        files.append(file)
+
+    return files
+
+
+def iter_test_seasons(
+    scale: float = 1.0, years: tuple[int, int] = HISTORY_YEARS, seed: int = 0
+) -> Iterator[pd.DataFrame]:
+    """
+    Generate synthetic ATP matches one season at a time.
+
+    A pool of players with a skill, a career span and fixed attributes is
+    drawn once. Every season is a calendar of single-elimination
+    tournaments between the players active that season, where the more
+    skilled player is more likely to win. Scores, walkovers, retirements,
+    serve statistics, seeds and rankings follow the rates of the real files.
+
+    Args:
+        scale: Multiple of the number of matches and players of the real
+            history
+        years: First and last season, inclusive
+        seed: Seed of the random generator
+
+    Yields:
+        DataFrame with the matches of one season, ordered by date
+    """
+    rng = np.random.default_rng(seed)
+    first_year, last_year = years
+    players = _player_pool(rng, round(PLAYERS * scale), first_year, last_year)
+
+    levels, draws, best_ofs, shares = map(np.array, zip(*LEVELS))
+    n_tourneys = round(
+        MATCHES_PER_SEASON * scale / (shares * (draws - 1)).sum()
+    )
+    # Tournaments keep their level, surface and week across seasons.
+    slot_level = rng.choice(len(LEVELS), n_tourneys, p=shares)
+    slot_surface = rng.choice(SURFACES[0], n_tourneys, p=SURFACES[1])
+    slot_week = np.sort(rng.integers(0, 48, n_tourneys))
+
+    for year in range(first_year, last_year + 1):
+        active = np.flatnonzero(
+            (players["debut"] <= year) & (players["retire"] >= year)
+        )
+        # Ranks are relative to the size of the real tour, so they keep the
+        # same range at every scale.
+        by_skill = active[np.argsort(-players["skill"][active])]
+        rank = np.zeros(len(players["skill"]), dtype=np.int64)
+        rank[by_skill] = (np.arange(len(by_skill)) // max(scale, 1)).astype(int) + 1
+
+        matches = []
+        for level in range(len(LEVELS)):
+            slots = np.flatnonzero(slot_level == level)
+            draw = draws[level]
+            if not len(slots) or len(active) < draw:
+                continue
+
+            entrants = np.stack(
+                [rng.choice(active, draw, replace=False) for _ in slots]
+            )
+            matches.append(
+                _play_draws(rng, players["skill"], rank, entrants)
+                .assign(
+                    slot=lambda df: slots[df["draw"]],
+                    tourney_level=levels[level],
+                    draw_size=draw,
+                    best_of=best_ofs[level],
+                )
+                .drop(columns="draw")
+            )
+
+        season = pd.concat(matches, ignore_index=True)
+        yield _season_frame(rng, year, season, players, rank, slot_surface, slot_week)
+
+
+def _player_pool(
+    rng: np.random.Generator, n_players: int, first_year: int, last_year: int
+) -> dict[str, np.ndarray]:
+    """
+    Draw the players of the whole history.
+
+    Careers last seven seasons on average and start so that the number of
+    active players is roughly constant over the seasons.
+
+    Returns:
+        Mapping of attribute to an array with one value per player
+    """
+    debut = rng.integers(first_year - 8, last_year + 1, n_players)
+    ht = np.round(rng.normal(185, 7, n_players))
+    ht[rng.random(n_players) < 0.03] = np.nan
+
+    return {
+        "id": 100_000 + np.arange(n_players),
+        "name": np.array([f"Player {i:06d}" for i in range(n_players)], dtype=object),
+        "skill": rng.normal(0, 1, n_players),
+        "debut": debut,
+        "retire": debut + rng.geometric(1 / 7, n_players) - 1,
+        "birth": debut - rng.normal(19, 2, n_players),
+        "hand": rng.choice(HANDS[0], n_players, p=HANDS[1]),
+        "ht": ht,
+        "ioc": rng.choice(IOCS, n_players),
+    }
+
+
+def _play_draws(
+    rng: np.random.Generator,
+    skill: np.ndarray,
+    rank: np.ndarray,
+    entrants: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Play single-elimination draws, one round at a time for all of them.
+
+    Args:
+        rng: Random generator
+        skill: Skill of every player
+        rank: Rank of every player this season
+        entrants: Array of shape ``(n_draws, draw_size)`` with player indexes
+
+    Returns:
+        DataFrame with one row per match: draw, match number, round, winner,
+        loser and the seeds of both players
+    """
+    n_draws, draw_size = entrants.shape
+
+    # The best ranked quarter of each draw is seeded.
+    order = np.argsort(rank[entrants], axis=1, kind="stable")
+    seeds = np.full(entrants.shape, np.nan)
+    n_seeds = max(draw_size // 4, 1) if draw_size > 4 else 0
+    np.put_along_axis(
+        seeds, order[:, :n_seeds], np.arange(1, n_seeds + 1, dtype=float), axis=1
+    )
+
+    rounds = []
+    remaining, remaining_seeds = entrants, seeds
+    match_num = 0
+    while remaining.shape[1] > 1:
+        a, b = remaining[:, 0::2], remaining[:, 1::2]
+        a_seed, b_seed = remaining_seeds[:, 0::2], remaining_seeds[:, 1::2]
+        a_wins = rng.random(a.shape) < 1 / (1 + np.exp(skill[b] - skill[a]))
+
+        n_matches = a.shape[1]
+        numbers = match_num + np.arange(1, n_matches + 1)
+        rounds.append(
+            pd.DataFrame(
+                {
+                    "draw": np.repeat(np.arange(n_draws), n_matches),
+                    "match_num": np.tile(numbers, n_draws),
+                    "round": ROUNDS[remaining.shape[1]],
+                    "winner": np.where(a_wins, a, b).ravel(),
+                    "loser": np.where(a_wins, b, a).ravel(),
+                    "winner_seed": np.where(a_wins, a_seed, b_seed).ravel(),
+                    "loser_seed": np.where(a_wins, b_seed, a_seed).ravel(),
+                }
+            )
+        )
+
+        remaining = np.where(a_wins, a, b)
+        remaining_seeds = np.where(a_wins, a_seed, b_seed)
+        match_num += n_matches
+
+    return pd.concat(rounds, ignore_index=True)
+
+
+def _season_frame(
+    rng: np.random.Generator,
+    year: int,
+    season: pd.DataFrame,
+    players: dict[str, np.ndarray],
+    rank: np.ndarray,
+    slot_surface: np.ndarray,
+    slot_week: np.ndarray,
+) -> pd.DataFrame:
+    """
+    Fill in the columns of the ATP match files for the matches of a season.
+
+    Returns:
+        DataFrame with the ATP columns and dtypes, ordered by date
+    """
+    n = len(season)
+    slot = season["slot"].to_numpy()
+    winner = season["winner"].to_numpy()
+    loser = season["loser"].to_numpy()
+
+    first_monday = pd.Timestamp(year, 1, 1) + pd.offsets.Week(weekday=0)
+    dates = first_monday + pd.to_timedelta(slot_week[slot] * 7, unit="D")
+    date_years = year + (dates.dayofyear.to_numpy() - 1) / 365.25
+
+    surface = slot_surface[slot]
+    if year >= 2009:
+        surface = np.where(surface == "Carpet", "Hard", surface)
+
+    score, games = _scores(rng, season["best_of"].to_numpy())
+    walkover = rng.random(n) < WALKOVER_RATE
+    retired = ~walkover & (rng.random(n) < RETIREMENT_RATE)
+    score = np.where(walkover, "W/O", np.where(retired, score + " RET", score))
+
+    minutes = np.round(games * rng.normal(4.2, 0.6, n) + 5).astype(float)
+    has_stats = ~walkover & (year >= STATS_SINCE) & (rng.random(n) > 0.03)
+    minutes[~has_stats] = np.nan
+
+    def player_columns(side, idx, seed):
+        entry = rng.choice(ENTRIES[0], len(idx), p=ENTRIES[1]).astype(object)
+        entry[~np.isnan(seed) | (rng.random(len(idx)) > 0.12)] = None
+
+        return {
+            f"{side}_id": players["id"][idx],
+            f"{side}_seed": seed,
+            f"{side}_entry": entry,
+            f"{side}_name": players["name"][idx],
+            f"{side}_hand": players["hand"][idx],
+            f"{side}_ht": players["ht"][idx],
+            f"{side}_ioc": players["ioc"][idx],
+            f"{side}_age": np.round(date_years - players["birth"][idx], 1),
+        }
+
+    def rank_columns(side, idx):
+        points = np.round(12_000 * rank[idx] ** -0.8)
+        if year < 1990:
+            points = np.full(len(idx), np.nan)
+
+        return {f"{side}_rank": rank[idx], f"{side}_rank_points": points}
+
+    winner_games = np.ceil(games / 2)
+    frame = pd.DataFrame(
+        {
+            "tourney_id": pd.Categorical.from_codes(
+                slot, [f"{year}-{s:04d}" for s in range(len(slot_week))]
+            ),
+            "tourney_name": pd.Categorical.from_codes(
+                slot, [f"Tournament {s}" for s in range(len(slot_week))]
+            ),
+            "surface": surface,
+            "draw_size": season["draw_size"],
+            "tourney_level": season["tourney_level"],
+            "tourney_date": dates.strftime("%Y%m%d").astype(int),
+            "match_num": season["match_num"],
+            **player_columns("winner", winner, season["winner_seed"].to_numpy()),
+            **player_columns("loser", loser, season["loser_seed"].to_numpy()),
+            "score": score,
+            "best_of": season["best_of"],
+            "round": season["round"],
+            "minutes": minutes,
+            **_serve_stats(rng, "w", winner_games, has_stats, 0.74, 0.54, 0.3),
+            **_serve_stats(rng, "l", games - winner_games, has_stats, 0.68, 0.48, 0.6),
+            **rank_columns("winner", winner),
+            **rank_columns("loser", loser),
+        }
+    )
+
+    return (
+        frame[ATP_COLUMNS]
+        .sort_values(["tourney_date", "tourney_id", "match_num"], kind="stable")
+        .astype({col: ATP_MATCH_SCHEMA[col] for col in ATP_COLUMNS})
+        .reset_index(drop=True)
+    )
+
+
+def _scores(
+    rng: np.random.Generator, best_of: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Draw score strings from the winner's point of view.
+
+    The winner takes the last set and the sets won by the loser are spread
+    at random among the previous ones.
+
+    Returns:
+        Tuple with the score strings and the total number of games of every
+        match
+    """
+    n = len(best_of)
+    to_win = best_of // 2 + 1
+    lost = rng.integers(0, to_win)
+    n_sets = to_win + lost
+    max_sets = best_of.max()
+
+    # Rank random keys over the sets before the last one; the lowest
+    # ``lost`` of them are the sets won by the loser.
+    keys = rng.random((n, max_sets))
+    slots = np.arange(max_sets)
+    keys[slots >= (n_sets - 1)[:, None]] = np.inf
+    loser_set = keys.argsort(axis=1).argsort(axis=1) < lost[:, None]
+
+    # Every set is one of a few strings: who took it, how and, for
+    # tie-breaks, the points of the loser of the tie-break.
+    kind = rng.choice(len(SET_SCORES), (n, max_sets), p=SET_WEIGHTS)
+    tiebreak = np.where(kind == len(SET_SCORES) - 1, rng.integers(0, 11, kind.shape), 0)
+    won, conceded = np.array(SET_SCORES).T
+    vocabulary = np.array(
+        [
+            f"{a}-{b}" + (f"({points})" if (a, b) in [(7, 6), (6, 7)] else "")
+            for lost_set in [False, True]
+            for w, c in SET_SCORES
+            for a, b in [(c, w) if lost_set else (w, c)]
+            for points in range(11)
+        ],
+        dtype=object,
+    )
+    sets = vocabulary[(loser_set * len(SET_SCORES) + kind) * 11 + tiebreak]
+
+    played = slots < n_sets[:, None]
+    score = sets[:, 0]
+    for i in range(1, max_sets):
+        score = np.where(played[:, i], score + " " + sets[:, i], score)
+    games = np.where(played, won[kind] + conceded[kind], 0).sum(axis=1)
+
+    return score, games
+
+
+def _serve_stats(
+    rng: np.random.Generator,
+    side: str,
+    service_games: np.ndarray,
+    has_stats: np.ndarray,
+    first_won: float,
+    second_won: float,
+    break_points: float,
+) -> dict[str, np.ndarray]:
+    """
+    Draw consistent serve statistics for one side of every match.
+
+    Args:
+        rng: Random generator
+        side: Column prefix, ``"w"`` or ``"l"``
+        service_games: Service games played
+        has_stats: Whether the match has statistics at all
+        first_won: Share of first serves won
+        second_won: Share of second serves won
+        break_points: Break points faced per service game
+
+    Returns:
+        Mapping of column name to values, NaN where there are no statistics
+    """
+    svpt = rng.binomial((service_games * 9).astype(int), 0.7)
+    first_in = rng.binomial(svpt, 0.62)
+    second = svpt - first_in
+    bp_faced = rng.poisson(break_points * service_games)
+    stats = {
+        "ace": rng.binomial(first_in, 0.1),
+        "df": rng.binomial(second, 0.08),
+        "svpt": svpt,
+        "1stIn": first_in,
+        "1stWon": rng.binomial(first_in, first_won),
+        "2ndWon": rng.binomial(second, second_won),
+        "SvGms": service_games,
+        "bpSaved": rng.binomial(bp_faced, 0.6),
+        "bpFaced": bp_faced,
+    }
 
-def generate_test_data() -> pd.DataFrame:
-    test_file_path = "src/data/archives/tennis/atp_matches_1985.csv"
-    return pd.read_csv(test_file_path, sep=",")
+    return {
+        f"{side}_{col}": np.where(has_stats, values, np.nan)
+        for col, values in stats.items()
+    }